@@ -0,0 +1,659 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import contextlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from cv_fingerprint import simhash_bands
+
+# Sérialiseurs compacts optionnels (json de la bibliothèque standard à défaut)
+try:
+    import msgpack
+    MSGPACK_INSTALLED = True
+except ImportError:
+    MSGPACK_INSTALLED = False
+
+try:
+    import orjson
+    ORJSON_INSTALLED = True
+except ImportError:
+    ORJSON_INSTALLED = False
+
+# Backends de stockage des analyses de CV
+ANALYSIS_STORE_BACKENDS = ("sqlite", "lmdb", "json")
+DEFAULT_ANALYSIS_STORE_BACKEND = "sqlite"
+
+# Emplacements par défaut (relatifs au répertoire de lancement des serveurs)
+DEFAULT_SQLITE_PATH = "data/cv_analysis.sqlite3"
+DEFAULT_LMDB_PATH = "data/cv_analysis.lmdb"
+DEFAULT_JSON_DIR = "data/cv_analysis"
+
+# Taille maximale de la base LMDB (espace d'adressage réservé, pas d'allocation disque)
+DEFAULT_LMDB_MAP_SIZE = 64 * 1024 ** 3
+
+# Préfixe d'un octet identifiant le format de chaque enregistrement
+_CODEC_MSGPACK = b"m"
+_CODEC_JSON = b"j"
+
+# Type des embeddings persistés (moitié de la taille du float32, précision suffisante pour le cosinus)
+EMBEDDING_DTYPE = np.float16
+
+
+def serialize(analysis: Dict[str, Any]) -> bytes:
+    """
+    Sérialise une analyse au format le plus compact disponible (msgpack, orjson, puis json)
+    """
+    if MSGPACK_INSTALLED:
+        return _CODEC_MSGPACK + msgpack.packb(analysis, use_bin_type=True)
+    if ORJSON_INSTALLED:
+        return _CODEC_JSON + orjson.dumps(analysis)
+    return _CODEC_JSON + json.dumps(analysis, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def deserialize(data: bytes) -> Dict[str, Any]:
+    """
+    Désérialise un enregistrement, quel que soit le format avec lequel il a été écrit
+    """
+    data = bytes(data)
+    codec, payload = data[:1], data[1:]
+    if codec == _CODEC_MSGPACK:
+        if not MSGPACK_INSTALLED:
+            raise RuntimeError("Enregistrement msgpack illisible: le module msgpack n'est pas installé")
+        return msgpack.unpackb(payload, raw=False)
+    if ORJSON_INSTALLED:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def pack_embedding(embedding) -> Optional[bytes]:
+    """
+    Convertit un embedding (tableau NumPy, tenseur ou liste) en blob float16
+    """
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def unpack_embedding(blob) -> Optional[np.ndarray]:
+    """
+    Vue NumPy (1, dim) en lecture seule sur un blob float16, sans copie
+    """
+    if blob is None:
+        return None
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE).reshape(1, -1)
+
+
+def _fingerprint_entry(analysis: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    """
+    Empreinte exacte et SimHash d'une analyse (champs `fingerprint` et `simhash`), ou None
+    """
+    if not analysis.get("fingerprint") or not analysis.get("simhash"):
+        return None
+    return analysis["fingerprint"], int(analysis["simhash"], 16)
+
+
+def _split_embedding(analysis: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """
+    Sépare l'embedding (stocké en binaire) du reste de l'analyse (sérialisé)
+    """
+    if "embedding" not in analysis:
+        return analysis, None
+    record = dict(analysis)
+    return record, pack_embedding(record.pop("embedding"))
+
+
+class SQLiteAnalysisStore:
+    """
+    Stockage des analyses de CV dans une base SQLite embarquée.
+
+    Une seule table indexée par `cv_id` (clé primaire d'une table WITHOUT ROWID):
+    une recherche coûte une descente de B-tree, quel que soit le nombre de CV. Le mode
+    WAL permet des lectures concurrentes pendant les écritures; chaque thread utilise
+    sa propre connexion. L'embedding est stocké à part, en blob float16, et relu sous
+    forme de vue NumPy sans décodage.
+
+    Les empreintes des CV (SHA-256 et bandes du SimHash) sont indexées dans la même
+    transaction que leur analyse: tous les processus partageant la base voient les
+    mêmes doublons.
+    """
+    backend = "sqlite"
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " cv_id TEXT PRIMARY KEY,"
+            " data BLOB NOT NULL,"
+            " embedding BLOB,"
+            " updated_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        # Bases créées avant le stockage des embeddings
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(analyses)")}
+        if "embedding" not in columns:
+            connection.execute("ALTER TABLE analyses ADD COLUMN embedding BLOB")
+
+        # Index des empreintes: SHA-256 -> CV, et (bande, valeur) du SimHash -> SHA-256
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " fingerprint TEXT PRIMARY KEY,"
+            " cv_id TEXT NOT NULL,"
+            " simhash TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS fingerprints_cv_id ON fingerprints (cv_id)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS simhash_bands ("
+            " band INTEGER NOT NULL,"
+            " value INTEGER NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " PRIMARY KEY (band, value, fingerprint)"
+            ") WITHOUT ROWID"
+        )
+        # Bases créées avant l'index des empreintes: indexer les analyses existantes
+        if "fingerprints" not in tables:
+            for cv_id, data in connection.execute("SELECT cv_id, data FROM analyses").fetchall():
+                self._index_fingerprint(connection, cv_id, deserialize(data))
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            # En mode WAL, synchronous=NORMAL reste sûr en cas de crash du processus
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def put(self, cv_id: str, analysis: Dict[str, Any]) -> None:
+        self.put_many([(cv_id, analysis)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Enregistre plusieurs analyses dans une seule transaction
+        """
+        now = time.time()
+        rows = []
+        analyses = []
+        for cv_id, analysis in items:
+            record, embedding = _split_embedding(analysis)
+            rows.append((str(cv_id), serialize(record), embedding, now))
+            analyses.append((str(cv_id), analysis))
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO analyses (cv_id, data, embedding, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+            for cv_id, analysis in analyses:
+                self._index_fingerprint(connection, cv_id, analysis)
+        return len(rows)
+
+    @staticmethod
+    def _remove_fingerprints(connection: sqlite3.Connection, cv_id: str) -> None:
+        connection.execute(
+            "DELETE FROM simhash_bands WHERE fingerprint IN (SELECT fingerprint FROM fingerprints WHERE cv_id = ?)",
+            (cv_id,)
+        )
+        connection.execute("DELETE FROM fingerprints WHERE cv_id = ?", (cv_id,))
+
+    @classmethod
+    def _index_fingerprint(cls, connection: sqlite3.Connection, cv_id: str, analysis: Dict[str, Any]) -> None:
+        """
+        Remplace les empreintes indexées d'un CV par celles de son analyse (dans la transaction en cours)
+        """
+        cls._remove_fingerprints(connection, cv_id)
+        entry = _fingerprint_entry(analysis)
+        if entry is None:
+            return
+        cv_fingerprint, cv_simhash = entry
+        # Une empreinte déjà indexée sous un autre CV est réattribuée à celui-ci
+        connection.execute(
+            "INSERT OR REPLACE INTO fingerprints (fingerprint, cv_id, simhash) VALUES (?, ?, ?)",
+            (cv_fingerprint, cv_id, format(cv_simhash, "016x"))
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO simhash_bands (band, value, fingerprint) VALUES (?, ?, ?)",
+            [(band, value, cv_fingerprint) for band, value in simhash_bands(cv_simhash)]
+        )
+
+    def find_fingerprint(self, cv_fingerprint: str) -> Optional[str]:
+        """
+        Identifiant du CV sauvegardé ayant exactement cette empreinte, ou None
+        """
+        row = self._connection().execute(
+            "SELECT cv_id FROM fingerprints WHERE fingerprint = ?", (cv_fingerprint,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def find_simhash_candidates(self, cv_simhash: int) -> List[Tuple[str, str, int]]:
+        """
+        CV partageant au moins une bande de SimHash: (identifiant, empreinte, SimHash)
+        """
+        bands = simhash_bands(cv_simhash)
+        condition = " OR ".join(["(b.band = ? AND b.value = ?)"] * len(bands))
+        rows = self._connection().execute(
+            "SELECT DISTINCT f.cv_id, f.fingerprint, f.simhash FROM simhash_bands b"
+            f" JOIN fingerprints f ON f.fingerprint = b.fingerprint WHERE {condition}",
+            [part for band in bands for part in band]
+        ).fetchall()
+        return [(cv_id, cv_fingerprint, int(value, 16)) for cv_id, cv_fingerprint, value in rows]
+
+    def get(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT data, embedding FROM analyses WHERE cv_id = ?", (str(cv_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        analysis = deserialize(row[0])
+        if row[1] is not None:
+            analysis["embedding"] = unpack_embedding(row[1])
+        return analysis
+
+    def get_embedding(self, cv_id: str) -> Optional[np.ndarray]:
+        """
+        Retourne uniquement l'embedding d'un CV, sans désérialiser l'analyse
+        """
+        row = self._connection().execute(
+            "SELECT embedding FROM analyses WHERE cv_id = ?", (str(cv_id),)
+        ).fetchone()
+        return unpack_embedding(row[0]) if row else None
+
+    def delete(self, cv_id: str) -> bool:
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute("DELETE FROM analyses WHERE cv_id = ?", (str(cv_id),))
+            self._remove_fingerprints(connection, str(cv_id))
+        return cursor.rowcount > 0
+
+    def __contains__(self, cv_id: str) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM analyses WHERE cv_id = ?", (str(cv_id),)
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def iter_ids(self) -> Iterator[str]:
+        for (cv_id,) in self._connection().execute("SELECT cv_id FROM analyses ORDER BY cv_id"):
+            yield cv_id
+
+
+class LMDBAnalysisStore:
+    """
+    Stockage des analyses de CV dans une base LMDB (clé-valeur mappée en mémoire).
+
+    Les lectures se font sans verrou depuis la projection mémoire du fichier, ce qui
+    convient aux services qui relisent beaucoup d'analyses. Les embeddings sont rangés
+    dans une sous-base séparée, en blobs float16. Les empreintes des CV sont indexées
+    dans des sous-bases écrites dans la même transaction que l'analyse.
+    """
+    backend = "lmdb"
+
+    def __init__(self, path: str = DEFAULT_LMDB_PATH, map_size: int = DEFAULT_LMDB_MAP_SIZE):
+        import lmdb
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.env = lmdb.open(path, map_size=map_size, max_dbs=5, writemap=True, metasync=False)
+        self.db = self.env.open_db(b"analyses")
+        self.embeddings_db = self.env.open_db(b"embeddings")
+        # SHA-256 -> "cv_id SimHash", CV -> SHA-256, et "bande:valeur" du SimHash -> SHA-256 (doublons triés)
+        self.fingerprints_db = self.env.open_db(b"fingerprints")
+        self.cv_fingerprints_db = self.env.open_db(b"cv_fingerprints")
+        self.bands_db = self.env.open_db(b"simhash_bands", dupsort=True)
+
+    def put(self, cv_id: str, analysis: Dict[str, Any]) -> None:
+        self.put_many([(cv_id, analysis)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        count = 0
+        with self.env.begin(write=True, db=self.db) as txn:
+            for cv_id, analysis in items:
+                key = str(cv_id).encode('utf-8')
+                record, embedding = _split_embedding(analysis)
+                txn.put(key, serialize(record))
+                if embedding is not None:
+                    txn.put(key, embedding, db=self.embeddings_db)
+                else:
+                    txn.delete(key, db=self.embeddings_db)
+                self._index_fingerprint(txn, key, analysis)
+                count += 1
+        return count
+
+    @staticmethod
+    def _band_key(band: int, value: int) -> bytes:
+        return f"{band}:{value:04x}".encode('utf-8')
+
+    def _remove_fingerprints(self, txn, key: bytes) -> None:
+        cv_fingerprint = txn.get(key, db=self.cv_fingerprints_db)
+        if cv_fingerprint is None:
+            return
+        txn.delete(key, db=self.cv_fingerprints_db)
+        entry = txn.get(cv_fingerprint, db=self.fingerprints_db)
+        # L'empreinte a pu être réattribuée depuis à un autre CV
+        if entry is None or entry.split(b" ")[0] != key:
+            return
+        txn.delete(cv_fingerprint, db=self.fingerprints_db)
+        for band, value in simhash_bands(int(entry.split(b" ")[1], 16)):
+            txn.delete(self._band_key(band, value), cv_fingerprint, db=self.bands_db)
+
+    def _index_fingerprint(self, txn, key: bytes, analysis: Dict[str, Any]) -> None:
+        """
+        Remplace les empreintes indexées d'un CV par celles de son analyse (dans la transaction en cours)
+        """
+        self._remove_fingerprints(txn, key)
+        entry = _fingerprint_entry(analysis)
+        if entry is None:
+            return
+        cv_fingerprint, cv_simhash = entry[0].encode('utf-8'), entry[1]
+        txn.put(cv_fingerprint, key + b" " + format(cv_simhash, "016x").encode('utf-8'), db=self.fingerprints_db)
+        txn.put(key, cv_fingerprint, db=self.cv_fingerprints_db)
+        for band, value in simhash_bands(cv_simhash):
+            txn.put(self._band_key(band, value), cv_fingerprint, db=self.bands_db)
+
+    def find_fingerprint(self, cv_fingerprint: str) -> Optional[str]:
+        """
+        Identifiant du CV sauvegardé ayant exactement cette empreinte, ou None
+        """
+        with self.env.begin(db=self.fingerprints_db) as txn:
+            entry = txn.get(cv_fingerprint.encode('utf-8'))
+        return entry.split(b" ")[0].decode('utf-8') if entry is not None else None
+
+    def find_simhash_candidates(self, cv_simhash: int) -> List[Tuple[str, str, int]]:
+        """
+        CV partageant au moins une bande de SimHash: (identifiant, empreinte, SimHash)
+        """
+        candidates = {}
+        with self.env.begin() as txn:
+            cursor = txn.cursor(db=self.bands_db)
+            for band, value in simhash_bands(cv_simhash):
+                if not cursor.set_key(self._band_key(band, value)):
+                    continue
+                for cv_fingerprint in cursor.iternext_dup():
+                    entry = txn.get(cv_fingerprint, db=self.fingerprints_db)
+                    if entry is not None:
+                        cv_id, value_hex = entry.split(b" ")
+                        candidates[cv_fingerprint] = (cv_id.decode('utf-8'), cv_fingerprint.decode('utf-8'),
+                                                      int(value_hex, 16))
+        return list(candidates.values())
+
+    def get(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        key = str(cv_id).encode('utf-8')
+        with self.env.begin(db=self.db, buffers=True) as txn:
+            data = txn.get(key)
+            if data is None:
+                return None
+            analysis = deserialize(data)
+            embedding = txn.get(key, db=self.embeddings_db)
+            # Le tampon LMDB n'est valide que dans la transaction
+            if embedding is not None:
+                analysis["embedding"] = unpack_embedding(bytes(embedding))
+        return analysis
+
+    def get_embedding(self, cv_id: str) -> Optional[np.ndarray]:
+        """
+        Retourne uniquement l'embedding d'un CV, sans désérialiser l'analyse
+        """
+        # Hors transaction, le tampon LMDB n'est plus valide: une seule copie des octets
+        with self.env.begin(db=self.embeddings_db) as txn:
+            return unpack_embedding(txn.get(str(cv_id).encode('utf-8')))
+
+    def delete(self, cv_id: str) -> bool:
+        key = str(cv_id).encode('utf-8')
+        with self.env.begin(write=True, db=self.db) as txn:
+            txn.delete(key, db=self.embeddings_db)
+            self._remove_fingerprints(txn, key)
+            return txn.delete(key)
+
+    def __contains__(self, cv_id: str) -> bool:
+        with self.env.begin(db=self.db) as txn:
+            return txn.get(str(cv_id).encode('utf-8')) is not None
+
+    def __len__(self) -> int:
+        with self.env.begin(db=self.db) as txn:
+            return txn.stat(self.db)["entries"]
+
+    def iter_ids(self) -> Iterator[str]:
+        with self.env.begin(db=self.db) as txn:
+            for key in txn.cursor().iternext(keys=True, values=False):
+                yield key.decode('utf-8')
+
+
+class JsonFileAnalysisStore:
+    """
+    Ancien stockage: un fichier JSON par CV dans `data/cv_analysis/`
+
+    Conservé pour la lecture des analyses non encore migrées et comme source de la migration.
+    Les empreintes des CV sont indexées par des fichiers de `_fingerprints/` (SHA-256 -> CV)
+    et de `_simhash_bands/<bande>-<valeur>/` (un fichier vide par empreinte).
+    """
+    backend = "json"
+
+    def __init__(self, directory: str = DEFAULT_JSON_DIR):
+        self.directory = directory
+        self.fingerprints_dir = os.path.join(directory, "_fingerprints")
+        self.bands_dir = os.path.join(directory, "_simhash_bands")
+        os.makedirs(self.fingerprints_dir, exist_ok=True)
+        os.makedirs(self.bands_dir, exist_ok=True)
+
+    def _path(self, cv_id: str) -> str:
+        # Le nom de fichier ne doit pas permettre de sortir du répertoire
+        return os.path.join(self.directory, os.path.basename(str(cv_id)) + ".json")
+
+    def _band_dir(self, band: int, value: int) -> str:
+        return os.path.join(self.bands_dir, f"{band}-{value:04x}")
+
+    def _read_fingerprint(self, cv_fingerprint: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.fingerprints_dir, os.path.basename(cv_fingerprint)), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _remove_fingerprints(self, cv_id: str) -> None:
+        previous = self.get(cv_id)
+        entry = _fingerprint_entry(previous) if previous else None
+        if entry is None:
+            return
+        indexed = self._read_fingerprint(entry[0])
+        # L'empreinte a pu être réattribuée depuis à un autre CV
+        if indexed is None or indexed["cv_id"] != str(cv_id):
+            return
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(self.fingerprints_dir, entry[0]))
+        for band, value in simhash_bands(entry[1]):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self._band_dir(band, value), entry[0]))
+
+    def _index_fingerprint(self, cv_id: str, analysis: Dict[str, Any]) -> None:
+        entry = _fingerprint_entry(analysis)
+        if entry is None:
+            return
+        cv_fingerprint, cv_simhash = entry
+        for band, value in simhash_bands(cv_simhash):
+            band_dir = self._band_dir(band, value)
+            os.makedirs(band_dir, exist_ok=True)
+            open(os.path.join(band_dir, cv_fingerprint), 'a').close()
+        with open(os.path.join(self.fingerprints_dir, cv_fingerprint), 'w', encoding='utf-8') as f:
+            json.dump({"cv_id": str(cv_id), "simhash": format(cv_simhash, "016x")}, f)
+
+    def put(self, cv_id: str, analysis: Dict[str, Any]) -> None:
+        self._remove_fingerprints(cv_id)
+        record, embedding = _split_embedding(analysis)
+        if embedding is not None:
+            record["embedding"] = unpack_embedding(embedding)[0].tolist()
+        with open(self._path(cv_id), 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        self._index_fingerprint(cv_id, analysis)
+
+    def find_fingerprint(self, cv_fingerprint: str) -> Optional[str]:
+        """
+        Identifiant du CV sauvegardé ayant exactement cette empreinte, ou None
+        """
+        indexed = self._read_fingerprint(cv_fingerprint)
+        return indexed["cv_id"] if indexed else None
+
+    def find_simhash_candidates(self, cv_simhash: int) -> List[Tuple[str, str, int]]:
+        """
+        CV partageant au moins une bande de SimHash: (identifiant, empreinte, SimHash)
+        """
+        candidates = {}
+        for band, value in simhash_bands(cv_simhash):
+            band_dir = self._band_dir(band, value)
+            if not os.path.isdir(band_dir):
+                continue
+            for cv_fingerprint in os.listdir(band_dir):
+                indexed = self._read_fingerprint(cv_fingerprint)
+                if indexed is not None:
+                    candidates[cv_fingerprint] = (indexed["cv_id"], cv_fingerprint, int(indexed["simhash"], 16))
+        return list(candidates.values())
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        count = 0
+        for cv_id, analysis in items:
+            self.put(cv_id, analysis)
+            count += 1
+        return count
+
+    def get(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        file_path = self._path(cv_id)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'r', encoding='utf-8') as f:
+            analysis = json.load(f)
+        if analysis.get("embedding") is not None:
+            analysis["embedding"] = unpack_embedding(pack_embedding(analysis["embedding"]))
+        return analysis
+
+    def get_embedding(self, cv_id: str) -> Optional[np.ndarray]:
+        analysis = self.get(cv_id)
+        return analysis.get("embedding") if analysis else None
+
+    def delete(self, cv_id: str) -> bool:
+        self._remove_fingerprints(cv_id)
+        try:
+            os.remove(self._path(cv_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def __contains__(self, cv_id: str) -> bool:
+        return os.path.exists(self._path(cv_id))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.iter_ids())
+
+    def iter_ids(self) -> Iterator[str]:
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".json"):
+                yield entry.name[:-len(".json")]
+
+
+def create_analysis_store(backend: str = DEFAULT_ANALYSIS_STORE_BACKEND, path: Optional[str] = None):
+    """
+    Crée le stockage d'analyses du backend demandé
+    """
+    if backend == "sqlite":
+        return SQLiteAnalysisStore(path or DEFAULT_SQLITE_PATH)
+    if backend == "lmdb":
+        return LMDBAnalysisStore(path or DEFAULT_LMDB_PATH)
+    if backend == "json":
+        return JsonFileAnalysisStore(path or DEFAULT_JSON_DIR)
+    raise ValueError(f"Backend de stockage inconnu: {backend} (attendu: {', '.join(ANALYSIS_STORE_BACKENDS)})")
+
+
+def migrate_json_directory(store, source_dir: str = DEFAULT_JSON_DIR, batch_size: int = 1000,
+                           remove: bool = False) -> Dict[str, int]:
+    """
+    Importe les anciens fichiers JSON (un par CV) dans un stockage, par transactions de `batch_size`
+
+    La migration peut être relancée sans risque: les analyses déjà présentes sont remplacées.
+    Avec `remove`, chaque fichier est supprimé une fois sa transaction validée.
+    """
+    summary = {"migrated": 0, "failed": 0}
+    if not os.path.isdir(source_dir):
+        return summary
+
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    batch_paths: List[str] = []
+
+    def flush():
+        summary["migrated"] += store.put_many(batch)
+        if remove:
+            for file_path in batch_paths:
+                os.remove(file_path)
+        batch.clear()
+        batch_paths.clear()
+
+    for entry in os.scandir(source_dir):
+        if not (entry.is_file() and entry.name.endswith(".json")):
+            continue
+        try:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                batch.append((entry.name[:-len(".json")], json.load(f)))
+            batch_paths.append(entry.path)
+        except (OSError, ValueError) as e:
+            print(f"Fichier ignoré {entry.path}: {e}", file=sys.stderr)
+            summary["failed"] += 1
+            continue
+
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    return summary
+
+
+# Singleton pour le stockage partagé par les services d'un même processus
+_analysis_store = None
+_analysis_store_lock = threading.Lock()
+
+def get_analysis_store():
+    global _analysis_store
+    with _analysis_store_lock:
+        if _analysis_store is None:
+            _analysis_store = create_analysis_store(
+                os.environ.get("CV_ANALYSIS_STORE", DEFAULT_ANALYSIS_STORE_BACKEND),
+                os.environ.get("CV_ANALYSIS_STORE_PATH")
+            )
+    return _analysis_store
+
+
+# Point d'entrée pour la migration en ligne de commande
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Stockage des analyses de CV")
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Importer les fichiers JSON de data/cv_analysis")
+    migrate_parser.add_argument("--source", default=DEFAULT_JSON_DIR, help="Répertoire des fichiers JSON")
+    migrate_parser.add_argument("--backend", choices=("sqlite", "lmdb"),
+                                default=os.environ.get("CV_ANALYSIS_STORE", DEFAULT_ANALYSIS_STORE_BACKEND))
+    migrate_parser.add_argument("--path", default=os.environ.get("CV_ANALYSIS_STORE_PATH"),
+                                help="Emplacement de la base cible")
+    migrate_parser.add_argument("--batch-size", type=int, default=1000)
+    migrate_parser.add_argument("--remove", action="store_true",
+                                help="Supprimer les fichiers JSON une fois importés")
+    args = arg_parser.parse_args()
+
+    target = create_analysis_store(args.backend, args.path)
+    start = time.perf_counter()
+    result = migrate_json_directory(target, args.source, args.batch_size, args.remove)
+    print(f"{result['migrated']} analyses migrées vers {args.backend}, {result['failed']} en erreur "
+          f"({time.perf_counter() - start:.1f}s).")
+    sys.exit(1 if result["failed"] else 0)
@@ -0,0 +1,109 @@
+"""
+Micro-benchmark de l'analyse simulée des CV (parser de repli sans la pile NLP).
+
+Mesure le débit en CV par seconde de `CVParserService._simulate_cv_parsing` sur des CV
+synthétiques de tailles croissantes, avec et sans offre d'emploi, et le compare à
+l'ancienne implémentation (recherche de sous-chaînes et motifs compilés à chaque appel).
+
+Usage:
+    python benchmarks/cv_parsing_benchmark.py [--cvs fichier.jsonl] [--repeat 200]
+"""
+import io
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+
+# Rendre importables les modules du répertoire python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cv_parser_service import CVParserService, SIMULATED_SKILLS
+
+JOB_DESCRIPTION = (
+    "Nous recherchons un développeur full-stack maîtrisant Python, Django, React et SQL. "
+    "Une expérience de Docker et Kubernetes sur AWS est un plus."
+)
+
+CV_HEADER = "Jean Dupont\njean.dupont@example.fr\n+33 6 12 34 56 78\n"
+CV_PARAGRAPH = (
+    "2019 - présent: développeur chez Acme, conception d'API en Python et Flask, "
+    "déploiement sur Azure avec Docker. Encadrement de deux stagiaires, revue de code, "
+    "mise en place de l'intégration continue et suivi de la qualité logicielle.\n"
+)
+
+# CV synthétiques d'environ 1, 10 et 50 paragraphes d'expérience
+FIXTURE_CVS = {
+    "court": CV_HEADER + CV_PARAGRAPH,
+    "moyen": CV_HEADER + CV_PARAGRAPH * 10,
+    "long": CV_HEADER + CV_PARAGRAPH * 50
+}
+
+
+def legacy_simulate(cv_text: str, job_description=None):
+    """
+    Ancienne analyse simulée, conservée comme point de comparaison
+    """
+    lines = [line.strip() for line in cv_text.split('\n') if line.strip()]
+    name = lines[0] if lines else "Candidat Inconnu"
+    email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', cv_text)
+    phone_match = re.search(r'(?:\+\d{1,3}[-.\s]?)?(?:\d{1,4}[-.\s]?){1,5}\d{1,4}', cv_text)
+    skills = [skill for skill in SIMULATED_SKILLS if skill.lower() in cv_text.lower()]
+    match_score = None
+    if job_description:
+        job_skills = [skill for skill in SIMULATED_SKILLS if skill.lower() in job_description.lower()]
+        common_skills_count = len(set(skills).intersection(set(job_skills)))
+        match_score = 0.5 + (common_skills_count / max(len(job_skills), 1)) * 0.5
+    return name, email_match, phone_match, skills, match_score
+
+
+def measure(function, cv_text: str, job_description, repeat: int) -> float:
+    """
+    Retourne le débit (CV/seconde) d'une fonction d'analyse
+    """
+    # Les messages de l'analyse simulée ne doivent pas fausser la mesure
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(cv_text, job_description)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function(cv_text, job_description)
+        elapsed = time.perf_counter() - start
+    return repeat / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark de l'analyse simulée des CV")
+    parser.add_argument("--cvs", help="Fichier JSONL ({\"cv_text\": ...} par ligne) remplaçant les CV synthétiques")
+    parser.add_argument("--repeat", type=int, default=200, help="Nombre d'analyses mesurées par CV")
+    args = parser.parse_args()
+
+    cvs = FIXTURE_CVS
+    if args.cvs:
+        with open(args.cvs, 'r', encoding='utf-8') as f:
+            cvs = {f"cv{i}": json.loads(line)["cv_text"] for i, line in enumerate(f, 1) if line.strip()}
+
+    # Le service crée ses bases (data/...) dans le répertoire courant: les isoler dans un répertoire temporaire
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="cv_parsing_benchmark-") as workdir:
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                service = CVParserService()
+
+            print(f"{'cv':<8} {'taille':>8} {'offre':>6} {'ancien CV/s':>12} {'actuel CV/s':>12} {'gain':>6}")
+            for label, cv_text in cvs.items():
+                for job_description in (None, JOB_DESCRIPTION):
+                    legacy = measure(legacy_simulate, cv_text, job_description, args.repeat)
+                    current = measure(service._simulate_cv_parsing, cv_text, job_description, args.repeat)
+                    print(f"{label:<8} {len(cv_text):>8} {'oui' if job_description else 'non':>6} "
+                          f"{legacy:>12.0f} {current:>12.0f} {current / legacy:>5.1f}x")
+        finally:
+            os.chdir(cwd)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Benchmark des backends de l'encodeur CamemBERT du matcher sémantique.
+
+Pour chaque backend (torch fp32, int8 quantifié, onnx), mesure le débit en documents
+par seconde sur un jeu de textes de référence et vérifie la parité des embeddings avec
+le backend fp32 (similarité cosinus minimale de 0.99 par défaut).
+
+Usage:
+    python benchmarks/encoder_benchmark.py [--backends torch,int8,onnx] [--texts fichier.txt]
+                                           [--repeat 3] [--batch-size 32] [--threshold 0.99]
+
+Le code de sortie est 1 si un backend ne respecte pas le seuil de parité, ou si la
+référence fp32 est indisponible (la parité n'a alors pas pu être vérifiée).
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+# Rendre importables les modules du répertoire python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from semantic_matcher import SemanticMatcher
+from encoder_backends import ENCODER_BACKENDS, PARITY_THRESHOLD, cosine_parity
+
+# Jeu de textes de référence: offres et extraits de CV de longueurs variées
+FIXTURE_TEXTS = [
+    "Développeur Python confirmé",
+    "Nous recherchons un ingénieur DevOps maîtrisant Docker, Kubernetes et AWS.",
+    "Data scientist avec 3 à 5 ans d'expérience en machine learning et NLP.",
+    "Chef de projet digital, vous pilotez la refonte de notre site e-commerce et coordonnez les équipes marketing et technique.",
+    "Compétences requises: React, TypeScript, Node.js, tests unitaires, intégration continue.",
+    "Jean Dupont - Ingénieur logiciel. 2015 - 2019: Développeur Java chez Capgemini. 2019 - présent: Tech lead chez OVHcloud.",
+    "Formation: Master Informatique, Université de Lyon. Langues: français (natif), anglais (courant).",
+    "Vous savez communiquer avec des interlocuteurs variés et faites preuve d'autonomie et d'esprit critique.",
+    "Responsable des ressources humaines, vous accompagnez la croissance de l'entreprise: recrutement, formation, gestion des carrières et relations sociales.",
+    "Stage de fin d'études en analyse de données: Python, pandas, SQL, visualisation avec Power BI.",
+    "Commercial B2B, vous développez un portefeuille de clients grands comptes et négociez des contrats pluriannuels.",
+    " ".join([
+        "Ingénieure machine learning avec huit ans d'expérience dans la conception de systèmes de recommandation,",
+        "la mise en production de modèles de traitement du langage naturel et l'encadrement d'équipes pluridisciplinaires.",
+        "Expertise en PyTorch, TensorFlow, Spark et architectures cloud sur Azure et Google Cloud."
+    ] * 4)
+]
+
+
+def benchmark_backend(backend: str, texts, repeat: int, batch_size: int):
+    """
+    Retourne les embeddings et le débit (documents/seconde) d'un backend
+    """
+    matcher = SemanticMatcher(encoder_backend=backend)
+
+    # Premier passage non mesuré: chargement du modèle, quantification ou export ONNX
+    embeddings = matcher.embed_many(texts, batch_size=batch_size)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        matcher.embed_many(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    return embeddings, (len(texts) * repeat) / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark des backends de l'encodeur du matcher sémantique")
+    parser.add_argument("--backends", default=",".join(ENCODER_BACKENDS),
+                        help="Backends à évaluer, séparés par des virgules")
+    parser.add_argument("--texts", help="Fichier texte (un document par ligne) remplaçant le jeu de référence")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de passages mesurés")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threshold", type=float, default=PARITY_THRESHOLD,
+                        help="Similarité cosinus minimale avec le backend fp32")
+    args = parser.parse_args()
+
+    texts = FIXTURE_TEXTS
+    if args.texts:
+        with open(args.texts, 'r', encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    if "torch" not in backends:
+        # Le backend fp32 sert de référence pour la parité
+        backends.insert(0, "torch")
+
+    reference = None
+    parity_ok = True
+
+    # Le matcher écrit ses fichiers (cache d'embeddings, export ONNX dans data/...) dans le
+    # répertoire courant: les isoler dans un répertoire temporaire
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="encoder_benchmark-") as workdir:
+        os.chdir(workdir)
+        try:
+            print(f"{'backend':<8} {'docs/s':>10} {'cos min':>9} {'cos moy':>9}  parité")
+            for backend in backends:
+                try:
+                    embeddings, docs_per_second = benchmark_backend(backend, texts, args.repeat, args.batch_size)
+                except Exception as e:
+                    print(f"{backend:<8} indisponible: {e}")
+                    continue
+
+                if backend == "torch":
+                    reference = embeddings
+
+                if reference is None:
+                    print(f"{backend:<8} {docs_per_second:>10.1f} {'-':>9} {'-':>9}  référence fp32 indisponible")
+                    continue
+
+                similarities = cosine_parity(reference, embeddings)
+                ok = bool(np.min(similarities) >= args.threshold)
+                parity_ok = parity_ok and ok
+
+                print(f"{backend:<8} {docs_per_second:>10.1f} {np.min(similarities):>9.4f} {np.mean(similarities):>9.4f}  "
+                      f"{'OK' if ok else 'ÉCHEC'}")
+        finally:
+            os.chdir(cwd)
+
+    if reference is None:
+        print("Référence fp32 (torch) indisponible: parité non vérifiée", file=sys.stderr)
+        return 1
+    return 0 if parity_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Micro-benchmark des ressources de formation de l'analyse des écarts de compétences.
+
+Compare, pour une liste de compétences manquantes, l'ancienne construction des
+recommandations (tables de ressources reconstruites à chaque appel) et les lectures
+dans le catalogue précalculé `TrainingCatalog`: durée moyenne par appel et mémoire
+allouée par appel (pic mesuré avec tracemalloc).
+
+Usage:
+    python benchmarks/training_catalog_benchmark.py [--skills Python,AWS,...] [--repeat 10000]
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+# Rendre importables les modules du répertoire python/ et de l'analyse des écarts
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PYTHON_DIR)
+sys.path.insert(0, os.path.join(PYTHON_DIR, "skill_gap"))
+from training_catalog import TrainingCatalog, RECOMMENDATION_RESOURCES, DEVELOPMENT_RESOURCES
+
+# Compétences manquantes d'une analyse type: avec et sans ressources spécifiques
+DEFAULT_SKILLS = ["Python", "Machine Learning", "AWS", "Docker", "Leadership", "SQL", "Kubernetes", "Data Analysis"]
+
+
+def _rebuild(table):
+    """
+    Reconstruit une table de ressources, comme le faisaient les littéraux à chaque appel
+    """
+    return {skill: {key: list(value) if isinstance(value, (list, tuple)) else value
+                    for key, value in resources.items()}
+            for skill, resources in table.items()}
+
+
+def legacy_recommendations(missing_skills):
+    """
+    Ancienne génération des recommandations, conservée comme point de comparaison
+    """
+    training_resources = _rebuild(RECOMMENDATION_RESOURCES)
+    recommendations = []
+    for skill_info in missing_skills:
+        skill = skill_info["skill"]
+        if skill in training_resources:
+            resources = training_resources[skill]
+        else:
+            resources = {
+                "suggestion": f"Rechercher des cours sur {skill} sur des plateformes comme Coursera, Udemy, ou LinkedIn Learning",
+                "estimated_time": "4-12 weeks"
+            }
+        recommendations.append({"skill": skill, "importance": skill_info["importance"],
+                                "is_critical": skill_info["is_critical"], "resources": resources})
+    return recommendations
+
+
+def legacy_development_resources(skill):
+    """
+    Anciennes ressources d'un plan de développement (table reconstruite pour chaque compétence)
+    """
+    training_resources = _rebuild(DEVELOPMENT_RESOURCES)
+    if skill in training_resources:
+        return training_resources[skill]
+    return {
+        "suggestion": f"Rechercher des cours sur {skill} sur des plateformes comme Coursera, Udemy, ou LinkedIn Learning",
+        "general_platforms": ["Coursera", "Udemy", "LinkedIn Learning", "edX", "Pluralsight"],
+        "approach": "Commencer par des cours d'introduction, puis passer à des projets pratiques pour consolider les connaissances"
+    }
+
+
+def catalog_recommendations(catalog, missing_skills):
+    return [{"skill": skill_info["skill"], "importance": skill_info["importance"],
+             "is_critical": skill_info["is_critical"],
+             "resources": catalog.recommendation_resources(skill_info["skill"])}
+            for skill_info in missing_skills]
+
+
+def measure(function, repeat: int):
+    """
+    Retourne la durée moyenne (microsecondes) et le pic de mémoire allouée (octets) d'un appel
+    """
+    function()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    function()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return elapsed / repeat * 1e6, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark du catalogue des ressources de formation")
+    parser.add_argument("--skills", default=",".join(DEFAULT_SKILLS),
+                        help="Compétences manquantes, séparées par des virgules")
+    parser.add_argument("--repeat", type=int, default=10000, help="Nombre d'appels mesurés")
+    args = parser.parse_args()
+
+    skills = [skill.strip() for skill in args.skills.split(",") if skill.strip()]
+    missing_skills = [{"skill": skill, "importance": 0.8, "is_critical": False} for skill in skills]
+    catalog = TrainingCatalog(skills)
+
+    cases = [
+        ("recommandations", "ancien", lambda: legacy_recommendations(missing_skills)),
+        ("recommandations", "catalogue", lambda: catalog_recommendations(catalog, missing_skills)),
+        ("plan", "ancien", lambda: [legacy_development_resources(skill) for skill in skills]),
+        ("plan", "catalogue", lambda: [catalog.development_resources(skill) for skill in skills])
+    ]
+
+    print(f"{len(skills)} compétences manquantes, {args.repeat} appels")
+    print(f"{'étape':<16} {'version':<10} {'µs/appel':>10} {'octets/appel':>13}")
+    for step, version, function in cases:
+        microseconds, allocated = measure(function, args.repeat)
+        print(f"{step:<16} {version:<10} {microseconds:>10.2f} {allocated:>13}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from flask import Flask, request, jsonify
 from bias_detector import BiasDetector
 import pandas as pd
+import os
 import json
 import traceback
 
@@ -12,6 +13,12 @@ def health_check():
     """Endpoint de vérification de l'état du serveur"""
     return jsonify({"status": "healthy"})
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Sonde de disponibilité: 200 lorsque les modèles NLP déclarés sont chargés, 503 sinon"""
+    status = bias_detector.registry.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
 @app.route('/detect-bias', methods=['POST'])
 def detect_bias():
     """Endpoint pour détecter les biais dans un texte"""
@@ -75,4 +82,8 @@ def predict_attrition():
         return jsonify({"success": False, "error": str(e)}), 500
 
 if __name__ == '__main__':
+    # Précharger les modèles en arrière-plan (désactivable avec MODEL_WARMUP=0)
+    if os.environ.get("MODEL_WARMUP", "1") != "0":
+        bias_detector.registry.warmup(background=True)
+    
     app.run(host='0.0.0.0', port=5004, debug=True)
@@ -1,9 +1,21 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
-import spacy
 import re
 from collections import Counter
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Any, Optional
+
+# Rendre importables les modules partagés du répertoire python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model_registry import ModelRegistry, get_model_registry
+
+# Modèle spaCy utilisé pour l'analyse de texte (anglais si le modèle français n'est pas disponible)
+SPACY_MODEL_NAME = "fr_core_news_md"
+SPACY_FALLBACK_MODELS = ("en_core_web_md",)
+
+# Seule la tokenisation est utilisée (comptage des mots): les autres composants ne sont pas chargés
+SPACY_DISABLE = ("tok2vec", "tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer", "ner")
 
 # Dans une implémentation réelle, nous importerions ces bibliothèques
 # import aif360
@@ -18,13 +30,10 @@ class BiasDetector:
     en utilisant AIF360 et Fairlearn
     """
     
-    def __init__(self):
-        # Charger le modèle spaCy pour l'analyse de texte
-        try:
-            self.nlp = spacy.load("fr_core_news_md")
-        except:
-            # Fallback si le modèle français n'est pas disponible
-            self.nlp = spacy.load("en_core_web_md")
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        # Le modèle spaCy est chargé au premier usage via le registre partagé du processus
+        self.registry = registry or get_model_registry()
+        self.registry.declare_spacy(SPACY_MODEL_NAME, SPACY_DISABLE, SPACY_FALLBACK_MODELS)
         
         # Dictionnaires de termes potentiellement biaisés
         self.gender_biased_terms = {
@@ -70,6 +79,16 @@ class BiasDetector:
             "excellent niveau": "bon niveau"
         }
     
+    @property
+    def nlp(self):
+        """
+        Pipeline spaCy pour l'analyse de texte, chargé paresseusement
+        """
+        nlp = self.registry.get_spacy(SPACY_MODEL_NAME, SPACY_DISABLE, SPACY_FALLBACK_MODELS)
+        if nlp is None:
+            raise RuntimeError(f"Aucun modèle spaCy disponible ({SPACY_MODEL_NAME})")
+        return nlp
+    
     def detect_bias_in_text(self, text: str) -> Dict[str, Any]:
         """
         Détecte les biais dans un texte (offre d'emploi, description de poste, etc.)
@@ -92,8 +111,33 @@ class BiasDetector:
             }
         
         # Traiter le texte avec spaCy
-        doc = self.nlp(text.lower())
+        return self._detect_bias_in_doc(text, self.nlp(text.lower()))
+    
+    def detect_bias_in_texts(self, texts: Iterable[str], batch_size: int = 64,
+                             n_process: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        Détecte les biais dans un flux de textes (par exemple toutes les offres publiées)
         
+        Args:
+            texts: Les textes à analyser (liste ou générateur)
+            batch_size: Nombre de textes traités par lot par spaCy
+            n_process: Nombre de processus utilisés par nlp.pipe
+            
+        Returns:
+            Un générateur produisant le résultat de detect_bias_in_text pour chaque texte, dans l'ordre
+        """
+        docs = self.nlp.pipe(((text.lower(), text) for text in texts), as_tuples=True,
+                             batch_size=batch_size, n_process=n_process)
+        for doc, text in docs:
+            if not text:
+                yield self.detect_bias_in_text(text)
+            else:
+                yield self._detect_bias_in_doc(text, doc)
+    
+    def _detect_bias_in_doc(self, text: str, doc) -> Dict[str, Any]:
+        """
+        Détecte les biais dans un texte déjà traité par spaCy
+        """
         # Détecter les termes biaisés
         biased_terms = []
         
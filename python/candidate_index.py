@@ -0,0 +1,167 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class CandidateIndex:
+    """
+    Index vectoriel des candidats pour retrouver les meilleurs profils pour une offre.
+
+    Les embeddings de CV sont normalisés et rangés dans une matrice float32 contiguë:
+    la recherche exacte est un unique produit matrice-vecteur (BLAS) suivi d'une
+    sélection partielle des k meilleurs scores. Le mode approximatif (IVF) partitionne
+    les vecteurs en listes autour de centroïdes (k-means sphérique) et ne score que
+    les `n_probe` listes les plus proches de la requête.
+    """
+
+    def __init__(self, dim: int = 768, n_probe: int = 8):
+        self.dim = dim
+        self.n_probe = n_probe
+        self._lock = threading.RLock()
+
+        self._matrix = np.zeros((1024, dim), dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._metadata: List[Dict[str, Any]] = []
+
+        # Structures du mode IVF (construites à la demande)
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._ivf_size = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._rows
+
+    def add(self, candidate_id: str, embedding: np.ndarray, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Ajoute ou met à jour un candidat dans l'index
+        """
+        self.add_many([candidate_id], np.asarray(embedding).reshape(1, -1), [metadata or {}])
+
+    def add_many(self, candidate_ids: List[str], embeddings: np.ndarray,
+                 metadata: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Ajoute ou met à jour plusieurs candidats en une seule opération
+        """
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(candidate_ids), self.dim))
+        if metadata is None:
+            metadata = [{} for _ in candidate_ids]
+
+        with self._lock:
+            for candidate_id, vector, meta in zip(candidate_ids, vectors, metadata):
+                row = self._rows.get(candidate_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._ensure_capacity(row + 1)
+                    self._ids.append(candidate_id)
+                    self._metadata.append(meta)
+                    self._rows[candidate_id] = row
+                else:
+                    self._metadata[row] = meta
+                self._matrix[row] = vector
+
+                # Rattacher les nouveaux vecteurs à la liste IVF la plus proche
+                if self._centroids is not None:
+                    self._assign_row(row)
+
+    def get_metadata(self, candidate_id: str) -> Dict[str, Any]:
+        return self._metadata[self._rows[candidate_id]]
+
+    def search(self, query: np.ndarray, k: int = 10, approximate: bool = False) -> List[Tuple[str, float]]:
+        """
+        Retourne les k candidats les plus similaires (similarité cosinus) à la requête
+        """
+        query = _normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+
+        with self._lock:
+            size = len(self._ids)
+            if size == 0 or k <= 0:
+                return []
+
+            if approximate:
+                self._ensure_ivf()
+                rows = self._probe_rows(query)
+            else:
+                rows = None
+
+            if rows is None:
+                scores = self._matrix[:size] @ query
+                candidate_rows = np.arange(size)
+            else:
+                scores = self._matrix[rows] @ query
+                candidate_rows = rows
+
+            k = min(k, len(scores))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return [(self._ids[candidate_rows[i]], float(scores[i])) for i in top]
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        """
+        Construit les listes inversées (IVF) par k-means sphérique sur les vecteurs indexés
+        """
+        with self._lock:
+            size = len(self._ids)
+            if size == 0:
+                return
+
+            if n_lists is None:
+                n_lists = max(1, int(np.sqrt(size)))
+            n_lists = min(n_lists, size)
+
+            vectors = self._matrix[:size]
+            rng = np.random.default_rng(seed)
+            centroids = vectors[rng.choice(size, n_lists, replace=False)].copy()
+
+            for _ in range(iterations):
+                assignments = np.argmax(vectors @ centroids.T, axis=1)
+                for c in range(n_lists):
+                    members = vectors[assignments == c]
+                    if len(members):
+                        centroids[c] = members.sum(axis=0)
+                centroids = _normalize_rows(centroids)
+
+            self._centroids = centroids
+            self._assignments = np.argmax(vectors @ centroids.T, axis=1)
+            self._ivf_size = size
+
+    def _ensure_ivf(self) -> None:
+        # Reconstruire les listes lorsque l'index a doublé depuis la dernière construction
+        if self._centroids is None or len(self._ids) > 2 * self._ivf_size:
+            self.build_ivf()
+
+    def _probe_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        n_lists = len(self._centroids)
+        if self.n_probe >= n_lists:
+            return None
+
+        centroid_scores = self._centroids @ query
+        probed = np.argpartition(-centroid_scores, self.n_probe - 1)[:self.n_probe]
+        return np.flatnonzero(np.isin(self._assignments[:len(self._ids)], probed))
+
+    def _assign_row(self, row: int) -> None:
+        if row >= len(self._assignments):
+            grown = np.zeros(max(row + 1, 2 * len(self._assignments)), dtype=self._assignments.dtype)
+            grown[:len(self._assignments)] = self._assignments
+            self._assignments = grown
+        self._assignments[row] = int(np.argmax(self._centroids @ self._matrix[row]))
+
+    def _ensure_capacity(self, size: int) -> None:
+        if size <= len(self._matrix):
+            return
+        grown = np.zeros((max(size, 2 * len(self._matrix)), self.dim), dtype=np.float32)
+        grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = grown
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -1,12 +1,29 @@
 import os
+import sys
 from typing import Any, Text, Dict, List
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet
 import json
-import spacy
 import numpy as np
 
+# Rendre importables les modules partagés du répertoire python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model_registry import get_model_registry
+
+# Seuls les vecteurs et les lemmes sont utilisés: parser et NER ne sont pas chargés
+SPACY_MODEL_NAME = "fr_core_news_md"
+SPACY_DISABLE = ("parser", "ner")
+
+def _get_nlp():
+    """
+    Pipeline spaCy partagé, chargé une seule fois par processus au lieu d'un chargement à chaque action
+    """
+    nlp = get_model_registry().get_spacy(SPACY_MODEL_NAME, SPACY_DISABLE)
+    if nlp is None:
+        raise RuntimeError(f"Le modèle spaCy {SPACY_MODEL_NAME} n'est pas disponible")
+    return nlp
+
 class ActionEvaluateCandidate(Action):
     def name(self) -> Text:
         return "action_evaluate_candidate"
@@ -47,7 +64,7 @@ class ActionEvaluateCandidate(Action):
             preferred_skills = job_criteria.get("preferred_skills", [])
             
             # Analyser les compétences avec spaCy pour une correspondance sémantique
-            nlp = spacy.load("fr_core_news_md")
+            nlp = _get_nlp()
             
             skills_score = 0
             for skill in skills:
@@ -87,7 +104,7 @@ class ActionEvaluateCandidate(Action):
                     break
                     
             # Score supplémentaire si le domaine correspond
-            nlp = spacy.load("fr_core_news_md")
+            nlp = _get_nlp()
             field_doc = nlp(education_field.lower())
             required_field_doc = nlp(job_criteria.get("education_field", "").lower())
             
@@ -98,7 +115,7 @@ class ActionEvaluateCandidate(Action):
         # Évaluer la motivation (analyse de sentiment simplifiée)
         if motivation:
             # Utiliser spaCy pour une analyse de sentiment basique
-            nlp = spacy.load("fr_core_news_md")
+            nlp = _get_nlp()
             doc = nlp(motivation)
             
             # Mots clés positifs liés à la motivation
@@ -215,7 +232,7 @@ class ActionAnalyzeAnswers(Action):
         # Analyser la motivation
         if motivation_answer:
             # Analyse de sentiment simplifiée
-            nlp = spacy.load("fr_core_news_md")
+            nlp = _get_nlp()
             doc = nlp(motivation_answer)
             
             # Mots clés liés à la personnalité
@@ -4,8 +4,7 @@ import logging
 import json
 import os
 import sys
-from typing import Dict, Any, List, Text
-import spacy
+from typing import Dict, Any, Iterable, Iterator, List, Text
 import numpy as np
 from datetime import datetime
 
@@ -22,13 +21,17 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# Load spaCy model
-try:
-    nlp = spacy.load("fr_core_news_md")
-    logger.info("Successfully loaded spaCy model")
-except Exception as e:
-    logger.error(f"Error loading spaCy model: {e}")
-    nlp = None
+# spaCy model, loaded lazily through the process-wide registry
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model_registry import get_model_registry
+
+SPACY_MODEL_NAME = "fr_core_news_md"
+model_registry = get_model_registry()
+model_registry.declare_spacy(SPACY_MODEL_NAME)
+
+def get_nlp():
+    """Return the shared spaCy pipeline (None if it cannot be loaded)"""
+    return model_registry.get_spacy(SPACY_MODEL_NAME)
 
 # Configuration
 RASA_URL = os.environ.get("RASA_URL", "http://localhost:5005/webhooks/rest/webhook")
@@ -40,6 +43,12 @@ ANALYSES_DIR = "analyses"
 for directory in [EVALUATIONS_DIR, CONVERSATIONS_DIR, ANALYSES_DIR]:
     os.makedirs(directory, exist_ok=True)
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the declared NLP models are loaded, 503 otherwise"""
+    status = model_registry.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
 @app.route('/webhook', methods=['POST'])
 def webhook():
     """Entry point for the Rasa chatbot webhook"""
@@ -180,16 +189,34 @@ def generate_fallback_response(message: str) -> Dict[str, Any]:
 
 def analyze_text(text: str) -> Dict[str, Any]:
     """Analyze text using spaCy for skills, sentiment, etc."""
+    nlp = get_nlp() if text else None
     if not nlp or not text:
-        return {
-            "skills": [],
-            "sentiment": "neutral",
-            "complexity": 0,
-            "keywords": []
-        }
+        return empty_analysis()
     
-    doc = nlp(text)
+    return analyze_doc(nlp(text))
+
+def analyze_texts(texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[Dict[str, Any]]:
+    """Analyze a stream of texts with nlp.pipe, yielding one result per text in order"""
+    nlp = get_nlp()
+    if not nlp:
+        for _ in texts:
+            yield empty_analysis()
+        return
     
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield analyze_doc(doc) if doc.text else empty_analysis()
+
+def empty_analysis() -> Dict[str, Any]:
+    """Analysis returned when there is no text or no spaCy model"""
+    return {
+        "skills": [],
+        "sentiment": "neutral",
+        "complexity": 0,
+        "keywords": []
+    }
+
+def analyze_doc(doc) -> Dict[str, Any]:
+    """Analyze a text already processed by spaCy"""
     # Extract skills (simplified)
     skills = []
     skill_keywords = ["python", "java", "javascript", "react", "angular", "vue", "node", "express", 
@@ -312,5 +339,9 @@ def generate_evaluation(candidate_id: str) -> Dict[str, Any]:
         }
 
 if __name__ == '__main__':
+    # Warm up the models in the background (disable with MODEL_WARMUP=0)
+    if os.environ.get("MODEL_WARMUP", "1") != "0":
+        model_registry.warmup(background=True)
+    
     port = int(os.environ.get("PORT", 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,131 @@
+import re
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Empreinte SimHash sur 64 bits, découpée en 4 bandes de 16 bits pour l'indexation
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+
+# Deux CV dont les SimHash diffèrent d'au plus 3 bits sont considérés comme quasi identiques
+# (avec 4 bandes, au moins une bande est alors strictement identique: pas de faux négatif)
+NEAR_DUPLICATE_DISTANCE = 3
+
+# Taille des n-grammes de mots utilisés comme caractéristiques du SimHash
+SHINGLE_SIZE = 3
+
+# Nombre maximal de scores (CV, offre) conservés en mémoire
+DEFAULT_DEDUP_CAPACITY = 100000
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize_cv_text(text: str) -> str:
+    """
+    Normalise un CV avant hachage (forme Unicode NFC, casse, espaces compactés)
+    """
+    text = unicodedata.normalize("NFC", text).casefold()
+    return " ".join(text.split())
+
+
+def fingerprint(text: str) -> str:
+    """
+    Empreinte exacte d'un texte normalisé (SHA-256 hexadécimal)
+    """
+    return hashlib.sha256(normalize_cv_text(text).encode('utf-8')).hexdigest()
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """
+    SimHash 64 bits d'un texte à partir de ses n-grammes de mots
+
+    Des textes proches (dates, coordonnées ou mise en forme modifiées) ont des
+    empreintes qui ne diffèrent que de quelques bits.
+    """
+    words = _WORD_RE.findall(normalize_cv_text(text))
+    if not words:
+        return 0
+    shingles = {" ".join(words[i:i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))}
+
+    # Une ligne de 64 bits par n-gramme, puis vote majoritaire bit à bit
+    digests = b"".join(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest() for shingle in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(len(shingles), 8), axis=1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(shingles)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def simhash_bands(value: int) -> List[Tuple[int, int]]:
+    """
+    Bandes (indice, valeur) d'un SimHash: deux CV quasi identiques partagent au moins une bande
+    """
+    band_bits = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << band_bits) - 1
+    return [(band, (value >> (band * band_bits)) & mask) for band in range(SIMHASH_BANDS)]
+
+
+class CVDeduplicator:
+    """
+    Recherche des CV déjà analysés, par empreinte exacte et par SimHash.
+
+    Les empreintes sont indexées par le stockage des analyses (`find_fingerprint`,
+    `find_simhash_candidates`) au moment où chaque analyse est sauvegardée: l'index
+    survit aux redémarrages et est partagé par tous les processus utilisant le même
+    stockage (serveurs, workers des lots et des tâches asynchrones). Seule une soumission
+    identique (au texte normalisé près) peut réutiliser une analyse; un CV quasi identique
+    est seulement signalé. Les scores de correspondance sont mémorisés par couple
+    (empreinte du CV, offre), en mémoire, dans la limite de `capacity` entrées.
+    """
+
+    def __init__(self, store, capacity: int = DEFAULT_DEDUP_CAPACITY, max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        self.store = store
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+
+        # (empreinte, empreinte de l'offre) -> score de correspondance, du moins récent au plus récent
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
+    def lookup_exact(self, cv_fingerprint: str) -> Optional[str]:
+        """
+        Identifiant du CV déjà analysé ayant exactement cette empreinte, ou None
+        """
+        return self.store.find_fingerprint(cv_fingerprint)
+
+    def lookup_near(self, cv_simhash: int, exclude_fingerprint: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        Recherche le CV quasi identique le plus proche (distance de Hamming minimale)
+
+        Retourne (identifiant du CV, empreinte exacte de ce CV), ou None.
+        """
+        best = None
+        for cv_id, candidate, candidate_simhash in self.store.find_simhash_candidates(cv_simhash):
+            if candidate == exclude_fingerprint:
+                continue
+            distance = hamming_distance(cv_simhash, candidate_simhash)
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, cv_id, candidate)
+        return None if best is None else (best[1], best[2])
+
+    def get_score(self, cv_fingerprint: str, job_description: str) -> Optional[float]:
+        key = (cv_fingerprint, fingerprint(job_description))
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+
+    def put_score(self, cv_fingerprint: str, job_description: str, score: float) -> None:
+        key = (cv_fingerprint, fingerprint(job_description))
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.capacity:
+                self._scores.popitem(last=False)
@@ -1,11 +1,28 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 import os
+import json
 import uuid
-from cv_parser_service import get_cv_parser_service
+from cv_parser_service import get_cv_parser_service, iter_cv_directory, iter_cv_jsonl, parse_cv_batch, to_json_compatible, tracer, BATCH_WORKERS
+from parse_jobs import get_parse_job_manager, ParseJobQueueFull, DONE, FAILED
+from document_ingestion import extract_text
+from tracing import install_flask_tracing
 
 app = Flask(__name__)
+
+# Taille maximale d'un fichier de CV envoyé (au-delà, Flask répond 413 sans lire la suite)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get("CV_MAX_UPLOAD_BYTES", 20 * 1024 * 1024))
+
+# Durée des requêtes et des étapes de l'analyse: /metrics (Prometheus) et en-tête X-Timing
+install_flask_tracing(app, tracer)
 cv_parser_service = get_cv_parser_service()
 
+# Analyses asynchrones (mode, nombre de workers et taille de la file: CV_PARSE_JOB_MODE,
+# CV_PARSE_JOB_WORKERS, CV_PARSE_JOB_MAX_PENDING)
+parse_job_manager = get_parse_job_manager(cv_parser_service)
+
+# Racine des répertoires de CV importables par l'endpoint de traitement par lots
+BATCH_IMPORT_DIR = os.path.abspath(os.environ.get("CV_BATCH_IMPORT_DIR", "data/cv_imports"))
+
 @app.route('/api/parse-cv', methods=['POST'])
 def parse_cv():
     """
@@ -13,66 +30,178 @@ def parse_cv():
     Attend un JSON avec les champs:
     - cv_text: le texte du CV
     - job_description: (optionnel) la description du poste
+    - async: (optionnel) si vrai, l'analyse est mise en file et l'identifiant du CV est
+      retourné immédiatement (202); le résultat est ensuite consulté sur /api/cv-analysis/<cv_id>.
+      Si la file d'analyse est pleine, la requête est refusée (503, en-tête Retry-After).
     """
     data = request.json
     
     if not data or 'cv_text' not in data:
         return jsonify({"success": False, "error": "Le texte du CV est requis"}), 400
     
-    cv_text = data['cv_text']
-    job_description = data.get('job_description')
+    return analyze_cv_text(data['cv_text'], data.get('job_description'),
+                           bool(data.get('async')) or request.args.get('async') in ('1', 'true'))
+
+@app.route('/api/parse-cv/document', methods=['POST'])
+def parse_cv_document():
+    """
+    Endpoint pour analyser un CV envoyé sous forme de fichier
+    Attend un formulaire multipart avec les champs:
+    - file: le CV (PDF, DOCX ou texte)
+    - job_description: (optionnel) la description du poste
+    - async: (optionnel) comme pour /api/parse-cv
+    Le texte est extrait page par page, dans la limite de CV_MAX_DOCUMENT_CHARS caractères.
+    """
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({"success": False, "error": "Le fichier du CV est requis"}), 400
+    
+    try:
+        with tracer.span("extract_text"):
+            cv_text, document_info = extract_text(upload.stream, upload.filename)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    if not cv_text.strip():
+        return jsonify({"success": False, "error": "Aucun texte n'a pu être extrait du document", "document": document_info}), 422
     
-    # Générer un ID unique pour ce CV
-    cv_id = str(uuid.uuid4())
+    return analyze_cv_text(cv_text, request.form.get('job_description'),
+                           request.form.get('async') in ('1', 'true') or request.args.get('async') in ('1', 'true'),
+                           document_info)
+
+def analyze_cv_text(cv_text, job_description, run_async=False, document_info=None):
+    """
+    Analyser un CV (ou mettre son analyse en file) et préparer la réponse de l'API
+    """
+    if run_async:
+        try:
+            cv_id = parse_job_manager.submit(cv_text, job_description)
+        except ParseJobQueueFull as e:
+            response = jsonify({"success": False, "error": str(e)})
+            response.headers["Retry-After"] = "30"
+            return response, 503
+        response = jsonify({"success": True, "cv_id": cv_id, "status": "pending", "document": document_info})
+        response.headers["Location"] = f"/api/cv-analysis/{cv_id}"
+        return response, 202
     
     # Analyser le CV
     try:
         result = cv_parser_service.parse_cv(cv_text, job_description)
+        if document_info is not None:
+            result["document"] = document_info
         
-        # Sauvegarder l'analyse
-        cv_parser_service.save_analysis(cv_id, result)
+        if result.get("duplicate_of"):
+            # CV déjà soumis: réutiliser l'analyse et l'identifiant d'origine
+            cv_id = result["duplicate_of"]
+        else:
+            # Générer un ID unique pour ce CV et sauvegarder l'analyse
+            cv_id = str(uuid.uuid4())
+            cv_parser_service.save_analysis(cv_id, result)
         
         # Préparer la réponse
-        response = {
-            "success": True,
-            "cv_id": cv_id,
-            "data": {
-                "personalInfo": {
-                    "fullName": result["structured_info"]["name"],
-                    "email": result["structured_info"]["email"],
-                    "phone": result["structured_info"]["phone"],
-                    "location": "Non spécifié"  # À améliorer dans une version future
-                },
-                "skills": {
-                    "technical": result["structured_info"]["skills"],
-                    "soft": []  # À améliorer dans une version future
-                },
-                "education": result["structured_info"].get("education", []),
-                "experience": result["structured_info"].get("experience", []),
-                "matchScore": result.get("match_score", 0) * 100 if "match_score" in result else None
+        with tracer.span("respond"):
+            response = {
+                "success": True,
+                "cv_id": cv_id,
+                "duplicate": result.get("duplicate"),
+                "near_duplicate_of": result.get("near_duplicate_of"),
+                "document": document_info,
+                "data": format_analysis(result)
             }
-        }
-        
-        return jsonify(response)
+            
+            return jsonify(response)
     
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/parse-cv/batch', methods=['POST'])
+def parse_cv_batch_endpoint():
+    """
+    Endpoint pour analyser un lot de CV
+    Accepte:
+    - un flux JSONL (Content-Type: application/x-ndjson), une ligne {"cv_id"?, "cv_text", "job_description"?} par CV
+    - ou un JSON avec le champ directory: un répertoire de CV (.txt, .pdf, .docx) sous CV_BATCH_IMPORT_DIR
+      (et optionnellement job_description, appliquée à tout le lot)
+    Les résultats sont retournés en NDJSON, une ligne par CV dès que son analyse est terminée.
+    """
+    if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        items = iter_cv_jsonl(request.stream, request.args.get('job_description'))
+    else:
+        data = request.get_json(silent=True)
+        if not data or 'directory' not in data:
+            return jsonify({"success": False, "error": "Un flux JSONL ou un répertoire de CV est requis"}), 400
+        
+        # N'accepter que des répertoires situés sous la racine d'import
+        directory = os.path.abspath(os.path.join(BATCH_IMPORT_DIR, data['directory']))
+        if os.path.commonpath([directory, BATCH_IMPORT_DIR]) != BATCH_IMPORT_DIR or not os.path.isdir(directory):
+            return jsonify({"success": False, "error": "Répertoire de CV introuvable"}), 400
+        items = iter_cv_directory(directory, data.get('job_description'))
+    
+    try:
+        workers = int(request.args.get('workers', BATCH_WORKERS))
+    except ValueError:
+        return jsonify({"success": False, "error": "Le paramètre workers doit être un entier"}), 400
+    if workers < 1:
+        return jsonify({"success": False, "error": "Le paramètre workers doit être positif"}), 400
+    
+    def generate():
+        for item in parse_cv_batch(items, workers=min(workers, BATCH_WORKERS)):
+            line = {"success": item["success"], "cv_id": item["cv_id"]}
+            if item["success"]:
+                line["data"] = format_analysis(item["result"])
+            else:
+                line["error"] = item["error"]
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
 @app.route('/api/cv-analysis/<cv_id>', methods=['GET'])
 def get_cv_analysis(cv_id):
     """
     Endpoint pour récupérer l'analyse d'un CV
+    Pour une analyse asynchrone en cours, retourne son état (pending/running) et un
+    résultat partiel (contact et compétences) avec le code 202. Une analyse asynchrone
+    en échec est un état de la tâche, pas une erreur de la requête: code 200, avec
+    `status: failed` et l'erreur.
     """
+    job = parse_job_manager.get(cv_id)
+    if job is not None and job.status != DONE:
+        job_state = job.to_dict()
+        if job_state["status"] == FAILED:
+            return jsonify({"success": False, **job_state}), 200
+        return jsonify({"success": True, **job_state}), 202
+    
     result = cv_parser_service.get_analysis(cv_id)
     
     if result:
-        return jsonify({"success": True, "data": result})
+        # L'embedding stocké n'est pas renvoyé par l'API
+        return jsonify({"success": True, "status": DONE, "data": to_json_compatible(result, include_embedding=False)})
     else:
         return jsonify({"success": False, "error": "Analyse non trouvée"}), 404
 
+def format_analysis(result):
+    """
+    Mettre en forme le résultat d'analyse d'un CV pour la réponse de l'API
+    """
+    return {
+        "personalInfo": {
+            "fullName": result["structured_info"]["name"],
+            "email": result["structured_info"]["email"],
+            "phone": result["structured_info"]["phone"],
+            "location": "Non spécifié"  # À améliorer dans une version future
+        },
+        "skills": {
+            "technical": result["structured_info"]["skills"],
+            "soft": []  # À améliorer dans une version future
+        },
+        "education": result["structured_info"].get("education", []),
+        "experience": result["structured_info"].get("experience", []),
+        "matchScore": result.get("match_score", 0) * 100 if "match_score" in result else None
+    }
+
 if __name__ == '__main__':
     # Créer les répertoires nécessaires
-    os.makedirs("data/cv_analysis", exist_ok=True)
+    os.makedirs("data", exist_ok=True)
     
     # Démarrer le serveur
     app.run(host='0.0.0.0', port=5001, debug=True)
@@ -1,7 +1,20 @@
 import os
+import re
 import json
 import sys
-from typing import Dict, Any, List, Optional
+import uuid
+import random
+import argparse
+import contextlib
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO
+
+from analysis_store import DEFAULT_JSON_DIR, JsonFileAnalysisStore, get_analysis_store
+from cv_fingerprint import CVDeduplicator, DEFAULT_DEDUP_CAPACITY, fingerprint, simhash
+from skill_matcher import SkillMatcher
+from document_ingestion import extract_text
+from tracing import Tracer
 
 # Importer le parser de CV
 # Note: Dans un environnement réel, vous devriez installer les dépendances requises
@@ -14,43 +27,172 @@ try:
     import torch
     import numpy as np
     from sklearn.metrics.pairwise import cosine_similarity
+    from embedding_store import get_embedding_store, parser_embedding_key
     DEPENDENCIES_INSTALLED = True
 except ImportError:
     DEPENDENCIES_INSTALLED = False
-    print("Les dépendances requises ne sont pas installées. Mode de simulation activé.")
+    print("Les dépendances requises ne sont pas installées. Mode de simulation activé.", file=sys.stderr)
+
+# Modèle d'embedding supposé si le parser n'en déclare pas (identique au matcher sémantique)
+DEFAULT_EMBEDDING_MODEL = "camembert-base"
+
+# Traitement par lots: nombre de processus d'analyse et CV en attente par processus
+BATCH_WORKERS = int(os.environ.get("CV_PARSER_WORKERS", min(4, os.cpu_count() or 1)))
+BATCH_PENDING_PER_WORKER = 4
+
+# Fichiers de CV pris en charge par l'ingestion d'un répertoire
+CV_FILE_EXTENSIONS = (".txt", ".pdf", ".docx")
+
+# Compétences reconnues par l'analyse simulée
+SIMULATED_SKILLS = [
+    "Python", "JavaScript", "Java", "C++", "React", "Angular", "Vue", 
+    "Node.js", "Express", "Django", "Flask", "TensorFlow", "PyTorch", 
+    "SQL", "MongoDB", "AWS", "Azure", "Docker", "Kubernetes"
+]
+
+# Motifs de l'analyse simulée, compilés une seule fois
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_RE = re.compile(r'(?:\+\d{1,3}[-.\s]?)?(?:\d{1,4}[-.\s]?){1,5}\d{1,4}')
+SIMULATED_SKILL_MATCHER = SkillMatcher(SIMULATED_SKILLS)
+
+# Mesure de la durée de chaque étape de l'analyse (exportée sur /metrics par le serveur)
+tracer = Tracer("cv_parser")
+
+# Clé d'un enregistrement qui renvoie vers l'analyse d'un autre CV (doublon soumis sous un autre identifiant)
+ALIAS_KEY = "alias_of"
 
 class CVParserService:
     def __init__(self):
         self.parser = None
+        self.embedding_store = None
+        self.embedding_model = DEFAULT_EMBEDDING_MODEL
         if DEPENDENCIES_INSTALLED:
             try:
                 from cv_parser import CVParser
                 self.parser = CVParser()
+                self.embedding_model = getattr(self.parser, "model_name", DEFAULT_EMBEDDING_MODEL)
+                
+                # Cache d'embeddings partagé, sous une clé propre au parser (ses vecteurs ne
+                # sont pas ceux, regroupés par fragments, du matcher sémantique)
+                self.embedding_store = get_embedding_store()
+                self.embedding_model_key = parser_embedding_key(self.embedding_model)
                 print("Parser de CV initialisé avec succès.")
             except Exception as e:
                 print(f"Erreur lors de l'initialisation du parser de CV: {e}")
                 self.parser = None
         
-        # Créer le répertoire pour stocker les résultats d'analyse
-        os.makedirs("data/cv_analysis", exist_ok=True)
+        # Stockage des résultats d'analyse (SQLite par défaut, voir analysis_store)
+        self.analysis_store = get_analysis_store()
+        
+        # Anciennes analyses (un fichier JSON par CV) pas encore migrées
+        self.legacy_store = None
+        if self.analysis_store.backend != "json" and os.path.isdir(DEFAULT_JSON_DIR):
+            self.legacy_store = JsonFileAnalysisStore(DEFAULT_JSON_DIR)
+        
+        # Recherche des CV déjà analysés (empreintes indexées par le stockage des analyses)
+        self.deduplicator = CVDeduplicator(self.analysis_store,
+                                           int(os.environ.get("CV_DEDUP_CAPACITY", DEFAULT_DEDUP_CAPACITY)))
     
     def parse_cv(self, cv_text: str, job_description: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyse un CV et retourne les informations structurées
+        
+        Un CV identique (au texte normalisé près) à un CV déjà analysé et sauvegardé n'est
+        pas ré-analysé: l'analyse existante est retournée, avec le champ `duplicate_of`
+        (identifiant du CV d'origine) et un score recalculé pour l'offre. Un CV quasi
+        identique (SimHash à quelques bits près) peut être celui d'une autre personne: il est
+        analysé normalement et seulement signalé par le champ `near_duplicate_of`.
+        """
+        # Doublon exact: une seule empreinte SHA-256
+        with tracer.span("fingerprint"):
+            cv_fingerprint = fingerprint(cv_text)
+            cv_id = self.deduplicator.lookup_exact(cv_fingerprint)
+        if cv_id is not None:
+            cached = self._get_duplicate_result(cv_id, cv_fingerprint, cv_text, job_description)
+            if cached is not None:
+                return cached
+        
+        # Quasi-doublon: SimHash à quelques bits près, signalé sans réutiliser l'analyse
+        with tracer.span("simhash"):
+            cv_simhash = simhash(cv_text)
+            near_duplicate = self.deduplicator.lookup_near(cv_simhash, exclude_fingerprint=cv_fingerprint)
+        
+        result = self._parse_cv(cv_text, job_description)
+        
+        # Empreintes conservées avec l'analyse: le stockage les indexe à la sauvegarde
+        result["fingerprint"] = cv_fingerprint
+        result["simhash"] = format(cv_simhash, "016x")
+        if near_duplicate is not None:
+            result["near_duplicate_of"] = near_duplicate[0]
+        if job_description and result.get("match_score") is not None:
+            self.deduplicator.put_score(cv_fingerprint, job_description, result["match_score"])
+        
+        return result
+    
+    def _get_duplicate_result(self, cv_id: str, cv_fingerprint: str, cv_text: str,
+                              job_description: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Analyse déjà sauvegardée d'un doublon, avec le score de correspondance propre à l'offre
+        """
+        analysis = self.get_analysis(cv_id)
+        if analysis is None:
+            return None
+        
+        analysis["duplicate_of"] = cv_id
+        analysis["duplicate"] = "exact"
+        analysis.pop("match_score", None)
+        
+        if job_description:
+            score = self.deduplicator.get_score(cv_fingerprint, job_description)
+            if score is None:
+                score = self._compute_match_score(cv_text, analysis, job_description)
+                self.deduplicator.put_score(cv_fingerprint, job_description, score)
+            analysis["match_score"] = score
+        
+        return analysis
+    
+    def _compute_match_score(self, cv_text: str, analysis: Dict[str, Any], job_description: str) -> float:
+        """
+        Score de correspondance entre un CV déjà analysé et une offre
+        """
+        with tracer.span("match"):
+            if self.parser is not None:
+                try:
+                    return float(self.parser.match_cv_with_job(cv_text, job_description))
+                except Exception as e:
+                    print(f"Erreur lors du calcul de la correspondance: {e}")
+            return self._simulate_match_score(analysis["structured_info"]["skills"], job_description)
+    
+    def _parse_cv(self, cv_text: str, job_description: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analyse complète d'un CV (parser NLP, ou simulation)
         """
         if self.parser is not None:
             try:
                 # Utiliser le parser réel
-                result = self.parser.parse(cv_text)
+                with tracer.span("parse"):
+                    result = self.parser.parse(cv_text)
                 
                 # Calculer la similarité avec l'offre d'emploi si fournie
                 if job_description:
-                    similarity = self.parser.match_cv_with_job(cv_text, job_description)
+                    with tracer.span("match"):
+                        similarity = self.parser.match_cv_with_job(cv_text, job_description)
                     result["match_score"] = float(similarity)
                 
-                # Convertir les embeddings numpy en liste pour la sérialisation JSON
-                if "embedding" in result:
-                    result["embedding"] = result["embedding"].tolist()
+                # Réutiliser l'embedding déjà calculé par un autre processus, ou alimenter le cache
+                if self.embedding_store is not None:
+                    with tracer.span("embedding_cache"):
+                        cached_embedding = self.embedding_store.get(cv_text, self.embedding_model_key)
+                        if cached_embedding is not None:
+                            result["embedding"] = cached_embedding
+                        elif result.get("embedding") is not None:
+                            self.embedding_store.put(cv_text, self.embedding_model_key, result["embedding"])
+                
+                # L'embedding reste un tableau NumPy: il est stocké en binaire par save_analysis
+                # et converti en liste uniquement lors d'une sérialisation JSON (voir to_json_compatible)
+                if result.get("embedding") is not None:
+                    with tracer.span("embedding_convert"):
+                        result["embedding"] = np.asarray(result["embedding"], dtype=np.float32)
                 
                 return result
             except Exception as e:
@@ -58,7 +200,8 @@ class CVParserService:
                 return self._simulate_cv_parsing(cv_text, job_description)
         else:
             # Mode de simulation
-            return self._simulate_cv_parsing(cv_text, job_description)
+            with tracer.span("simulate"):
+                return self._simulate_cv_parsing(cv_text, job_description)
     
     def _simulate_cv_parsing(self, cv_text: str, job_description: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -66,43 +209,29 @@ class CVParserService:
         """
         print("Simulation de l'analyse de CV...")
         
-        # Extraire quelques informations basiques avec des expressions régulières simples
-        import re
-        
-        # Simuler l'extraction du nom (première ligne non vide)
-        lines = [line.strip() for line in cv_text.split('\n') if line.strip()]
-        name = lines[0] if lines else "Candidat Inconnu"
+        # Simuler l'extraction du nom (première ligne non vide, sans découper tout le CV)
+        name = next((line.strip() for line in cv_text.splitlines() if line.strip()), "Candidat Inconnu")
         
         # Simuler l'extraction de l'email
-        email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', cv_text)
+        email_match = EMAIL_RE.search(cv_text)
         email = email_match.group(0) if email_match else None
         
         # Simuler l'extraction du téléphone
-        phone_match = re.search(r'(?:\+\d{1,3}[-.\s]?)?(?:\d{1,4}[-.\s]?){1,5}\d{1,4}', cv_text)
+        phone_match = PHONE_RE.search(cv_text)
         phone = phone_match.group(0) if phone_match else None
         
-        # Simuler l'extraction des compétences
-        common_skills = [
-            "Python", "JavaScript", "Java", "C++", "React", "Angular", "Vue", 
-            "Node.js", "Express", "Django", "Flask", "TensorFlow", "PyTorch", 
-            "SQL", "MongoDB", "AWS", "Azure", "Docker", "Kubernetes"
-        ]
-        
-        # Extraire les compétences qui apparaissent dans le texte
-        skills = [skill for skill in common_skills if skill.lower() in cv_text.lower()]
+        # Extraire les compétences qui apparaissent dans le texte: mise en minuscules unique,
+        # puis un seul parcours pour tout le vocabulaire
+        skills = SIMULATED_SKILL_MATCHER.extract_lowered(cv_text.lower())
         
         # Si aucune compétence n'est trouvée, en générer quelques-unes aléatoirement
         if not skills:
-            import random
-            skills = random.sample(common_skills, min(5, len(common_skills)))
+            skills = random.sample(SIMULATED_SKILLS, min(5, len(SIMULATED_SKILLS)))
         
         # Simuler un score de correspondance avec l'offre d'emploi
         match_score = None
         if job_description:
-            # Calculer un score basé sur le nombre de compétences communes
-            job_skills = [skill for skill in common_skills if skill.lower() in job_description.lower()]
-            common_skills_count = len(set(skills).intersection(set(job_skills)))
-            match_score = 0.5 + (common_skills_count / max(len(job_skills), 1)) * 0.5
+            match_score = self._simulate_match_score(skills, job_description)
         
         # Créer le résultat simulé
         result = {
@@ -127,30 +256,94 @@ class CVParserService:
         
         return result
     
-    def save_analysis(self, cv_id: str, analysis_result: Dict[str, Any]) -> None:
+    def quick_extract(self, cv_text: str) -> Dict[str, Any]:
+        """
+        Extraction rapide (expressions régulières) des informations de contact et des compétences
+        
+        Sert de résultat partiel en attendant l'analyse complète d'un CV.
         """
-        Sauvegarde le résultat d'analyse dans un fichier JSON
+        email_match = EMAIL_RE.search(cv_text)
+        phone_match = PHONE_RE.search(cv_text)
+        return {
+            "name": next((line.strip() for line in cv_text.splitlines() if line.strip()), None),
+            "email": email_match.group(0) if email_match else None,
+            "phone": phone_match.group(0) if phone_match else None,
+            "skills": SIMULATED_SKILL_MATCHER.extract_lowered(cv_text.lower())
+        }
+    
+    def _simulate_match_score(self, skills: List[str], job_description: str) -> float:
+        """
+        Simule un score de correspondance basé sur le nombre de compétences communes
+        """
+        job_skills = SIMULATED_SKILL_MATCHER.extract_lowered(job_description.lower())
+        common_skills_count = len(set(skills).intersection(job_skills))
+        return 0.5 + (common_skills_count / max(len(job_skills), 1)) * 0.5
+    
+    def save_analysis(self, cv_id: str, analysis_result: Dict[str, Any]) -> None:
         """
-        file_path = f"data/cv_analysis/{cv_id}.json"
+        Sauvegarde le résultat d'analyse dans le stockage des analyses
         
-        # Supprimer les embeddings pour économiser de l'espace
-        if "embedding" in analysis_result:
-            del analysis_result["embedding"]
+        L'embedding est conservé (blob float16) pour être réutilisé sans nouveau calcul, et les
+        empreintes de l'analyse sont indexées dans la même écriture: les soumissions suivantes
+        du même CV, dans ce processus ou un autre, seront résolues par son empreinte.
+        """
+        with tracer.span("store_write"):
+            self.analysis_store.put(cv_id, analysis_result)
+    
+    def parse_and_save(self, cv_id: str, cv_text: str, job_description: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analyse un CV et le sauvegarde sous `cv_id`
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis_result, f, ensure_ascii=False, indent=2)
+        Un doublon n'est pas sauvegardé une seconde fois: `cv_id` renvoie alors à l'analyse d'origine.
+        """
+        result = self.parse_cv(cv_text, job_description)
+        if not result.get("duplicate_of"):
+            self.save_analysis(cv_id, result)
+        elif result["duplicate_of"] != cv_id:
+            self.analysis_store.put(cv_id, {ALIAS_KEY: result["duplicate_of"]})
+        return result
     
     def get_analysis(self, cv_id: str) -> Optional[Dict[str, Any]]:
         """
         Récupère le résultat d'analyse d'un CV
         """
-        file_path = f"data/cv_analysis/{cv_id}.json"
+        with tracer.span("store_read"):
+            analysis = self.analysis_store.get(cv_id)
+        
+        # Migrer à la volée une analyse encore stockée dans l'ancien format
+        if analysis is None and self.legacy_store is not None:
+            analysis = self.legacy_store.get(cv_id)
+            if analysis is not None:
+                self.analysis_store.put(cv_id, analysis)
         
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        # Doublon soumis sous un autre identifiant: retourner l'analyse d'origine
+        if analysis is not None and ALIAS_KEY in analysis:
+            target_id = analysis[ALIAS_KEY]
+            analysis = self.analysis_store.get(target_id)
+            if analysis is not None:
+                analysis["duplicate_of"] = target_id
         
-        return None
+        return analysis
+    
+    def get_embedding(self, cv_id: str):
+        """
+        Récupère l'embedding stocké d'un CV (vue NumPy float16 de forme (1, dim)), ou None
+        """
+        embedding = self.analysis_store.get_embedding(cv_id)
+        if embedding is None and self.legacy_store is not None:
+            analysis = self.get_analysis(cv_id)
+            embedding = analysis.get("embedding") if analysis else None
+        return embedding
+
+def to_json_compatible(analysis: Dict[str, Any], include_embedding: bool = True) -> Dict[str, Any]:
+    """
+    Copie d'une analyse sérialisable en JSON (embedding NumPy converti en liste, ou omis)
+    """
+    analysis = dict(analysis)
+    embedding = analysis.pop("embedding", None)
+    if include_embedding and embedding is not None:
+        analysis["embedding"] = embedding.tolist() if hasattr(embedding, "tolist") else embedding
+    return analysis
 
 # Singleton pour le service
 _cv_parser_service = None
@@ -161,20 +354,157 @@ def get_cv_parser_service():
         _cv_parser_service = CVParserService()
     return _cv_parser_service
 
+# Ingestion par lots ----------------------------------------------------------
+
+def iter_cv_directory(directory: str, job_description: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parcourt les CV d'un répertoire (un fichier .txt, .pdf ou .docx par CV, identifié par son nom)
+    """
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        cv_id, extension = os.path.splitext(entry.name)
+        if not entry.is_file() or extension.lower() not in CV_FILE_EXTENSIONS:
+            continue
+        try:
+            with open(entry.path, 'rb') as f:
+                cv_text, _ = extract_text(f, entry.name)
+        except ValueError as e:
+            yield {"cv_id": cv_id, "error": f"Fichier {entry.name} illisible: {e}"}
+            continue
+        yield {"cv_id": cv_id, "cv_text": cv_text, "job_description": job_description}
+
+
+def iter_cv_jsonl(lines: Iterable, job_description: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lit un flux JSONL de CV: une ligne {"cv_id"?, "cv_text", "job_description"?} par CV
+
+    Une ligne illisible produit un élément en erreur au lieu d'interrompre tout le lot.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict) or 'cv_text' not in item:
+                raise ValueError("le champ cv_text est requis")
+        except ValueError as e:
+            yield {"cv_id": None, "error": f"Ligne {line_number} invalide: {e}"}
+            continue
+        item.setdefault("job_description", job_description)
+        yield item
+
+
+def _parse_batch_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analyse et sauvegarde un CV d'un lot (exécuté dans un processus du pool)
+    """
+    cv_id = str(item.get("cv_id") or uuid.uuid4())
+    try:
+        # Les messages de l'analyse ne doivent pas se mêler au flux NDJSON de la sortie standard
+        with contextlib.redirect_stdout(sys.stderr):
+            result = get_cv_parser_service().parse_and_save(cv_id, item["cv_text"], item.get("job_description"))
+        return {"cv_id": cv_id, "success": True, "result": result}
+    except Exception as e:
+        return {"cv_id": cv_id, "success": False, "error": str(e)}
+
+
+def parse_cv_batch(items: Iterable[Dict[str, Any]], workers: int = BATCH_WORKERS) -> Iterator[Dict[str, Any]]:
+    """
+    Analyse un flux de CV dans un pool de processus borné et retourne les résultats au fil de l'eau
+
+    Les résultats sont produits dans l'ordre de fin de traitement (et non d'entrée). Au plus
+    `workers * BATCH_PENDING_PER_WORKER` CV sont en attente à un instant donné: le flux
+    d'entrée est consommé au rythme du traitement, quelle que soit la taille du lot.
+    """
+    if workers <= 1:
+        for item in items:
+            if "error" in item:
+                yield {"cv_id": item.get("cv_id"), "success": False, "error": item["error"]}
+            else:
+                yield _parse_batch_item(item)
+        return
+
+    max_pending = workers * BATCH_PENDING_PER_WORKER
+    # "spawn": ne pas dupliquer l'état (modèles, threads) du processus parent dans les workers
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = set()
+        for item in items:
+            if "error" in item:
+                yield {"cv_id": item.get("cv_id"), "success": False, "error": item["error"]}
+                continue
+
+            pending.add(executor.submit(_parse_batch_item, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def write_ndjson(results: Iterable[Dict[str, Any]], output: TextIO) -> Dict[str, int]:
+    """
+    Écrit les résultats d'un lot en NDJSON (une ligne par CV) et retourne le bilan
+    """
+    summary = {"processed": 0, "failed": 0}
+    for result in results:
+        summary["processed"] += 1
+        if not result.get("success"):
+            summary["failed"] += 1
+        if "result" in result:
+            result = dict(result, result=to_json_compatible(result["result"]))
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+    return summary
+
+
 # Point d'entrée pour l'exécution en ligne de commande
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python cv_parser_service.py <cv_text_file> [job_description_file]")
+    arg_parser = argparse.ArgumentParser(description="Analyse de CV (un fichier ou un lot)")
+    arg_parser.add_argument("cv_text_file", nargs="?", help="Fichier d'un CV (texte, PDF ou DOCX)")
+    arg_parser.add_argument("job_description_file", nargs="?", help="Fichier de la description du poste")
+    arg_parser.add_argument("--batch", metavar="SOURCE",
+                            help="Répertoire de CV (.txt, .pdf, .docx), fichier JSONL, ou '-' pour un JSONL sur l'entrée standard")
+    arg_parser.add_argument("--job", help="Fichier de la description du poste appliquée à tout le lot")
+    arg_parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Nombre de processus d'analyse")
+    args = arg_parser.parse_args()
+    
+    if args.batch:
+        batch_job_description = None
+        if args.job:
+            with open(args.job, 'r', encoding='utf-8') as f:
+                batch_job_description = f.read()
+        
+        if args.batch == "-":
+            batch_items = iter_cv_jsonl(sys.stdin, batch_job_description)
+        elif os.path.isdir(args.batch):
+            batch_items = iter_cv_directory(args.batch, batch_job_description)
+        else:
+            batch_items = iter_cv_jsonl(open(args.batch, 'r', encoding='utf-8'), batch_job_description)
+        
+        # Résultats en NDJSON sur la sortie standard, bilan sur la sortie d'erreur
+        summary = write_ndjson(parse_cv_batch(batch_items, args.workers), sys.stdout)
+        print(f"{summary['processed']} CV traités, {summary['failed']} en erreur.", file=sys.stderr)
+        sys.exit(1 if summary["failed"] else 0)
+    
+    if not args.cv_text_file:
+        arg_parser.print_usage()
         sys.exit(1)
     
-    # Lire le texte du CV
-    with open(sys.argv[1], 'r', encoding='utf-8') as f:
-        cv_text = f.read()
+    # Lire le texte du CV (extrait page par page pour un PDF ou un DOCX)
+    with open(args.cv_text_file, 'rb') as f:
+        cv_text, _ = extract_text(f, args.cv_text_file)
     
     # Lire la description du poste si fournie
     job_description = None
-    if len(sys.argv) > 2:
-        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+    if args.job_description_file:
+        with open(args.job_description_file, 'r', encoding='utf-8') as f:
             job_description = f.read()
     
     # Analyser le CV
@@ -182,4 +512,4 @@ if __name__ == "__main__":
     result = service.parse_cv(cv_text, job_description)
     
     # Afficher le résultat
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(json.dumps(to_json_compatible(result), ensure_ascii=False, indent=2))
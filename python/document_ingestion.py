@@ -0,0 +1,205 @@
+import os
+import io
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+# Extracteurs PDF optionnels (pypdf de préférence, pdfminer.six à défaut)
+try:
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+    PYPDF_INSTALLED = True
+except ImportError:
+    PYPDF_INSTALLED = False
+
+try:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    from pdfminer.psparser import PSException
+    PDFMINER_INSTALLED = True
+except ImportError:
+    PDFMINER_INSTALLED = False
+
+# Limites par document: au-delà, l'extraction s'arrête et le texte est marqué comme tronqué
+MAX_DOCUMENT_CHARS = int(os.environ.get("CV_MAX_DOCUMENT_CHARS", 100000))
+MAX_DOCUMENT_PAGES = int(os.environ.get("CV_MAX_DOCUMENT_PAGES", 50))
+
+# Taille indicative d'une "page" pour les formats sans pagination (texte brut, DOCX sans saut de page)
+BLOCK_CHARS = 4000
+
+DOCUMENT_FORMATS = ("pdf", "docx", "txt")
+
+_W_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UnsupportedDocumentError(ValueError):
+    """
+    Format de document non pris en charge, ou extracteur correspondant non installé
+    """
+
+
+def detect_format(stream: BinaryIO, filename: Optional[str] = None) -> str:
+    """
+    Détermine le format d'un document d'après sa signature, puis son extension
+    """
+    position = stream.tell()
+    header = stream.read(4)
+    stream.seek(position)
+
+    if header.startswith(b"%PDF"):
+        return "pdf"
+    if header.startswith(b"PK"):
+        return "docx"
+
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension in DOCUMENT_FORMATS:
+        return extension
+    return "txt"
+
+
+def iter_pdf_pages(stream: BinaryIO) -> Iterator[str]:
+    """
+    Texte d'un PDF, page par page (une seule page décodée en mémoire à la fois)
+
+    Un PDF corrompu lève `UnsupportedDocumentError`, comme un format non pris en charge.
+    """
+    if PYPDF_INSTALLED:
+        try:
+            reader = PdfReader(stream)
+            for page in reader.pages:
+                yield page.extract_text() or ""
+        except (PyPdfError, KeyError, TypeError) as e:
+            raise UnsupportedDocumentError(f"Document PDF illisible: {e}")
+    elif PDFMINER_INSTALLED:
+        try:
+            for page_layout in extract_pages(stream):
+                yield "".join(element.get_text() for element in page_layout if isinstance(element, LTTextContainer))
+        except (PSException, KeyError, TypeError) as e:
+            raise UnsupportedDocumentError(f"Document PDF illisible: {e}")
+    else:
+        raise UnsupportedDocumentError("Aucun extracteur PDF installé (pip install pypdf)")
+
+
+def iter_docx_pages(stream: BinaryIO) -> Iterator[str]:
+    """
+    Texte d'un DOCX, page par page, en lisant le XML du document en flux
+
+    Les paragraphes sont regroupés jusqu'au prochain saut de page (explicite ou mémorisé
+    par Word), ou par blocs d'environ `BLOCK_CHARS` caractères; chaque paragraphe est
+    libéré dès qu'il a été lu, sans construire l'arbre XML complet. Une archive ou un XML
+    corrompu lève `UnsupportedDocumentError`.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+        document = archive.open("word/document.xml")
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise UnsupportedDocumentError(f"Document DOCX illisible: {e}")
+
+    paragraphs = []
+    size = 0
+    with archive, document:
+        try:
+            for _, element in ET.iterparse(document, events=("end",)):
+                if element.tag != _W_NAMESPACE + "p":
+                    continue
+
+                page_break = any(
+                    child.tag == _W_NAMESPACE + "lastRenderedPageBreak"
+                    or (child.tag == _W_NAMESPACE + "br" and child.get(_W_NAMESPACE + "type") == "page")
+                    for child in element.iter()
+                )
+                if page_break and paragraphs:
+                    yield "\n".join(paragraphs)
+                    paragraphs, size = [], 0
+
+                text = "".join(node.text or "" for node in element.iter(_W_NAMESPACE + "t"))
+                element.clear()
+                if text:
+                    paragraphs.append(text)
+                    size += len(text)
+
+                if size >= BLOCK_CHARS:
+                    yield "\n".join(paragraphs)
+                    paragraphs, size = [], 0
+        except (ET.ParseError, zipfile.BadZipFile, zlib.error, EOFError) as e:
+            # XML mal formé ou entrée de l'archive tronquée
+            raise UnsupportedDocumentError(f"Document DOCX illisible: {e}")
+
+    if paragraphs:
+        yield "\n".join(paragraphs)
+
+
+def iter_text_pages(stream: BinaryIO, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Texte brut par blocs d'environ `BLOCK_CHARS` caractères, coupés en fin de ligne
+    """
+    reader = io.TextIOWrapper(stream, encoding=encoding, errors="replace")
+    lines = []
+    size = 0
+    try:
+        for line in reader:
+            lines.append(line)
+            size += len(line)
+            if size >= BLOCK_CHARS:
+                yield "".join(lines)
+                lines, size = [], 0
+        if lines:
+            yield "".join(lines)
+    finally:
+        # Ne pas fermer le flux de l'appelant avec l'adaptateur texte
+        reader.detach()
+
+
+def iter_document_pages(stream: BinaryIO, filename: Optional[str] = None) -> Iterator[str]:
+    """
+    Texte d'un document (PDF, DOCX ou texte brut), page par page
+    """
+    document_format = detect_format(stream, filename)
+    if document_format == "pdf":
+        return iter_pdf_pages(stream)
+    if document_format == "docx":
+        return iter_docx_pages(stream)
+    return iter_text_pages(stream)
+
+
+def extract_text(stream: BinaryIO, filename: Optional[str] = None, max_chars: int = MAX_DOCUMENT_CHARS,
+                 max_pages: int = MAX_DOCUMENT_PAGES) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extrait le texte d'un document en bornant la mémoire utilisée
+
+    Les pages sont lues une à une et l'extraction s'arrête dès que `max_chars` caractères
+    ou `max_pages` pages ont été lus: un long portfolio n'est jamais chargé en entier.
+    Retourne le texte et un résumé de l'extraction (format, pages lues, troncature).
+    """
+    document_format = detect_format(stream, filename)
+    pages = []
+    size = 0
+    page_count = 0
+    truncated = False
+
+    page_iterator = iter_document_pages(stream, filename)
+    try:
+        for page_text in page_iterator:
+            if page_count >= max_pages:
+                truncated = True
+                break
+            if len(page_text) > max_chars - size:
+                page_text = page_text[:max_chars - size]
+                truncated = True
+            pages.append(page_text)
+            size += len(page_text)
+            page_count += 1
+            if truncated:
+                break
+    finally:
+        # Libérer immédiatement le lecteur (archive DOCX, fichier PDF) sans attendre le ramasse-miettes
+        page_iterator.close()
+
+    info = {
+        "format": document_format,
+        "pages": page_count,
+        "chars": size,
+        "truncated": truncated
+    }
+    return "\n".join(pages), info
@@ -0,0 +1,225 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Répertoire par défaut du cache d'embeddings (relatif au répertoire de lancement des serveurs)
+DEFAULT_STORE_DIR = "data/embeddings"
+DEFAULT_CAPACITY = 50000
+DEFAULT_DIM = 768
+
+# Fichier de la base SQLite du cache dans son répertoire
+STORE_FILENAME = "embeddings.sqlite3"
+
+# Configuration par défaut des embeddings de documents (voir encoder_backends et semantic_matcher)
+DEFAULT_EMBEDDING_BACKEND = "torch"
+DEFAULT_EMBEDDING_POOLING = "mean"
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("SEMANTIC_MATCHER_TOKEN_BUDGET", 4096))
+
+# Délai (secondes) en deçà duquel une lecture ne rafraîchit pas la date d'utilisation d'une entrée:
+# les lectures répétées d'un même texte ne deviennent pas des écritures
+DEFAULT_TOUCH_INTERVAL = 60.0
+
+
+def embedding_model_key(model_name: str, encoder_backend: Optional[str] = None, pooling: Optional[str] = None,
+                        token_budget: Optional[int] = None) -> str:
+    """
+    Clé de modèle des embeddings de documents du matcher sémantique (fragments regroupés)
+
+    Le backend d'encodeur, le pooling des fragments et un budget de tokens autre que celui par
+    défaut produisent des vecteurs différents: ils font partie de la clé. Les valeurs omises
+    sont celles de la configuration du processus (SEMANTIC_MATCHER_ENCODER, SEMANTIC_MATCHER_POOLING).
+    """
+    encoder_backend = encoder_backend or os.environ.get("SEMANTIC_MATCHER_ENCODER", DEFAULT_EMBEDDING_BACKEND)
+    pooling = pooling or os.environ.get("SEMANTIC_MATCHER_POOLING", DEFAULT_EMBEDDING_POOLING)
+    key = f"{model_name}+{encoder_backend}:chunked-{pooling}"
+    if token_budget and token_budget != DEFAULT_TOKEN_BUDGET:
+        key = f"{key}@{token_budget}"
+    return key
+
+
+def parser_embedding_key(model_name: str) -> str:
+    """
+    Clé de modèle des embeddings calculés par le parser de CV
+
+    Le parser produit ses vecteurs avec son propre encodage et son propre pooling: ils ne
+    sont pas interchangeables avec ceux du matcher et sont rangés sous une clé distincte.
+    """
+    return f"{model_name}:cv-parser"
+
+
+class EmbeddingStore:
+    """
+    Cache persistant d'embeddings adressé par contenu.
+
+    Chaque entrée est identifiée par un hash SHA-256 du texte normalisé et du nom du
+    modèle, et son vecteur est stocké en float16 dans une base SQLite (`embeddings.sqlite3`)
+    avec sa date de dernière utilisation. Le vecteur et son entrée d'index sont une seule
+    ligne écrite dans une transaction: plusieurs processus (serveurs, workers des lots et
+    des tâches asynchrones) peuvent partager le même répertoire sans jamais associer une
+    clé au vecteur d'une autre. Au-delà de `capacity` entrées, les moins récemment
+    utilisées sont évincées dans la transaction d'écriture.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR, dim: int = DEFAULT_DIM,
+                 capacity: int = DEFAULT_CAPACITY, touch_interval: float = DEFAULT_TOUCH_INTERVAL):
+        self.directory = directory
+        self.path = os.path.join(directory, STORE_FILENAME)
+        self.capacity = capacity
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+
+        os.makedirs(directory, exist_ok=True)
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " vector BLOB NOT NULL,"
+                " used_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS embeddings_used_at ON embeddings (used_at)")
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            # La dimension d'un cache existant prime sur celle demandée
+            connection.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('dim', ?)", (str(dim),))
+        self.dim = int(connection.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()[0])
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            # En mode WAL, synchronous=NORMAL reste sûr en cas de crash du processus
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Normalise un texte avant hachage (forme Unicode NFC, espaces compactés)
+        """
+        text = unicodedata.normalize("NFC", text)
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(cls, text: str, model_name: str) -> str:
+        """
+        Calcule la clé de cache d'un texte pour un modèle donné
+        """
+        digest = hashlib.sha256()
+        digest.update(model_name.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(cls.normalize_text(text).encode('utf-8'))
+        return digest.hexdigest()
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get(self, text: str, model_name: str) -> Optional[np.ndarray]:
+        """
+        Récupère l'embedding d'un texte, ou None s'il n'est pas en cache
+        """
+        vectors = self._read([self.make_key(text, model_name)])
+        vector = vectors[0]
+        return None if vector is None else vector.astype(np.float32).reshape(1, -1)
+
+    def put(self, text: str, model_name: str, embedding: np.ndarray) -> None:
+        """
+        Ajoute ou remplace l'embedding d'un texte dans le cache
+        """
+        vector = np.asarray(embedding, dtype=np.float16).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Dimension d'embedding invalide: {vector.shape[0]} (attendu {self.dim})")
+        self._write([self.make_key(text, model_name)], [vector])
+
+    def get_or_compute(self, texts: List[str], model_name: str,
+                       compute: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Retourne les embeddings des textes, en ne calculant que ceux absents du cache
+
+        `compute` reçoit la liste des textes manquants et doit retourner une matrice
+        (len(textes), dim); elle n'est appelée qu'une fois par lot.
+        """
+        keys = [self.make_key(text, model_name) for text in texts]
+        embeddings = np.empty((len(texts), self.dim), dtype=np.float32)
+        missing = []
+
+        for i, vector in enumerate(self._read(keys)):
+            if vector is None:
+                missing.append(i)
+            else:
+                embeddings[i] = vector
+
+        if missing:
+            computed = np.asarray(compute([texts[i] for i in missing]), dtype=np.float32)
+            embeddings[missing] = computed
+            self._write([keys[i] for i in missing], computed.astype(np.float16))
+
+        return embeddings
+
+    def _read(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Vecteurs float16 des clés (None pour une clé absente), en rafraîchissant leur date d'utilisation
+        """
+        if not keys:
+            return []
+        connection = self._connection()
+        found = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            rows = connection.execute(
+                f"SELECT key, vector, used_at FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            found.update((key, (vector, used_at)) for key, vector, used_at in rows)
+
+        now = time.time()
+        stale = [(now, key) for key, (_, used_at) in found.items() if now - used_at >= self.touch_interval]
+        if stale:
+            with connection:
+                connection.executemany("UPDATE embeddings SET used_at = ? WHERE key = ?", stale)
+
+        return [np.frombuffer(found[key][0], dtype=np.float16) if key in found else None for key in keys]
+
+    def _write(self, keys: List[str], vectors) -> None:
+        """
+        Écrit des vecteurs et évince les entrées les moins récemment utilisées, dans une seule transaction
+        """
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, used_at) VALUES (?, ?, ?)",
+                [(key, np.asarray(vector, dtype=np.float16).tobytes(), now) for key, vector in zip(keys, vectors)]
+            )
+            connection.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY used_at"
+                " LIMIT max(0, (SELECT COUNT(*) FROM embeddings) - ?))",
+                (self.capacity,)
+            )
+
+    def flush(self) -> None:
+        """
+        Reporte le journal WAL dans la base (chaque écriture est déjà validée)
+        """
+        self._connection().execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+# Singleton pour le cache partagé par les services d'un même processus
+_embedding_store = None
+_embedding_store_lock = threading.Lock()
+
+def get_embedding_store() -> EmbeddingStore:
+    global _embedding_store
+    with _embedding_store_lock:
+        if _embedding_store is None:
+            _embedding_store = EmbeddingStore(os.environ.get("EMBEDDING_STORE_DIR", DEFAULT_STORE_DIR))
+    return _embedding_store
@@ -0,0 +1,135 @@
+import os
+import threading
+from typing import Any, Dict
+
+import numpy as np
+import torch
+
+# Backends disponibles pour l'encodeur BERT
+ENCODER_BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_ENCODER_BACKEND = "torch"
+
+# Répertoire des modèles exportés au format ONNX
+ONNX_EXPORT_DIR = "data/onnx"
+
+# Similarité cosinus minimale attendue entre un backend et la référence fp32
+PARITY_THRESHOLD = 0.99
+
+
+class TorchEncoder:
+    """
+    Encodeur de référence: modèle PyTorch en float32 exécuté en mode eager
+    """
+    name = "torch"
+
+    def __init__(self, model, model_name: str):
+        self.model = model
+        self.model_name = model_name
+
+    def encode(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        """
+        Retourne les états cachés de la dernière couche (batch, séquence, dimension)
+        """
+        with torch.inference_mode():
+            outputs = self.model(**inputs)
+        return outputs.last_hidden_state.numpy()
+
+
+class QuantizedTorchEncoder(TorchEncoder):
+    """
+    Encodeur PyTorch dont les couches linéaires sont quantifiées dynamiquement en int8
+    """
+    name = "int8"
+
+    def __init__(self, model, model_name: str):
+        # quantize_dynamic retourne une copie: le modèle fp32 partagé n'est pas modifié
+        quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        quantized.eval()
+        super().__init__(quantized, model_name)
+
+
+class OnnxEncoder:
+    """
+    Encodeur exécuté par ONNX Runtime à partir d'un export ONNX du modèle
+
+    L'export est réalisé une seule fois dans `ONNX_EXPORT_DIR` puis réutilisé.
+    """
+    name = "onnx"
+
+    def __init__(self, model, model_name: str, export_dir: str = ONNX_EXPORT_DIR):
+        import onnxruntime
+
+        self.model_name = model_name
+        self.path = os.path.join(export_dir, model_name.replace("/", "_") + ".onnx")
+        if not os.path.exists(self.path):
+            os.makedirs(export_dir, exist_ok=True)
+            _export_onnx(model, self.path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def encode(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        feed = {name: tensor.numpy().astype(np.int64) for name, tensor in inputs.items() if name in self.input_names}
+        return self.session.run(None, feed)[0]
+
+
+def _export_onnx(model, path: str) -> None:
+    """
+    Exporte le modèle en ONNX avec des axes dynamiques pour le lot et la séquence
+    """
+    dummy_inputs = {
+        "input_ids": torch.ones((1, 8), dtype=torch.long),
+        "attention_mask": torch.ones((1, 8), dtype=torch.long)
+    }
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in dummy_inputs}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    # Écrire dans un fichier temporaire pour ne jamais laisser un export incomplet
+    tmp_path = path + ".tmp"
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            (dummy_inputs,),
+            tmp_path,
+            input_names=list(dummy_inputs),
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+    os.replace(tmp_path, path)
+
+
+_ENCODER_CLASSES = {
+    TorchEncoder.name: TorchEncoder,
+    QuantizedTorchEncoder.name: QuantizedTorchEncoder,
+    OnnxEncoder.name: OnnxEncoder
+}
+
+_encoders: Dict[Any, Any] = {}
+_encoders_lock = threading.Lock()
+
+def get_encoder(backend: str, model, model_name: str):
+    """
+    Retourne l'encodeur du backend demandé pour un modèle, créé une seule fois par processus
+    """
+    if backend not in _ENCODER_CLASSES:
+        raise ValueError(f"Backend d'encodeur inconnu: {backend} (attendu: {', '.join(ENCODER_BACKENDS)})")
+
+    key = (backend, model_name)
+    with _encoders_lock:
+        if key not in _encoders:
+            _encoders[key] = _ENCODER_CLASSES[backend](model, model_name)
+        return _encoders[key]
+
+
+def cosine_parity(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """
+    Similarité cosinus ligne à ligne entre les embeddings de référence et ceux d'un autre backend
+    """
+    reference = np.asarray(reference, dtype=np.float32)
+    candidate = np.asarray(candidate, dtype=np.float32)
+    dot = np.sum(reference * candidate, axis=1)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    return dot / np.maximum(norms, 1e-12)
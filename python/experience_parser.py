@@ -0,0 +1,138 @@
+import re
+import json
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Clé sous laquelle les années d'expérience sont mises en cache dans les métadonnées de l'index des candidats
+EXPERIENCE_CACHE_KEY = "experience_cache"
+
+# Années sur quatre chiffres ("2015–2019", "depuis 2018")
+_YEAR_RE = re.compile(r'(?<!\d)(?:19|20)\d{2}(?!\d)')
+
+# Fin de période ouverte ("2018 - présent", "2020 à aujourd'hui")
+_PRESENT_RE = re.compile(r"(?i)\b(?:présent|present|aujourd'hui|actuel(?:lement)?|en cours|now|current)\b")
+
+# Score d'expérience d'un candidat sans aucune expérience renseignée
+NO_EXPERIENCE_SCORE = 0.3
+
+
+def parse_period(period: str, current_year: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """
+    Convertit une période textuelle en intervalle d'années [début, fin)
+
+    Une année isolée compte pour un an; une fin "présent" est remplacée par l'année courante.
+    Retourne None si la période ne contient aucune année.
+    """
+    years = [int(year) for year in _YEAR_RE.findall(period or "")]
+    if not years:
+        return None
+
+    start_year = years[0]
+    if _PRESENT_RE.search(period):
+        end_year = current_year or datetime.now().year
+    elif len(years) >= 2:
+        end_year = years[1]
+    else:
+        end_year = start_year + 1
+
+    # Éviter les durées négatives (dates inversées ou mal saisies)
+    return start_year, max(start_year, end_year)
+
+
+def normalize_experiences(experiences: Iterable[Dict[str, str]],
+                          current_year: Optional[int] = None) -> np.ndarray:
+    """
+    Convertit les expériences d'un CV en matrice (n, 2) d'intervalles d'années
+    """
+    current_year = current_year or datetime.now().year
+    ranges = [parse_period(exp.get("period", ""), current_year) for exp in experiences]
+    ranges = [year_range for year_range in ranges if year_range is not None]
+    return np.asarray(ranges, dtype=np.int32).reshape(-1, 2)
+
+
+def experience_years(cv_record: Dict[str, Any], current_year: Optional[int] = None) -> int:
+    """
+    Nombre total d'années d'expérience d'une fiche CV (la fiche n'est pas modifiée)
+    """
+    ranges = normalize_experiences(cv_record.get("experience", []), current_year)
+    return int((ranges[:, 1] - ranges[:, 0]).sum())
+
+
+def experience_signature(experiences: Iterable[Dict[str, str]], current_year: int) -> str:
+    """
+    Empreinte des expériences d'une fiche et de l'année de calcul (les fins "présent" en dépendent)
+    """
+    payload = json.dumps([current_year, list(experiences)], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def cached_experience_years(metadata: Dict[str, Any], current_year: Optional[int] = None) -> int:
+    """
+    Années d'expérience d'un candidat indexé, mises en cache dans ses métadonnées
+
+    Le cache (clé `experience_cache`) est associé à l'empreinte des expériences et de
+    l'année courante: il est recalculé si les expériences changent ou au changement d'année.
+    """
+    current_year = current_year or datetime.now().year
+    signature = experience_signature(metadata.get("experience", []), current_year)
+    cached = metadata.get(EXPERIENCE_CACHE_KEY)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    total_years = experience_years(metadata, current_year)
+    metadata[EXPERIENCE_CACHE_KEY] = [signature, total_years]
+    return total_years
+
+
+def experience_arrays(cv_records: Sequence[Dict[str, Any]], current_year: Optional[int] = None,
+                      cache: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retourne les années d'expérience et la présence d'expérience d'un lot de fiches CV
+
+    Avec `cache`, les fiches sont des métadonnées de l'index des candidats, sur lesquelles
+    les années sont mises en cache (voir cached_experience_years); sinon elles ne sont pas modifiées.
+    """
+    current_year = current_year or datetime.now().year
+    years_of = cached_experience_years if cache else experience_years
+    years = np.fromiter((years_of(record, current_year) for record in cv_records),
+                        dtype=np.float64, count=len(cv_records))
+    has_experience = np.fromiter((bool(record.get("experience")) for record in cv_records),
+                                 dtype=bool, count=len(cv_records))
+    return years, has_experience
+
+
+def score_experience(years: np.ndarray, has_experience: np.ndarray,
+                     min_years_required: int, max_years_required: float) -> np.ndarray:
+    """
+    Score d'expérience de tout un lot de candidats face aux exigences d'une offre
+
+    - sans exigence: plus d'expérience est mieux (score maximum à 5 ans)
+    - en dessous du minimum: pénalité proportionnelle au manque
+    - dans la plage demandée: score entre 0.8 et 1.0
+    - au-delà du maximum: légère pénalité (potentiellement surqualifié)
+    """
+    years = np.asarray(years, dtype=np.float64)
+    has_experience = np.asarray(has_experience, dtype=bool)
+
+    if min_years_required == 0:
+        scores = np.minimum(1.0, years / 5)
+    else:
+        span = max_years_required - min_years_required
+        if np.isinf(span):
+            in_range = np.full_like(years, 0.8)
+        elif span > 0:
+            in_range = 0.8 + 0.2 * (years - min_years_required) / span
+        else:
+            # Exigence exacte ("3 à 3 ans"): le candidat est au sommet de la plage
+            in_range = np.ones_like(years)
+
+        scores = np.select(
+            [years < min_years_required, years <= max_years_required],
+            [years / min_years_required * 0.7, in_range],
+            default=0.9
+        )
+
+    return np.where(has_experience, scores, NO_EXPERIENCE_SCORE)
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
@@ -7,6 +8,15 @@ import torch
 from transformers import GPT2LMHeadModel, GPT2Tokenizer, T5ForConditionalGeneration, T5Tokenizer
 import re
 
+# Rendre importables les modules partagés du répertoire python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from skills_taxonomy import get_skills_taxonomy
+
+# Vocabulaire de la taxonomie partagée recherché dans les offres (ordre de priorité des compétences clés)
+KEY_SKILL_VOCABULARY = "interview_key_skills"
+# Domaines utilisés si la taxonomie chargée ne définit pas ce vocabulaire
+KEY_SKILL_DOMAINS = ("programming", "data_science", "cloud", "frameworks", "databases", "tools", "soft_skills")
+
 class InterviewScenarioGenerator:
     """
     Classe pour générer des scénarios d'entretien personnalisés en utilisant GPT-2 et Rasa.
@@ -234,35 +244,8 @@ class InterviewScenarioGenerator:
         """
         Extrait les compétences clés de la description du poste.
         """
-        # Liste de compétences techniques courantes
-        technical_skills = [
-            "Python", "Java", "JavaScript", "C#", "C++", "Ruby", "PHP", "Swift", "Kotlin", "Go",
-            "React", "Angular", "Vue.js", "Node.js", "Django", "Flask", "Spring", "ASP.NET",
-            "SQL", "NoSQL", "MongoDB", "PostgreSQL", "MySQL", "Oracle", "Redis",
-            "AWS", "Azure", "GCP", "Docker", "Kubernetes", "CI/CD", "DevOps",
-            "Machine Learning", "Deep Learning", "AI", "Data Science", "Big Data", "Hadoop", "Spark",
-            "HTML", "CSS", "SASS", "LESS", "Bootstrap", "Tailwind",
-            "Git", "SVN", "Agile", "Scrum", "Kanban", "Jira", "Confluence"
-        ]
-        
-        # Liste de soft skills courantes
-        soft_skills = [
-            "communication", "travail d'équipe", "leadership", "gestion de projet", "résolution de problèmes",
-            "pensée critique", "créativité", "adaptabilité", "organisation", "gestion du temps",
-            "négociation", "présentation", "écoute active", "empathie", "intelligence émotionnelle",
-            "prise de décision", "autonomie", "initiative", "persévérance", "flexibilité"
-        ]
-        
-        # Rechercher les compétences dans la description
-        found_skills = []
-        
-        for skill in technical_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', job_description, re.IGNORECASE):
-                found_skills.append(skill)
-        
-        for skill in soft_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', job_description, re.IGNORECASE):
-                found_skills.append(skill)
+        # Rechercher les compétences de la taxonomie partagée en un seul passage
+        found_skills = get_skills_taxonomy().matcher(KEY_SKILL_DOMAINS, vocabulary=KEY_SKILL_VOCABULARY).extract(job_description)
         
         # Limiter à 10 compétences maximum
         return found_skills[:10]
@@ -0,0 +1,200 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Composants spaCy inutiles pour la simple recherche de mots-clés
+KEYWORD_DISABLE = ("parser", "ner")
+
+
+class ModelRegistry:
+    """
+    Registre des modèles NLP partagé par tous les services d'un même processus.
+
+    Chaque modèle est chargé paresseusement au premier usage puis réutilisé: deux
+    services qui demandent le même modèle spaCy (avec les mêmes composants désactivés)
+    ou le même modèle Transformers partagent une seule instance en mémoire. Les services
+    déclarent les modèles dont ils ont besoin sans les charger; `warmup()` charge
+    explicitement tous les modèles déclarés et `is_ready()` sert de sonde de disponibilité.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._models: Dict[Tuple, Any] = {}
+        self._errors: Dict[Tuple, str] = {}
+        self._load_times: Dict[Tuple, float] = {}
+        self._declared: Dict[Tuple, Tuple] = {}
+        self._warming_up = False
+
+    # Déclaration -----------------------------------------------------------
+
+    def declare_spacy(self, name: str, disable: Iterable[str] = (), fallbacks: Iterable[str] = ()) -> None:
+        """
+        Déclare un modèle spaCy nécessaire au service, sans le charger
+        """
+        key = self._spacy_key(name, disable)
+        with self._lock:
+            self._declared[key] = ("spacy", name, tuple(disable), tuple(fallbacks))
+
+    def declare_transformer(self, name: str) -> None:
+        """
+        Déclare un modèle Transformers nécessaire au service, sans le charger
+        """
+        key = ("transformer", name)
+        with self._lock:
+            self._declared[key] = ("transformer", name)
+
+    # Chargement paresseux --------------------------------------------------
+
+    def get_spacy(self, name: str, disable: Iterable[str] = (), fallbacks: Iterable[str] = ()):
+        """
+        Retourne le pipeline spaCy demandé, chargé au premier appel (None en cas d'échec)
+
+        Seuls les composants non désactivés sont chargés; les modèles de `fallbacks`
+        sont essayés dans l'ordre si le modèle principal n'est pas installé.
+        """
+        disable = tuple(disable)
+        self.declare_spacy(name, disable, fallbacks)
+        return self._get(self._spacy_key(name, disable),
+                         lambda: self._load_spacy(name, disable, tuple(fallbacks)))
+
+    def get_transformer(self, name: str) -> Tuple[Any, Any]:
+        """
+        Retourne le couple (tokenizer, modèle) Transformers, chargé au premier appel
+
+        Retourne (None, None) si le modèle ne peut pas être chargé.
+        """
+        self.declare_transformer(name)
+        loaded = self._get(("transformer", name), lambda: self._load_transformer(name))
+        return loaded if loaded is not None else (None, None)
+
+    def _get(self, key: Tuple, loader):
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Un verrou par modèle: deux requêtes simultanées ne chargent pas deux fois le même modèle
+        with key_lock:
+            if key in self._models:
+                return self._models[key]
+            if key in self._errors:
+                return None
+
+            start = time.perf_counter()
+            try:
+                model = loader()
+            except Exception as e:
+                print(f"Erreur lors du chargement du modèle {key}: {e}")
+                self._errors[key] = str(e)
+                return None
+
+            self._load_times[key] = time.perf_counter() - start
+            self._models[key] = model
+            print(f"Modèle {key} chargé en {self._load_times[key]:.1f}s.")
+            return model
+
+    @staticmethod
+    def _spacy_key(name: str, disable: Iterable[str]) -> Tuple:
+        return ("spacy", name, tuple(sorted(disable)))
+
+    @staticmethod
+    def _load_spacy(name: str, disable: Tuple[str, ...], fallbacks: Tuple[str, ...]):
+        import spacy
+
+        last_error = None
+        for candidate in (name,) + fallbacks:
+            try:
+                return spacy.load(candidate, disable=_existing_pipes(candidate, disable))
+            except OSError as e:
+                # Modèle non installé: essayer le suivant
+                last_error = e
+        raise last_error
+
+    @staticmethod
+    def _load_transformer(name: str):
+        from transformers import AutoTokenizer, AutoModel
+
+        tokenizer = AutoTokenizer.from_pretrained(name)
+        model = AutoModel.from_pretrained(name)
+        model.eval()
+        return tokenizer, model
+
+    # Préchauffage et disponibilité -----------------------------------------
+
+    def warmup(self, background: bool = False) -> Optional[threading.Thread]:
+        """
+        Charge tous les modèles déclarés, éventuellement dans un thread d'arrière-plan
+        """
+        if background:
+            thread = threading.Thread(target=self.warmup, name="model-warmup", daemon=True)
+            thread.start()
+            return thread
+
+        self._warming_up = True
+        try:
+            with self._lock:
+                declared = list(self._declared.values())
+            for spec in declared:
+                if spec[0] == "spacy":
+                    _, name, disable, fallbacks = spec
+                    self.get_spacy(name, disable, fallbacks)
+                else:
+                    self.get_transformer(spec[1])
+        finally:
+            self._warming_up = False
+        return None
+
+    def is_ready(self) -> bool:
+        """
+        Indique si tous les modèles déclarés sont chargés (ou en échec définitif)
+        """
+        if self._warming_up:
+            return False
+        with self._lock:
+            return all(key in self._models or key in self._errors for key in self._declared)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        État détaillé des modèles pour la sonde /ready
+        """
+        with self._lock:
+            models = {}
+            for key in self._declared:
+                label = ":".join(part if isinstance(part, str) else ",".join(part) for part in key[1:] if part)
+                if key in self._models:
+                    models[label] = {"status": "loaded", "load_seconds": round(self._load_times[key], 2)}
+                elif key in self._errors:
+                    models[label] = {"status": "error", "error": self._errors[key]}
+                else:
+                    models[label] = {"status": "pending"}
+        return {"ready": self.is_ready(), "models": models}
+
+
+def _existing_pipes(name: str, disable: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Ne garde que les composants effectivement présents dans le modèle installé
+    """
+    if not disable:
+        return disable
+    try:
+        import spacy
+
+        meta = spacy.util.get_model_meta(spacy.util.get_package_path(name))
+        return tuple(pipe for pipe in disable if pipe in meta.get("pipeline", []))
+    except Exception:
+        return disable
+
+
+# Singleton pour le registre partagé du processus
+_model_registry = None
+_model_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    global _model_registry
+    with _model_registry_lock:
+        if _model_registry is None:
+            _model_registry = ModelRegistry()
+    return _model_registry
@@ -0,0 +1,203 @@
+import os
+import time
+import uuid
+import threading
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from cv_parser_service import _parse_batch_item
+
+# Mode d'exécution des analyses asynchrones: threads du serveur ou processus séparés
+PARSE_JOB_MODES = ("thread", "process")
+DEFAULT_PARSE_JOB_MODE = "thread"
+DEFAULT_PARSE_JOB_WORKERS = min(4, os.cpu_count() or 1)
+
+# Nombre maximal de tâches en attente ou en cours; au-delà, les soumissions sont refusées
+DEFAULT_MAX_PENDING_JOBS = 256
+
+# Durée de conservation (secondes) d'une tâche terminée; son analyse reste ensuite dans le stockage
+FINISHED_JOB_TTL = 3600
+
+# États d'une tâche d'analyse
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class ParseJobQueueFull(RuntimeError):
+    """
+    Trop de tâches d'analyse en attente: la soumission est refusée
+    """
+
+
+def _parse_in_process(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analyse un CV dans un processus du pool; seul le statut est renvoyé au serveur
+    """
+    outcome = _parse_batch_item(item)
+    outcome.pop("result", None)
+    return outcome
+
+
+class ParseJob:
+    """
+    Tâche d'analyse d'un CV soumise en mode asynchrone
+    """
+
+    def __init__(self, cv_id: str, future: Future, partial: Dict[str, Any]):
+        self.cv_id = cv_id
+        self.future = future
+        self.partial = partial
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if self.future.done():
+            return FAILED if self.error else DONE
+        return RUNNING if self.future.running() else PENDING
+
+    @property
+    def error(self) -> Optional[str]:
+        if not self.future.done():
+            return None
+        exception = self.future.exception()
+        if exception is not None:
+            return str(exception)
+        outcome = self.future.result()
+        return None if outcome.get("success") else outcome.get("error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        job = {
+            "cv_id": self.cv_id,
+            "status": self.status,
+            "submittedAt": self.submitted_at,
+            "partial": self.partial
+        }
+        if self.finished_at is not None:
+            job["finishedAt"] = self.finished_at
+        if self.error:
+            job["error"] = self.error
+        return job
+
+
+class ParseJobManager:
+    """
+    Exécute les analyses de CV en arrière-plan dans un pool de workers borné.
+
+    `submit()` retourne immédiatement l'identifiant du CV; l'analyse est réalisée par
+    un pool de threads (modèles partagés avec le serveur) ou de processus (analyses
+    en parallèle réel, chaque processus chargeant ses propres modèles). Le résultat
+    est sauvegardé dans le stockage des analyses, qui indexe aussi ses empreintes: dans
+    les deux modes, les doublons sont visibles du serveur et des autres workers. La tâche
+    elle-même n'est conservée que le temps de son traitement, puis `FINISHED_JOB_TTL`
+    secondes. Au-delà de `max_pending` tâches non terminées, `submit()` lève
+    `ParseJobQueueFull` plutôt que d'allonger la file indéfiniment.
+    """
+
+    def __init__(self, service, workers: int = DEFAULT_PARSE_JOB_WORKERS, mode: str = DEFAULT_PARSE_JOB_MODE,
+                 max_pending: int = DEFAULT_MAX_PENDING_JOBS):
+        if mode not in PARSE_JOB_MODES:
+            raise ValueError(f"Mode d'exécution inconnu: {mode} (attendu: {', '.join(PARSE_JOB_MODES)})")
+        self.service = service
+        self.workers = workers
+        self.mode = mode
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ParseJob] = {}
+        self._pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    # "spawn": ne pas dupliquer l'état (modèles, threads Flask) du serveur dans les workers
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                         mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse-job")
+            return self._executor
+
+    def submit(self, cv_text: str, job_description: Optional[str] = None) -> str:
+        """
+        Met en file l'analyse d'un CV et retourne son identifiant
+        """
+        # Réserver une place dans la file avant tout travail
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ParseJobQueueFull(f"File d'analyse pleine ({self.max_pending} tâches en attente)")
+            self._pending += 1
+
+        cv_id = str(uuid.uuid4())
+        item = {"cv_id": cv_id, "cv_text": cv_text, "job_description": job_description}
+
+        try:
+            # Résultat partiel immédiat (contact et compétences), en attendant l'analyse complète
+            partial = self.service.quick_extract(cv_text)
+
+            if self.mode == "process":
+                future = self._get_executor().submit(_parse_in_process, item)
+            else:
+                future = self._get_executor().submit(self._parse_in_thread, item)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        job = ParseJob(cv_id, future, partial)
+        with self._lock:
+            self._prune()
+            self._jobs[cv_id] = job
+        future.add_done_callback(lambda _: self._finish(job))
+        return cv_id
+
+    def _parse_in_thread(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            self.service.parse_and_save(item["cv_id"], item["cv_text"], item.get("job_description"))
+            return {"cv_id": item["cv_id"], "success": True}
+        except Exception as e:
+            return {"cv_id": item["cv_id"], "success": False, "error": str(e)}
+
+    def _finish(self, job: ParseJob) -> None:
+        with self._lock:
+            self._pending -= 1
+        job.finished_at = time.time()
+        # Le résultat complet est dans le stockage: ne pas le garder en mémoire
+        job.partial = job.partial if job.error else None
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [cv_id for cv_id, job in self._jobs.items()
+                   if job.finished_at is not None and now - job.finished_at > FINISHED_JOB_TTL]
+        for cv_id in expired:
+            del self._jobs[cv_id]
+
+    def get(self, cv_id: str) -> Optional[ParseJob]:
+        with self._lock:
+            return self._jobs.get(cv_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Singleton pour le gestionnaire de tâches du processus
+_parse_job_manager = None
+_parse_job_manager_lock = threading.Lock()
+
+def get_parse_job_manager(service) -> ParseJobManager:
+    global _parse_job_manager
+    with _parse_job_manager_lock:
+        if _parse_job_manager is None:
+            _parse_job_manager = ParseJobManager(
+                service,
+                workers=int(os.environ.get("CV_PARSE_JOB_WORKERS", DEFAULT_PARSE_JOB_WORKERS)),
+                mode=os.environ.get("CV_PARSE_JOB_MODE", DEFAULT_PARSE_JOB_MODE),
+                max_pending=int(os.environ.get("CV_PARSE_JOB_MAX_PENDING", DEFAULT_MAX_PENDING_JOBS))
+            )
+    return _parse_job_manager
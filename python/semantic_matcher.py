@@ -1,41 +1,163 @@
 import os
 import re
 import numpy as np
-from typing import Dict, List, Any
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from sklearn.metrics.pairwise import cosine_similarity
 import torch
 
+from embedding_store import DEFAULT_EMBEDDING_POOLING, DEFAULT_TOKEN_BUDGET, EmbeddingStore, embedding_model_key, get_embedding_store
+from candidate_index import CandidateIndex
+from skill_matcher import SkillMatcher
+from skills_taxonomy import get_skills_taxonomy
+from model_registry import ModelRegistry, get_model_registry, KEYWORD_DISABLE
+from encoder_backends import DEFAULT_ENCODER_BACKEND, ENCODER_BACKENDS, get_encoder
+from experience_parser import experience_arrays, experience_years, score_experience
+
 # Importations conditionnelles pour gérer le mode de secours
 try:
     import spacy
-    from transformers import AutoTokenizer, AutoModel
+    import transformers
     DEPENDENCIES_INSTALLED = True
 except ImportError:
     DEPENDENCIES_INSTALLED = False
     print("Les dépendances requises ne sont pas installées. Mode de simulation activé.")
 
+# Modèle spaCy utilisé pour l'analyse des offres
+SPACY_MODEL_NAME = "fr_core_news_lg"
+
+# Modèle utilisé pour les embeddings et dimension de ses vecteurs
+EMBEDDING_MODEL_NAME = "camembert-base"
+EMBEDDING_DIM = 768
+
+# Pondération des composantes du score de correspondance
+SKILLS_WEIGHT = 0.4
+SEMANTIC_WEIGHT = 0.4
+EXPERIENCE_WEIGHT = 0.2
+
+# Découpage des documents longs (budget de tokens par document: DEFAULT_TOKEN_BUDGET) et pooling des fragments
+POOLING_STRATEGIES = ("mean", "attention")
+ATTENTION_TEMPERATURE = 0.1
+
+# Découpage en phrases (ponctuation forte ou saut de ligne)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+# Vocabulaires de la taxonomie partagée recherchés dans les CV (compétences techniques) et dans les offres:
+# des listes choisies, qui écartent les noms ambigus comme "R", "Go" ou "Chef"
+TECH_SKILL_VOCABULARY = "semantic_matcher_tech"
+JOB_SKILL_VOCABULARY = "semantic_matcher_job"
+# Domaines utilisés si la taxonomie chargée ne définit pas ces vocabulaires
+TECH_SKILL_DOMAINS = ("programming", "data_science", "cloud", "frameworks", "databases", "tools")
+JOB_SKILL_DOMAINS = TECH_SKILL_DOMAINS + ("soft_skills",)
+
+def get_tech_skill_matcher() -> SkillMatcher:
+    """
+    Extracteur des compétences techniques (compilé une fois par version de la taxonomie)
+    """
+    return get_skills_taxonomy().matcher(TECH_SKILL_DOMAINS, vocabulary=TECH_SKILL_VOCABULARY)
+
+def get_job_skill_matcher() -> SkillMatcher:
+    """
+    Extracteur des compétences recherchées dans une offre (techniques et savoir-être)
+    """
+    return get_skills_taxonomy().matcher(JOB_SKILL_DOMAINS, vocabulary=JOB_SKILL_VOCABULARY)
+
+@dataclass
+class MatchResult:
+    """
+    Résultat détaillé de la correspondance entre un CV et une offre d'emploi
+    """
+    score: float
+    skills_score: float
+    semantic_score: float
+    experience_score: float
+    job_skills: List[str]
+    job_embedding: Optional[np.ndarray]
+    candidate_years: int
+    min_years_required: int
+    max_years_required: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Sérialiser les scores au format de l'API
+        """
+        return {
+            "matchScore": float(self.score),
+            "skillsMatch": float(self.skills_score),
+            "semanticSimilarity": float(self.semantic_score),
+            "experienceMatch": float(self.experience_score)
+        }
+
 class SemanticMatcher:
-    def __init__(self):
-        self.nlp = None
-        self.tokenizer = None
-        self.model = None
-        
+    def __init__(self, embedding_store: Optional[EmbeddingStore] = None,
+                 registry: Optional[ModelRegistry] = None,
+                 encoder_backend: Optional[str] = None,
+                 pooling: Optional[str] = None):
+        self.model_name = EMBEDDING_MODEL_NAME
+        self.embedding_store = embedding_store
+        
+        # Backend d'inférence de l'encodeur (torch fp32, int8 quantifié ou onnx)
+        self.encoder_backend = encoder_backend or os.environ.get("SEMANTIC_MATCHER_ENCODER", DEFAULT_ENCODER_BACKEND)
+        if self.encoder_backend not in ENCODER_BACKENDS:
+            raise ValueError(f"Backend d'encodeur inconnu: {self.encoder_backend}")
+        
+        # Pooling des fragments d'un document long (moyenne pondérée ou attention)
+        pooling = pooling or os.environ.get("SEMANTIC_MATCHER_POOLING", DEFAULT_EMBEDDING_POOLING)
+        if pooling not in POOLING_STRATEGIES:
+            raise ValueError(f"Stratégie de pooling inconnue: {pooling}")
+        self.pooling = pooling
+        
+        # Le cache distingue les embeddings selon le backend et le pooling (clé partagée avec le parser de CV)
+        self.embedding_model_id = embedding_model_key(self.model_name, self.encoder_backend, self.pooling)
+        
+        # Les modèles sont chargés au premier usage via le registre partagé du processus
+        self.registry = registry or get_model_registry()
         if DEPENDENCIES_INSTALLED:
-            try:
-                # Charger le modèle spaCy
-                self.nlp = spacy.load("fr_core_news_lg")
-                
-                # Charger le modèle BERT pour l'extraction de features
-                self.tokenizer = AutoTokenizer.from_pretrained("camembert-base")
-                self.model = AutoModel.from_pretrained("camembert-base")
-                print("Modèles de NLP chargés avec succès.")
-            except Exception as e:
-                print(f"Erreur lors du chargement des modèles NLP: {e}")
+            # spaCy ne sert qu'à la recherche de mots-clés: parser et NER ne sont pas chargés
+            self.registry.declare_spacy(SPACY_MODEL_NAME, disable=KEYWORD_DISABLE)
+            self.registry.declare_transformer(self.model_name)
+    
+    @property
+    def nlp(self):
+        """
+        Pipeline spaCy, chargé paresseusement
+        """
+        if not DEPENDENCIES_INSTALLED:
+            return None
+        return self.registry.get_spacy(SPACY_MODEL_NAME, disable=KEYWORD_DISABLE)
+    
+    @property
+    def tokenizer(self):
+        """
+        Tokenizer BERT, chargé paresseusement
+        """
+        if not DEPENDENCIES_INSTALLED:
+            return None
+        return self.registry.get_transformer(self.model_name)[0]
+    
+    @property
+    def model(self):
+        """
+        Modèle BERT pour l'extraction de features, chargé paresseusement
+        """
+        if not DEPENDENCIES_INSTALLED:
+            return None
+        return self.registry.get_transformer(self.model_name)[1]
     
     def match_resume_to_job(self, cv_analysis: Dict[str, Any], job_description: str) -> float:
         """
         Calculer un score de correspondance entre un CV et une offre d'emploi
         """
+        return self.match(cv_analysis, job_description).score
+    
+    def match(self, cv_analysis: Dict[str, Any], job_description: str) -> MatchResult:
+        """
+        Calculer la correspondance détaillée entre un CV et une offre d'emploi
+        
+        Chaque étape (spaCy, embedding de l'offre, analyse de l'expérience) n'est exécutée
+        qu'une seule fois; le résultat conserve les scores de chaque composante ainsi que
+        les artefacts intermédiaires.
+        """
         # Extraire les compétences du CV
         cv_skills = cv_analysis.get("skills", [])
         
@@ -46,15 +168,73 @@ class SemanticMatcher:
         skills_score = self._calculate_skills_match(cv_skills, job_skills)
         
         # Calculer la similarité sémantique entre le CV et l'offre d'emploi
-        semantic_score = self._calculate_semantic_similarity(cv_analysis.get("embedding"), job_description)
-        
-        # Calculer le score d'expérience
-        experience_score = self._calculate_experience_match(cv_analysis.get("experience", []), job_description)
+        cv_embedding = cv_analysis.get("embedding")
+        job_embedding = None
+        if self._models_loaded() and cv_embedding is not None:
+            job_embedding = self.get_embeddings([job_description])
+        semantic_score = self._semantic_similarity_from_embeddings(cv_embedding, job_embedding)
+        
+        # Calculer le score d'expérience (la fiche CV de l'appelant n'est pas modifiée)
+        min_years_required, max_years_required = self._parse_experience_requirement(job_description)
+        candidate_years = experience_years(cv_analysis)
+        experience_score = self._score_experience(bool(cv_analysis.get("experience")), candidate_years,
+                                                  min_years_required, max_years_required)
         
         # Combiner les scores (avec des poids)
-        final_score = 0.4 * skills_score + 0.4 * semantic_score + 0.2 * experience_score
+        final_score = SKILLS_WEIGHT * skills_score + SEMANTIC_WEIGHT * semantic_score + EXPERIENCE_WEIGHT * experience_score
+        
+        return MatchResult(
+            score=final_score,
+            skills_score=skills_score,
+            semantic_score=semantic_score,
+            experience_score=experience_score,
+            job_skills=job_skills,
+            job_embedding=job_embedding,
+            candidate_years=candidate_years,
+            min_years_required=min_years_required,
+            max_years_required=max_years_required
+        )
+    
+    def rank_candidates(self, index: CandidateIndex, job_description: str, k: int = 10,
+                        approximate: bool = False, rerank_factor: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retrouver les k meilleurs candidats de l'index pour une offre d'emploi
+        
+        Les candidats sont présélectionnés par similarité sémantique dans l'index
+        (k * rerank_factor candidats), puis reclassés selon le score combiné.
+        L'offre n'est analysée qu'une seule fois pour tout le vivier.
+        """
+        job_embedding = self.get_embeddings([job_description])
+        job_skills = self._extract_skills_from_job(job_description)
+        min_years_required, max_years_required = self._parse_experience_requirement(job_description)
+        models_loaded = self._models_loaded()
+        
+        shortlist = index.search(job_embedding, k * rerank_factor, approximate=approximate)
+        shortlist_metadata = [index.get_metadata(candidate_id) for candidate_id, _ in shortlist]
+        
+        # Score d'expérience de toute la présélection en un seul appel vectorisé
+        # (années mises en cache dans les métadonnées de l'index, par empreinte des expériences et année)
+        years, has_experience = experience_arrays(shortlist_metadata, cache=True)
+        experience_scores = score_experience(years, has_experience, min_years_required, max_years_required)
+        
+        ranked = []
+        for (candidate_id, similarity), metadata, experience_score in zip(shortlist, shortlist_metadata,
+                                                                          experience_scores.tolist()):
+            skills_score = self._calculate_skills_match(metadata.get("skills", []), job_skills)
+            # Même normalisation que _calculate_semantic_similarity (0.75 en mode de simulation)
+            semantic_score = (similarity + 1) / 2 if models_loaded else 0.75
+            
+            ranked.append({
+                "candidateId": candidate_id,
+                "matchScore": SKILLS_WEIGHT * skills_score + SEMANTIC_WEIGHT * semantic_score + EXPERIENCE_WEIGHT * experience_score,
+                "skillsMatch": skills_score,
+                "semanticSimilarity": semantic_score,
+                "experienceMatch": experience_score
+            })
         
-        return final_score
+        ranked.sort(key=lambda candidate: candidate["matchScore"], reverse=True)
+        
+        return ranked[:k]
     
     def _extract_skills_from_job(self, job_description: str) -> List[str]:
         """
@@ -65,7 +245,32 @@ class SemanticMatcher:
             return ["python", "javascript", "react", "node.js"]
             
         # Analyser le texte avec spaCy
-        doc = self.nlp(job_description)
+        return self._extract_skills_from_job_doc(self.nlp(job_description))
+    
+    def extract_skills_from_jobs(self, job_descriptions: Iterable[str], batch_size: int = 64,
+                                 n_process: int = 1) -> Iterator[List[str]]:
+        """
+        Extraire les compétences d'un flux d'offres d'emploi
+        
+        Les offres sont traitées par lots avec nlp.pipe (éventuellement sur plusieurs
+        processus) et les résultats sont produits au fur et à mesure, dans l'ordre
+        des offres, sans charger tout le flux en mémoire.
+        """
+        nlp = self.nlp
+        if not DEPENDENCIES_INSTALLED or nlp is None:
+            # Mode de simulation
+            for job_description in job_descriptions:
+                yield self._extract_skills_from_job(job_description)
+            return
+        
+        for doc in nlp.pipe(job_descriptions, batch_size=batch_size, n_process=n_process):
+            yield self._extract_skills_from_job_doc(doc)
+    
+    def _extract_skills_from_job_doc(self, doc) -> List[str]:
+        """
+        Extraire les compétences requises d'une offre d'emploi déjà analysée par spaCy
+        """
+        job_description = doc.text
         
         # Rechercher des phrases comme "compétences requises", "vous maîtrisez", etc.
         skills_section = ""
@@ -73,40 +278,10 @@ class SemanticMatcher:
         if skills_matches:
             skills_section = skills_matches.group(0)
         
-        # Liste de compétences techniques courantes
-        tech_skills = [
-            "python", "java", "c++", "javascript", "html", "css", "sql", "php", 
-            "docker", "kubernetes", "aws", "azure", "gcp", "linux", "git", "agile", 
-            "scrum", "machine learning", "deep learning", "data analysis", "nlp", 
-            "react", "angular", "vue", "node.js", "django", "flask", "spring",
-            "tensorflow", "pytorch", "scikit-learn", "pandas", "numpy"
-        ]
-        
-        # Liste des compétences non techniques courantes
-        soft_skills = [
-            "communication", "leadership", "travail d'équipe", "résolution de problèmes",
-            "adaptabilité", "créativité", "gestion du temps", "organisation", "négociation",
-            "présentation", "autonomie", "prise de décision", "esprit critique"
-        ]
-        
-        # Rechercher les compétences dans le texte complet et la section spécifique
-        skills_found = []
-        
-        # Chercher dans la section de compétences si elle existe
+        # Rechercher les compétences dans la section spécifique si elle existe, sinon dans le texte complet
         text_to_search = skills_section if skills_section else job_description
-        text_lower = text_to_search.lower()
-        
-        # Rechercher les compétences techniques
-        for skill in tech_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                skills_found.append(skill)
-        
-        # Rechercher les compétences non techniques
-        for skill in soft_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                skills_found.append(skill)
         
-        return skills_found
+        return get_job_skill_matcher().extract(text_to_search)
     
     def _calculate_skills_match(self, cv_skills: List[str], job_skills: List[str]) -> float:
         """
@@ -115,9 +290,10 @@ class SemanticMatcher:
         if not job_skills:
             return 0.5  # Score neutre si aucune compétence n'est requise
         
-        # Normaliser les compétences
-        cv_skills_lower = [skill.lower() for skill in cv_skills]
-        job_skills_lower = [skill.lower() for skill in job_skills]
+        # Normaliser les compétences (les alias de la taxonomie sont ramenés au nom canonique)
+        taxonomy = get_skills_taxonomy()
+        cv_skills_lower = [(taxonomy.normalize(skill) or skill).lower() for skill in cv_skills]
+        job_skills_lower = [(taxonomy.normalize(skill) or skill).lower() for skill in job_skills]
         
         # Compter les compétences correspondantes
         matched_skills = set(cv_skills_lower).intersection(set(job_skills_lower))
@@ -138,17 +314,27 @@ class SemanticMatcher:
         """
         Calculer la similarité sémantique entre le CV et l'offre d'emploi
         """
-        if not DEPENDENCIES_INSTALLED or self.model is None or self.tokenizer is None:
+        if not self._models_loaded() or cv_embedding is None:
+            return self._semantic_similarity_from_embeddings(cv_embedding, None)
+        
+        # Récupérer l'embedding de la description du poste (calculé une seule fois par offre)
+        job_embedding = self.get_embeddings([job_description])
+        
+        return self._semantic_similarity_from_embeddings(cv_embedding, job_embedding)
+    
+    def _semantic_similarity_from_embeddings(self, cv_embedding: Optional[np.ndarray],
+                                             job_embedding: Optional[np.ndarray]) -> float:
+        """
+        Calculer la similarité sémantique normalisée entre deux embeddings déjà calculés
+        """
+        if not self._models_loaded():
             # Mode de simulation
             return 0.75
             
         # Si pas d'embedding disponible
-        if cv_embedding is None:
+        if cv_embedding is None or job_embedding is None:
             return 0.5
         
-        # Créer l'embedding pour la description du poste
-        job_embedding = self._create_embedding(job_description)
-        
         # Calculer la similarité cosinus entre les deux embeddings
         similarity = cosine_similarity(cv_embedding, job_embedding)[0][0]
         
@@ -161,10 +347,25 @@ class SemanticMatcher:
         """
         Évaluer la correspondance de l'expérience du candidat avec les exigences du poste
         """
-        if not experiences:
-            return 0.3  # Score faible si pas d'expérience
+        min_years_required, max_years_required = self._parse_experience_requirement(job_description)
+        total_years = self._estimate_experience_years(experiences)
         
-        # Extraire les années d'expérience demandées dans l'offre
+        return self._score_experience(bool(experiences), total_years, min_years_required, max_years_required)
+    
+    def score_experience_many(self, cv_analyses: List[Dict[str, Any]], job_description: str) -> np.ndarray:
+        """
+        Évaluer l'expérience de tout un lot de CV face à une offre, en un seul appel NumPy
+        
+        Les exigences de l'offre ne sont analysées qu'une fois; les fiches CV ne sont pas modifiées.
+        """
+        min_years_required, max_years_required = self._parse_experience_requirement(job_description)
+        years, has_experience = experience_arrays(cv_analyses)
+        return score_experience(years, has_experience, min_years_required, max_years_required)
+    
+    def _parse_experience_requirement(self, job_description: str) -> Tuple[int, float]:
+        """
+        Extraire les années d'expérience minimum et maximum demandées dans l'offre
+        """
         experience_req_match = re.search(r'(?i)(\d+)(?:\s+(?:à|-)\s+(\d+))?\s+an(?:s|née)?(?:\s+d\'expérience)?', job_description)
         min_years_required = 0
         max_years_required = float('inf')
@@ -176,66 +377,208 @@ class SemanticMatcher:
             else:
                 max_years_required = min_years_required + 3  # Estimation si pas de maximum spécifié
         
-        # Estimer les années d'expérience du candidat
-        total_years = 0
-        for exp in experiences:
-            # Essayer d'extraire les dates
-            period = exp.get("period", "")
-            years_match = re.findall(r'\b(19|20)\d{2}\b', period)
-            
-            if len(years_match) >= 2:
-                # Si on a deux années, calculer la différence
-                start_year = int(years_match[0])
-                
-                # Si le deuxième match est "présent" ou similaire, utiliser l'année courante
-                if "présent" in period.lower() or "aujourd'hui" in period.lower():
-                    from datetime import datetime
-                    end_year = datetime.now().year
-                else:
-                    end_year = int(years_match[1])
-                
-                years = end_year - start_year
-                total_years += max(0, years)  # Éviter les valeurs négatives
-            elif len(years_match) == 1:
-                # Si on a une seule année, estimer à 1 an d'expérience
-                total_years += 1
-        
-        # Calculer le score d'expérience
-        if min_years_required == 0:
-            # Si aucune exigence spécifique, plus d'expérience est mieux
-            experience_score = min(1.0, total_years / 5)  # 5 ans pour un score maximum
-        else:
-            # Si des exigences spécifiques sont présentes
-            if total_years < min_years_required:
-                # Pénalité si moins d'expérience que requis
-                experience_score = total_years / min_years_required * 0.7
-            elif total_years <= max_years_required:
-                # Score optimal si dans la plage demandée
-                experience_score = 0.8 + 0.2 * (total_years - min_years_required) / (max_years_required - min_years_required)
-            else:
-                # Légère pénalité si trop d'expérience (potentiellement surqualifié)
-                experience_score = 0.9
-        
-        return experience_score
+        return min_years_required, max_years_required
+    
+    def _estimate_experience_years(self, experiences: List[Dict[str, str]]) -> int:
+        """
+        Estimer le nombre total d'années d'expérience du candidat
+        """
+        return experience_years({"experience": experiences})
+    
+    def _score_experience(self, has_experience: bool, total_years: int,
+                          min_years_required: int, max_years_required: float) -> float:
+        """
+        Calculer le score d'expérience à partir des années du candidat et des exigences de l'offre
+        """
+        return float(score_experience(np.array([total_years]), np.array([has_experience]),
+                                      min_years_required, max_years_required)[0])
+    
+    def _models_loaded(self) -> bool:
+        return DEPENDENCIES_INSTALLED and self.model is not None and self.tokenizer is not None
     
     def _create_embedding(self, text: str) -> np.ndarray:
         """
         Créer un embedding vectoriel pour le texte
         """
-        if not DEPENDENCIES_INSTALLED or self.model is None or self.tokenizer is None:
+        return self.embed_documents([text])
+    
+    def get_embeddings(self, texts: List[str], token_budget: Optional[int] = None) -> np.ndarray:
+        """
+        Obtenir les embeddings de textes en passant par le cache persistant
+        
+        Seuls les textes absents du cache sont envoyés au modèle, en un seul appel à embed_documents.
+        Un `token_budget` propre à la requête remplace le budget par défaut.
+        """
+        if not self._models_loaded():
+            return self.embed_documents(texts, token_budget=token_budget)
+        
+        # Cache persistant des embeddings (partagé avec le service d'analyse de CV)
+        if self.embedding_store is None:
+            self.embedding_store = get_embedding_store()
+        
+        # Un budget différent produit un autre embedding: il fait partie de la clé de cache
+        model_id = embedding_model_key(self.model_name, self.encoder_backend, self.pooling, token_budget)
+        
+        return self.embedding_store.get_or_compute(
+            texts, model_id, lambda missing: self.embed_documents(missing, token_budget=token_budget)
+        )
+    
+    def embed_documents(self, texts: List[str], token_budget: Optional[int] = None,
+                        batch_size: int = 32) -> np.ndarray:
+        """
+        Créer les embeddings de documents potentiellement plus longs que la fenêtre du modèle
+        
+        Chaque document est découpé en fragments sur les limites de phrases, tous les fragments
+        de tous les documents sont encodés ensemble par embed_many, puis les fragments d'un même
+        document sont combinés selon la stratégie de pooling. Au-delà de `token_budget` tokens
+        par document, les phrases restantes sont ignorées afin de borner la latence.
+        """
+        tokenizer = self.tokenizer
+        if not self._models_loaded():
+            return self.embed_many(texts, batch_size=batch_size)
+        
+        if not texts:
+            return self.embed_many(texts, batch_size=batch_size)
+        
+        token_budget = token_budget or DEFAULT_TOKEN_BUDGET
+        
+        # Découper tous les documents, en retenant les bornes des fragments de chacun
+        chunks = []
+        chunk_tokens = []
+        boundaries = [0]
+        for text in texts:
+            for chunk, n_tokens in self._chunk_text(text, tokenizer, token_budget):
+                chunks.append(chunk)
+                chunk_tokens.append(n_tokens)
+            boundaries.append(len(chunks))
+        
+        chunk_embeddings = self.embed_many(chunks, batch_size=batch_size)
+        chunk_weights = np.maximum(np.asarray(chunk_tokens, dtype=np.float32), 1.0)
+        
+        embeddings = np.empty((len(texts), chunk_embeddings.shape[1]), dtype=np.float32)
+        for i in range(len(texts)):
+            start, end = boundaries[i], boundaries[i + 1]
+            embeddings[i] = self._pool_chunks(chunk_embeddings[start:end], chunk_weights[start:end])
+        
+        return embeddings
+    
+    def _chunk_text(self, text: str, tokenizer, token_budget: int, overlap: int = 1) -> List[Tuple[str, int]]:
+        """
+        Découper un texte en fragments de phrases tenant chacun dans la fenêtre du modèle
+        
+        Les fragments se chevauchent de `overlap` phrases (fenêtre glissante) afin de ne pas
+        couper le contexte. Retourne la liste des (fragment, nombre de tokens).
+        """
+        # Fenêtre utile du modèle, hors tokens spéciaux, bornée par le budget du document
+        max_tokens = max(1, min(min(tokenizer.model_max_length, 512) - 2, token_budget))
+        
+        sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT_RE.split(text) if sentence and sentence.strip()]
+        if not sentences:
+            return [(text, 0)]
+        
+        # Compter les tokens de toutes les phrases en un seul appel au tokenizer
+        sentence_tokens = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]]
+        
+        # Scinder les phrases trop longues pour la fenêtre en groupes de mots
+        units = []
+        for sentence, n_tokens in zip(sentences, sentence_tokens):
+            if n_tokens <= max_tokens:
+                units.append((sentence, n_tokens))
+                continue
+            words = sentence.split()
+            n_parts = -(-n_tokens // max_tokens) + 1
+            part_size = max(1, -(-len(words) // n_parts))
+            for start in range(0, len(words), part_size):
+                part = words[start:start + part_size]
+                units.append((" ".join(part), n_tokens * len(part) // len(words)))
+        
+        chunks = []
+        current = []
+        current_tokens = 0
+        used_tokens = 0
+        for unit, n_tokens in units:
+            # Le premier fragment lui-même respecte le budget (au moins une unité est conservée)
+            if used_tokens + n_tokens > token_budget and (chunks or current):
+                break
+            if current and current_tokens + n_tokens > max_tokens:
+                chunks.append((" ".join(u for u, _ in current), current_tokens))
+                # Fenêtre glissante: reprendre les dernières phrases du fragment précédent
+                current = current[-overlap:] if overlap else []
+                current_tokens = sum(t for _, t in current)
+                if current_tokens + n_tokens > max_tokens:
+                    current, current_tokens = [], 0
+            current.append((unit, n_tokens))
+            current_tokens += n_tokens
+            used_tokens += n_tokens
+        
+        if current:
+            chunks.append((" ".join(u for u, _ in current), current_tokens))
+        
+        return chunks
+    
+    def _pool_chunks(self, chunk_embeddings: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Combiner les embeddings des fragments d'un document en un seul vecteur
+        
+        - mean: moyenne pondérée par le nombre de tokens de chaque fragment
+        - attention: pondération softmax de la similarité de chaque fragment au centroïde,
+          qui privilégie les fragments représentatifs du document (et atténue les sections
+          hors sujet comme les loisirs ou les mentions légales)
+        """
+        if len(chunk_embeddings) == 1:
+            return chunk_embeddings[0]
+        
+        mean_embedding = np.average(chunk_embeddings, axis=0, weights=weights)
+        if self.pooling == "mean":
+            return mean_embedding
+        
+        norms = np.linalg.norm(chunk_embeddings, axis=1) * np.linalg.norm(mean_embedding)
+        similarities = chunk_embeddings @ mean_embedding / np.maximum(norms, 1e-12)
+        scores = similarities / ATTENTION_TEMPERATURE
+        attention = np.exp(scores - scores.max()) * weights
+        return attention @ chunk_embeddings / attention.sum()
+    
+    def embed_many(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Créer les embeddings d'une liste de textes par micro-lots
+        
+        Les textes sont triés par longueur en tokens afin que chaque micro-lot regroupe
+        des textes de taille proche, puis complétés (padding) dynamiquement jusqu'au plus
+        long texte du lot au lieu de 512 tokens. Le passage dans le modèle est délégué au
+        backend d'encodeur configuré. Les embeddings sont retournés dans l'ordre des textes
+        d'entrée, sous la forme d'une matrice (len(texts), 768); chaque texte est tronqué à
+        la fenêtre du modèle (voir embed_documents pour les documents longs).
+        """
+        tokenizer, model = self.tokenizer, self.model
+        if not DEPENDENCIES_INSTALLED or model is None or tokenizer is None:
             # Mode de simulation
-            return np.random.rand(1, 768)  # Dimension typique des embeddings BERT
-            
+            return np.random.rand(len(texts), EMBEDDING_DIM)  # Dimension typique des embeddings BERT
+        
+        if not texts:
+            return np.zeros((0, model.config.hidden_size), dtype=np.float32)
+        
         # Limiter la taille du texte pour éviter de dépasser les limites du modèle
-        max_length = self.tokenizer.model_max_length
-        text = text[:5000]  # Limiter à 5000 caractères
+        max_length = tokenizer.model_max_length
         
-        # Tokenizer et obtenir les embeddings
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=max_length, padding="max_length")
-        with torch.no_grad():
-            outputs = self.model(**inputs)
+        # Tokenizer sans padding pour connaître la longueur réelle de chaque texte
+        input_ids = tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
         
-        # Utiliser l'embedding de [CLS] comme représentation du document
-        embedding = outputs.last_hidden_state[:, 0, :].numpy()
+        # Regrouper les textes de longueur proche dans les mêmes micro-lots
+        order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+        
+        encoder = get_encoder(self.encoder_backend, model, self.model_name)
+        
+        embeddings = np.empty((len(texts), model.config.hidden_size), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            inputs = tokenizer.pad(
+                {"input_ids": [input_ids[i] for i in batch_indices]},
+                padding="longest",
+                return_tensors="pt"
+            )
+            hidden_states = encoder.encode(inputs)
+            
+            # Utiliser l'embedding de [CLS] comme représentation du document
+            embeddings[batch_indices] = hidden_states[:, 0, :]
         
-        return embedding
+        return embeddings
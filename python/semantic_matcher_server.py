@@ -1,11 +1,23 @@
 from flask import Flask, request, jsonify
 import os
 import json
-from semantic_matcher import SemanticMatcher
+from semantic_matcher import SemanticMatcher, EMBEDDING_DIM, get_tech_skill_matcher
+from candidate_index import CandidateIndex
 
 app = Flask(__name__)
 semantic_matcher = SemanticMatcher()
 
+# Index des candidats en mémoire pour la recherche des meilleurs profils d'une offre
+candidate_index = CandidateIndex(dim=EMBEDDING_DIM)
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """
+    Sonde de disponibilité: 200 lorsque les modèles NLP déclarés sont chargés, 503 sinon
+    """
+    status = semantic_matcher.registry.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
 @app.route('/match', methods=['POST'])
 def match_resume_to_job():
     """
@@ -23,31 +35,23 @@ def match_resume_to_job():
     job_description = data['job_description']
     
     try:
+        # Budget de tokens optionnel pour l'embedding des CV longs
+        token_budget = int(data['token_budget']) if data.get('token_budget') else None
+        
         # Analyser le CV (version simplifiée pour l'exemple)
         cv_analysis = {
             "skills": extract_skills(cv_text),
             "experience": extract_experience(cv_text),
-            "embedding": None  # Dans une implémentation réelle, nous créerions un embedding ici
+            "embedding": semantic_matcher.get_embeddings([cv_text], token_budget=token_budget)
         }
         
-        # Calculer le score de correspondance
-        match_score = semantic_matcher.match_resume_to_job(cv_analysis, job_description)
-        
-        # Calculer les scores détaillés
-        skills_match = semantic_matcher._calculate_skills_match(cv_analysis["skills"], 
-                                                              semantic_matcher._extract_skills_from_job(job_description))
-        semantic_similarity = semantic_matcher._calculate_semantic_similarity(cv_analysis.get("embedding"), job_description)
-        experience_match = semantic_matcher._calculate_experience_match(cv_analysis["experience"], job_description)
+        # Calculer le score de correspondance et ses composantes en un seul passage
+        match_result = semantic_matcher.match(cv_analysis, job_description)
         
         # Préparer la réponse
         response = {
             "success": True,
-            "data": {
-                "matchScore": match_score,
-                "skillsMatch": skills_match,
-                "semanticSimilarity": semantic_similarity,
-                "experienceMatch": experience_match
-            }
+            "data": match_result.to_dict()
         }
         
         return jsonify(response)
@@ -55,24 +59,105 @@ def match_resume_to_job():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
-def extract_skills(text):
+@app.route('/candidates', methods=['POST'])
+def index_candidates():
     """
-    Fonction simplifiée pour extraire les compétences d'un texte
+    Endpoint pour ajouter des candidats à l'index de recherche
+    Attend un JSON avec le champ:
+    - candidates: liste d'objets {candidate_id, cv_text}
     """
-    # Liste de compétences techniques courantes
-    tech_skills = [
-        "python", "java", "c++", "javascript", "html", "css", "sql", "php", 
-        "docker", "kubernetes", "aws", "azure", "gcp", "linux", "git", "agile", 
-        "scrum", "machine learning", "deep learning", "data analysis", "nlp", 
-        "react", "angular", "vue", "node.js", "django", "flask", "spring",
-        "tensorflow", "pytorch", "scikit-learn", "pandas", "numpy"
-    ]
+    data = request.json
+    
+    if not data or not isinstance(data.get('candidates'), list):
+        return jsonify({"success": False, "error": "La liste des candidats est requise"}), 400
     
-    # Extraire les compétences qui apparaissent dans le texte
-    text_lower = text.lower()
-    skills = [skill for skill in tech_skills if skill in text_lower]
+    try:
+        add_candidates_to_index(data['candidates'])
+        return jsonify({"success": True, "data": {"indexSize": len(candidate_index)}})
     
-    return skills
+    except (KeyError, TypeError) as e:
+        return jsonify({"success": False, "error": f"Candidat invalide: {e}"}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# Valeurs acceptées pour un paramètre booléen
+BOOLEAN_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+def parse_bool(value):
+    """
+    Booléen JSON ou chaîne true/false/1/0 (insensible à la casse); ValueError pour toute autre valeur
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (str, int)) and str(value).strip().lower() in BOOLEAN_VALUES:
+        return BOOLEAN_VALUES[str(value).strip().lower()]
+    raise ValueError(f"valeur booléenne attendue: {value!r}")
+
+@app.route('/match/top-k', methods=['POST'])
+def match_top_k():
+    """
+    Endpoint pour retrouver les K meilleurs candidats de l'index pour une offre d'emploi
+    Attend un JSON avec les champs:
+    - job_description: la description du poste
+    - k: (optionnel) le nombre de candidats à retourner, 10 par défaut
+    - candidates: (optionnel) candidats {candidate_id, cv_text} à indexer avant la recherche
+    - approximate: (optionnel) utiliser la recherche approximative (IVF): true/false, ou "true"/"false"/"1"/"0"
+    """
+    data = request.json
+    
+    if not data or 'job_description' not in data:
+        return jsonify({"success": False, "error": "La description du poste est requise"}), 400
+    
+    try:
+        approximate = parse_bool(data.get('approximate', False))
+    except ValueError as e:
+        return jsonify({"success": False, "error": f"Paramètre 'approximate' invalide: {e}"}), 400
+    
+    try:
+        if data.get('candidates'):
+            add_candidates_to_index(data['candidates'])
+        
+        ranked_candidates = semantic_matcher.rank_candidates(
+            candidate_index,
+            data['job_description'],
+            k=int(data.get('k', 10)),
+            approximate=approximate
+        )
+        
+        return jsonify({
+            "success": True,
+            "data": {
+                "candidates": ranked_candidates,
+                "indexSize": len(candidate_index)
+            }
+        })
+    
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": f"Requête invalide: {e}"}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def add_candidates_to_index(candidates):
+    """
+    Analyser et indexer des candidats, avec un seul passage par lot dans le modèle d'embedding
+    """
+    candidate_ids = [str(candidate['candidate_id']) for candidate in candidates]
+    cv_texts = [candidate['cv_text'] for candidate in candidates]
+    
+    embeddings = semantic_matcher.get_embeddings(cv_texts)
+    metadata = [
+        {"skills": extract_skills(cv_text), "experience": extract_experience(cv_text)}
+        for cv_text in cv_texts
+    ]
+    
+    candidate_index.add_many(candidate_ids, embeddings, metadata)
+
+def extract_skills(text):
+    """
+    Fonction simplifiée pour extraire les compétences d'un texte
+    """
+    # Extraire les compétences techniques qui apparaissent dans le texte
+    return get_tech_skill_matcher().extract(text)
 
 def extract_experience(text):
     """
@@ -83,5 +168,9 @@ def extract_experience(text):
     return []
 
 if __name__ == '__main__':
+    # Précharger les modèles en arrière-plan (désactivable avec MODEL_WARMUP=0)
+    if os.environ.get("MODEL_WARMUP", "1") != "0":
+        semantic_matcher.registry.warmup(background=True)
+    
     # Démarrer le serveur
     app.run(host='0.0.0.0', port=5002, debug=True)
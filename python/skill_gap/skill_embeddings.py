@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Rendre importables les modules partagés du répertoire python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Répertoire par défaut de la matrice d'embeddings des compétences (relatif au répertoire de lancement)
+DEFAULT_SKILL_EMBEDDINGS_DIR = "data/skill_embeddings"
+VECTORS_FILENAME = "skill_embeddings.npy"
+INDEX_FILENAME = "skill_index.json"
+INDEX_FORMAT_VERSION = 1
+
+# Nom de modèle enregistré quand les vecteurs sont simulés (aucune information sémantique)
+SIMULATED_MODEL = "simulated"
+SIMULATED_DIM = 768
+
+
+def simulated_embedding(skill: str, dim: int = SIMULATED_DIM) -> np.ndarray:
+    """
+    Vecteur unitaire déterministe pour une compétence, identique d'un processus à l'autre
+
+    La graine est dérivée d'un hash BLAKE2b du nom (et non de `hash()`, randomisé par
+    processus) et le tirage utilise un générateur local: l'état aléatoire global de
+    NumPy n'est jamais modifié.
+    """
+    seed = int.from_bytes(hashlib.blake2b(skill.encode('utf-8'), digest_size=8).digest(), "little")
+    vector = np.random.default_rng(seed).standard_normal(dim)
+    return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+class SkillEmbeddingIndex:
+    """
+    Matrice d'embeddings des compétences, en lecture seule, et index nom -> ligne.
+
+    La matrice est mappée en mémoire (`mmap_mode='r'`): elle est partagée entre les
+    threads et entre les processus d'un même hôte sans copie. L'index n'est jamais
+    modifié après sa construction, les recherches ne prennent donc aucun verrou.
+    """
+
+    def __init__(self, vectors: np.ndarray, rows: Dict[str, int], model: str,
+                 taxonomy_fingerprint: Optional[str] = None):
+        self.vectors = vectors
+        self.rows = rows
+        self.model = model
+        # Empreinte de la taxonomie pour laquelle la matrice a été construite (None: inconnue)
+        self.taxonomy_fingerprint = taxonomy_fingerprint
+        # Recherche insensible à la casse ("python" et "Python" désignent la même ligne)
+        self._lowered_rows = {skill.lower(): row for skill, row in rows.items()}
+
+    @classmethod
+    def load(cls, directory: str = DEFAULT_SKILL_EMBEDDINGS_DIR) -> Optional["SkillEmbeddingIndex"]:
+        """
+        Charge une matrice construite par `build_skill_embeddings`, ou None si elle n'existe pas
+        """
+        index_path = os.path.join(directory, INDEX_FILENAME)
+        vectors_path = os.path.join(directory, VECTORS_FILENAME)
+        if not (os.path.exists(index_path) and os.path.exists(vectors_path)):
+            return None
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Version d'index d'embeddings non prise en charge: {index.get('version')}")
+
+        vectors = np.load(vectors_path, mmap_mode='r')
+        if vectors.shape != (len(index["skills"]), index["dim"]):
+            raise ValueError(f"Matrice d'embeddings incohérente avec son index: {vectors.shape}")
+        return cls(vectors, index["skills"], index["model"], index.get("taxonomy_fingerprint"))
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    @property
+    def is_semantic(self) -> bool:
+        """
+        Vrai si les vecteurs proviennent d'un modèle (et non de la simulation)
+        """
+        return self.model != SIMULATED_MODEL
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, skill: str) -> bool:
+        return self.row(skill) is not None
+
+    def row(self, skill: str) -> Optional[int]:
+        row = self.rows.get(skill)
+        if row is None:
+            row = self._lowered_rows.get(skill.lower())
+        return row
+
+    def vector(self, skill: str) -> Optional[np.ndarray]:
+        row = self.row(skill)
+        return None if row is None else self.vectors[row]
+
+    def similarity(self, skill1: str, skill2: str) -> Optional[float]:
+        """
+        Similarité cosinus (produit scalaire de vecteurs unitaires), ou None si une compétence est inconnue
+        """
+        row1, row2 = self.row(skill1), self.row(skill2)
+        if row1 is None or row2 is None:
+            return None
+        return float(np.dot(self.vectors[row1], self.vectors[row2]))
+
+
+def build_skill_embeddings(skills: Iterable[str], directory: str = DEFAULT_SKILL_EMBEDDINGS_DIR,
+                           encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+                           model: str = SIMULATED_MODEL,
+                           taxonomy_fingerprint: Optional[str] = None) -> SkillEmbeddingIndex:
+    """
+    Calcule une fois les embeddings de toutes les compétences et les écrit sur disque
+
+    `encode` transforme une liste de textes en matrice (len(textes), dimension); sans
+    encodeur, les vecteurs simulés déterministes sont utilisés. Les vecteurs sont
+    normalisés (la similarité cosinus devient un produit scalaire) et les fichiers sont
+    remplacés atomiquement, un serveur en cours d'exécution gardant l'ancienne version.
+    `taxonomy_fingerprint` (empreinte de la taxonomie source) est enregistrée dans l'index
+    pour détecter une matrice construite pour une autre version de la taxonomie.
+    """
+    skills = list(dict.fromkeys(skills))
+    if encode is None:
+        vectors = np.stack([simulated_embedding(skill) for skill in skills]) if skills \
+            else np.zeros((0, SIMULATED_DIM), dtype=np.float32)
+        model = SIMULATED_MODEL
+    else:
+        vectors = np.asarray(encode(skills), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+
+    os.makedirs(directory, exist_ok=True)
+    vectors_path = os.path.join(directory, VECTORS_FILENAME)
+    index_path = os.path.join(directory, INDEX_FILENAME)
+
+    with open(vectors_path + ".tmp", 'wb') as f:
+        np.save(f, vectors)
+    with open(index_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({
+            "version": INDEX_FORMAT_VERSION,
+            "model": model,
+            "dim": int(vectors.shape[1]),
+            "taxonomy_fingerprint": taxonomy_fingerprint,
+            "skills": {skill: row for row, skill in enumerate(skills)}
+        }, f, ensure_ascii=False, indent=2)
+    os.replace(vectors_path + ".tmp", vectors_path)
+    os.replace(index_path + ".tmp", index_path)
+
+    return SkillEmbeddingIndex.load(directory)
+
+
+# Index partagé par les analyseurs du processus
+_skill_embedding_index = None
+_skill_embedding_index_loaded = False
+_skill_embedding_index_lock = threading.Lock()
+
+def get_skill_embedding_index() -> Optional[SkillEmbeddingIndex]:
+    global _skill_embedding_index, _skill_embedding_index_loaded
+    with _skill_embedding_index_lock:
+        if not _skill_embedding_index_loaded:
+            _skill_embedding_index = SkillEmbeddingIndex.load(
+                os.environ.get("SKILL_EMBEDDINGS_DIR", DEFAULT_SKILL_EMBEDDINGS_DIR)
+            )
+            _skill_embedding_index_loaded = True
+    return _skill_embedding_index
+
+
+# Point d'entrée pour la construction de la matrice en ligne de commande
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Construction de la matrice d'embeddings des compétences")
+    arg_parser.add_argument("--output", default=os.environ.get("SKILL_EMBEDDINGS_DIR", DEFAULT_SKILL_EMBEDDINGS_DIR),
+                            help="Répertoire de la matrice et de son index")
+    arg_parser.add_argument("--simulate", action="store_true",
+                            help="Vecteurs simulés déterministes, sans charger le modèle")
+    args = arg_parser.parse_args()
+
+    from skills_taxonomy import get_skills_taxonomy
+
+    # Toutes les compétences de la taxonomie partagée et tous leurs alias
+    taxonomy = get_skills_taxonomy()
+    skill_names = taxonomy.skills
+    skill_names += [alias for aliases in taxonomy.aliases.values() for alias in aliases]
+
+    encode, model_name = None, SIMULATED_MODEL
+    if not args.simulate:
+        from semantic_matcher import SemanticMatcher
+        matcher = SemanticMatcher()
+        if matcher._models_loaded():
+            encode, model_name = matcher.embed_many, matcher.embedding_model_id
+        else:
+            print("Modèle d'embeddings indisponible: vecteurs simulés", file=sys.stderr)
+
+    built = build_skill_embeddings(skill_names, args.output, encode, model_name, taxonomy.fingerprint)
+    print(f"{len(built)} compétences ({built.dim} dimensions, modèle {built.model}) écrites dans {args.output}")
@@ -1,9 +1,19 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 import re
 import json
+import heapq
+import hashlib
 import logging
-from typing import Dict, List, Tuple, Any, Optional, Union
+import itertools
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple, Any, Optional, TextIO, Union
 from datetime import datetime
 
 # Simulation des imports pour Hugging Face Transformers et Gensim
@@ -12,9 +22,81 @@ from datetime import datetime
 # import gensim.downloader as api
 # from gensim.models import Word2Vec, KeyedVectors
 
+# Rendre importables les modules partagés du répertoire python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from skills_taxonomy import SkillsTaxonomy, get_skills_taxonomy
+from skill_embeddings import get_skill_embedding_index, simulated_embedding
+from training_catalog import TrainingCatalog
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Similarités simulées entre compétences proches (symétriques, en minuscules)
+SKILL_PAIR_SIMILARITIES = {
+    ("python", "programming"): 0.85,
+    ("java", "programming"): 0.82,
+    ("javascript", "programming"): 0.80,
+    ("machine learning", "data science"): 0.90,
+    ("deep learning", "machine learning"): 0.88,
+    ("tensorflow", "deep learning"): 0.85,
+    ("pytorch", "deep learning"): 0.84,
+    ("aws", "cloud"): 0.87,
+    ("azure", "cloud"): 0.86,
+    ("docker", "devops"): 0.83,
+    ("kubernetes", "devops"): 0.82,
+    ("communication", "soft skills"): 0.88,
+    ("leadership", "management"): 0.86,
+    ("teamwork", "collaboration"): 0.90,
+    ("sql", "database"): 0.85,
+    ("nosql", "database"): 0.82,
+    ("marketing", "business"): 0.84,
+    ("sales", "business"): 0.83,
+    ("finance", "business"): 0.82,
+}
+
+# Similarité par défaut entre deux compétences non liées
+DEFAULT_SKILL_SIMILARITY = 0.3
+
+# Heures de formation disponibles par semaine et par employé (plans d'équipe)
+TRAINING_HOURS_PER_WEEK = 10
+
+# Budget de formation des plans d'équipe: bornes acceptées et unité de planification (demi-journée)
+MAX_TRAINING_TIMEFRAME_WEEKS = 104
+MAX_TRAINING_HOURS_PER_WEEK = 40
+TRAINING_HOURS_UNIT = 4
+
+# Nombre de profils de poste conservés en mémoire (les moins récemment utilisés sont évincés)
+JOB_PROFILE_CACHE_SIZE = int(os.environ.get("SKILL_GAP_JOB_PROFILE_CACHE_SIZE", 256))
+
+# Comparaison de candidats en parallèle: nombre de processus et taille des lots de CV
+COMPARISON_WORKERS = int(os.environ.get("SKILL_GAP_WORKERS", min(4, os.cpu_count() or 1)))
+COMPARISON_CHUNK_SIZE = 64
+# Lots en attente par processus (borne la mémoire quel que soit le nombre de candidats)
+COMPARISON_PENDING_PER_WORKER = 2
+
+# Nombre de candidats conservés dans le classement d'une comparaison en flux
+DEFAULT_TOP_N = 100
+
+@dataclass
+class JobProfile:
+    """
+    Analyse d'une description de poste (compétences, importances, compétences critiques),
+    calculée une seule fois puis réutilisée pour chaque candidat comparé à ce poste
+    """
+    job_hash: str
+    job_description: str
+    skills: List[str]
+    importances: Dict[str, float]
+    critical_skills: List[str]
+    # Indices des compétences dans la matrice de similarité (-1 si hors taxonomie)
+    skill_ids: np.ndarray
+    # Empreinte de la taxonomie ayant servi à calculer les indices
+    taxonomy_fingerprint: str = ""
+    
+    @staticmethod
+    def hash_description(job_description: str) -> str:
+        return hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+
 class SkillGapAnalyzer:
     """
     Classe pour analyser les écarts de compétences entre les candidats et les postes
@@ -37,47 +119,55 @@ class SkillGapAnalyzer:
         self.bert_model = None  # AutoModel.from_pretrained(self.bert_model_name)
         self.word2vec_model = None  # api.load(self.word2vec_model_name)
         
-        # Dictionnaire de compétences par domaine (simulation)
-        self.skills_taxonomy = self._load_skills_taxonomy()
+        # Embeddings précalculés des compétences (skill_embeddings.py), partagés en lecture seule
+        self.skill_embeddings = get_skill_embedding_index()
         
         # Seuils pour l'analyse
         self.similarity_threshold = 0.75
         self.critical_skill_threshold = 0.85
         
+        # Profils de poste déjà analysés, par empreinte de la description
+        self._job_profiles: "OrderedDict[str, JobProfile]" = OrderedDict()
+        self._job_profiles_lock = threading.Lock()
+        
+        # Taxonomie partagée des compétences (skills_taxonomy.py), rechargée à chaud
+        self._taxonomy_lock = threading.Lock()
+        self.taxonomy: Optional[SkillsTaxonomy] = None
+        self._apply_taxonomy(get_skills_taxonomy())
+        
         logger.info("Analyseur d'écarts de compétences initialisé avec succès.")
     
-    def _load_skills_taxonomy(self) -> Dict[str, List[str]]:
-        """
-        Charge une taxonomie de compétences par domaine.
-        Dans une implémentation réelle, cela pourrait être chargé à partir d'une base de données.
-        """
-        return {
-            "programming": [
-                "Python", "JavaScript", "Java", "C++", "C#", "Ruby", "PHP", "Swift", "Kotlin", 
-                "TypeScript", "Go", "Rust", "Scala", "R", "MATLAB", "SQL", "NoSQL", "HTML", "CSS"
-            ],
-            "data_science": [
-                "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Mining", 
-                "Statistical Analysis", "Data Visualization", "Big Data", "A/B Testing", 
-                "Predictive Modeling", "Feature Engineering", "TensorFlow", "PyTorch", "Keras", 
-                "scikit-learn", "pandas", "NumPy", "SciPy"
-            ],
-            "cloud": [
-                "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Serverless", 
-                "Microservices", "DevOps", "CI/CD", "Infrastructure as Code", "Terraform", 
-                "CloudFormation", "Ansible", "Chef", "Puppet"
-            ],
-            "soft_skills": [
-                "Communication", "Leadership", "Teamwork", "Problem Solving", "Critical Thinking", 
-                "Time Management", "Adaptability", "Creativity", "Emotional Intelligence", 
-                "Conflict Resolution", "Negotiation", "Presentation Skills", "Project Management"
-            ],
-            "business": [
-                "Marketing", "Sales", "Finance", "Accounting", "HR", "Operations", "Strategy", 
-                "Business Development", "Product Management", "Customer Success", "UX/UI Design", 
-                "Market Research", "Data Analysis", "SEO", "SEM", "Content Marketing", "CRM"
-            ]
-        }
+    def _apply_taxonomy(self, taxonomy: SkillsTaxonomy) -> None:
+        """
+        Prépare l'extracteur et la matrice de similarité pour une version de la taxonomie.
+        """
+        # Dictionnaire de compétences par domaine
+        self.skills_taxonomy = taxonomy.as_domain_dict()
+        
+        # Extracteur compilé une seule fois pour toute la taxonomie
+        self.skill_matcher = taxonomy.matcher()
+        
+        # Matrice dense des similarités entre toutes les compétences de la taxonomie
+        self.skill_names, self.skill_index, self.similarity_matrix = self._build_similarity_matrix(taxonomy.fingerprint)
+        
+        # Ressources de formation et temps d'apprentissage précalculés pour chaque compétence
+        self.training_catalog = TrainingCatalog(taxonomy.skills)
+        
+        # Les profils de poste calculés avec l'ancienne taxonomie ne sont plus valides
+        with self._job_profiles_lock:
+            self._job_profiles.clear()
+        self.taxonomy = taxonomy
+    
+    def _refresh_taxonomy(self) -> None:
+        """
+        Adopte la nouvelle version de la taxonomie si son fichier a été modifié.
+        """
+        taxonomy = get_skills_taxonomy()
+        if taxonomy is not self.taxonomy:
+            with self._taxonomy_lock:
+                if taxonomy is not self.taxonomy:
+                    logger.info(f"Nouvelle taxonomie des compétences: version {taxonomy.version}")
+                    self._apply_taxonomy(taxonomy)
     
     def _extract_skills_from_text(self, text: str) -> List[str]:
         """
@@ -87,30 +177,11 @@ class SkillGapAnalyzer:
         Dans une implémentation réelle, nous utiliserions BERT pour l'extraction d'entités
         et l'analyse sémantique.
         """
-        # Simulation de l'extraction de compétences
-        # Normalisation du texte
-        text = text.lower()
-        
-        # Liste pour stocker les compétences extraites
-        extracted_skills = []
-        
-        # Parcourir la taxonomie des compétences et rechercher des correspondances
-        for domain, skills in self.skills_taxonomy.items():
-            for skill in skills:
-                # Recherche simple de correspondance (dans une implémentation réelle, 
-                # nous utiliserions des techniques plus sophistiquées)
-                if skill.lower() in text:
-                    extracted_skills.append(skill)
-        
-        # Simuler l'ajout de quelques compétences supplémentaires basées sur l'analyse sémantique
-        if "data analysis" in text or "analytics" in text:
-            if "Data Analysis" not in extracted_skills:
-                extracted_skills.append("Data Analysis")
-        
-        if "machine learning" in text or "ml" in text or "ai" in text:
-            if "Machine Learning" not in extracted_skills:
-                extracted_skills.append("Machine Learning")
+        # Rechercher toutes les compétences de la taxonomie (et leurs alias) en un seul passage
+        extracted_skills = self.skill_matcher.extract(text)
         
+        # Simuler l'ajout de compétences supplémentaires basées sur l'analyse sémantique
+        text = text.lower()
         if "team" in text and "lead" in text:
             if "Leadership" not in extracted_skills:
                 extracted_skills.append("Leadership")
@@ -119,71 +190,109 @@ class SkillGapAnalyzer:
     
     def _calculate_skill_similarity(self, skill1: str, skill2: str) -> float:
         """
-        Calcule la similarité sémantique entre deux compétences en utilisant Word2Vec.
+        Calcule la similarité sémantique entre deux compétences.
         
-        Dans une implémentation réelle, nous utiliserions les embeddings de Gensim.
+        Utilise le produit scalaire des embeddings précalculés lorsqu'ils proviennent
+        d'un modèle, et une table de similarités simulées sinon.
         """
-        # Simulation de la similarité sémantique
         # Correspondance exacte
         if skill1.lower() == skill2.lower():
             return 1.0
         
-        # Correspondances partielles simulées
-        skill_pairs = {
-            ("python", "programming"): 0.85,
-            ("java", "programming"): 0.82,
-            ("javascript", "programming"): 0.80,
-            ("machine learning", "data science"): 0.90,
-            ("deep learning", "machine learning"): 0.88,
-            ("tensorflow", "deep learning"): 0.85,
-            ("pytorch", "deep learning"): 0.84,
-            ("aws", "cloud"): 0.87,
-            ("azure", "cloud"): 0.86,
-            ("docker", "devops"): 0.83,
-            ("kubernetes", "devops"): 0.82,
-            ("communication", "soft skills"): 0.88,
-            ("leadership", "management"): 0.86,
-            ("teamwork", "collaboration"): 0.90,
-            ("sql", "database"): 0.85,
-            ("nosql", "database"): 0.82,
-            ("marketing", "business"): 0.84,
-            ("sales", "business"): 0.83,
-            ("finance", "business"): 0.82,
-        }
+        # Produit scalaire des embeddings précalculés, s'ils proviennent d'un modèle
+        if self.skill_embeddings is not None and self.skill_embeddings.is_semantic:
+            similarity = self.skill_embeddings.similarity(skill1, skill2)
+            if similarity is not None:
+                return max(similarity, 0.0)
         
+        # Simulation de la similarité sémantique
         # Vérifier si la paire existe dans notre dictionnaire simulé
         pair = (skill1.lower(), skill2.lower())
-        if pair in skill_pairs:
-            return skill_pairs[pair]
+        if pair in SKILL_PAIR_SIMILARITIES:
+            return SKILL_PAIR_SIMILARITIES[pair]
         
         # Inverser la paire et vérifier à nouveau
         pair_reversed = (skill2.lower(), skill1.lower())
-        if pair_reversed in skill_pairs:
-            return skill_pairs[pair_reversed]
+        if pair_reversed in SKILL_PAIR_SIMILARITIES:
+            return SKILL_PAIR_SIMILARITIES[pair_reversed]
         
         # Valeur par défaut pour les compétences non liées
-        return 0.3
+        return DEFAULT_SKILL_SIMILARITY
     
-    def _get_skill_embedding(self, skill: str) -> np.ndarray:
+    def _build_similarity_matrix(self, taxonomy_fingerprint: Optional[str] = None
+                                 ) -> Tuple[List[str], Dict[str, int], np.ndarray]:
         """
-        Obtient l'embedding d'une compétence en utilisant BERT.
+        Précalcule la similarité entre toutes les compétences de la taxonomie.
+        
+        Chaque compétence reçoit un identifiant entier (sa ligne dans la matrice): la
+        correspondance entre un candidat et un poste se réduit ensuite à l'extraction
+        d'une sous-matrice et à des argmax NumPy. Les paires de compétences présentes dans
+        les embeddings précalculés utilisent leur similarité cosinus; seules les lignes et
+        colonnes des compétences absentes (ajoutées à la taxonomie depuis la construction
+        des embeddings) utilisent la table de similarités simulées.
+        """
+        skill_names = list(dict.fromkeys(skill for skills in self.skills_taxonomy.values() for skill in skills))
+        skill_index = {skill: i for i, skill in enumerate(skill_names)}
+        lowered_index = {skill.lower(): i for i, skill in enumerate(skill_names)}
+        
+        matrix = np.full((len(skill_names), len(skill_names)), DEFAULT_SKILL_SIMILARITY)
+        for (skill1, skill2), similarity in SKILL_PAIR_SIMILARITIES.items():
+            if skill1 in lowered_index and skill2 in lowered_index:
+                matrix[lowered_index[skill1], lowered_index[skill2]] = similarity
+                matrix[lowered_index[skill2], lowered_index[skill1]] = similarity
+        
+        embeddings = self.skill_embeddings
+        if embeddings is not None and embeddings.is_semantic:
+            if taxonomy_fingerprint and embeddings.taxonomy_fingerprint != taxonomy_fingerprint:
+                logger.warning(f"Embeddings des compétences construits pour une autre taxonomie "
+                               f"({embeddings.taxonomy_fingerprint} au lieu de {taxonomy_fingerprint}): "
+                               f"relancer skill_embeddings.py")
+            
+            rows = [embeddings.row(skill) for skill in skill_names]
+            known = np.fromiter((row is not None for row in rows), dtype=bool, count=len(rows))
+            if not known.all():
+                logger.warning(f"{int((~known).sum())} compétences sans embedding précalculé: "
+                               f"similarités simulées pour ces compétences")
+            
+            # Similarité cosinus (produit scalaire des embeddings unitaires) entre compétences connues
+            known_ids = np.flatnonzero(known)
+            vectors = np.asarray(embeddings.vectors[[rows[i] for i in known_ids]], dtype=np.float64)
+            matrix[np.ix_(known_ids, known_ids)] = np.clip(vectors @ vectors.T, 0.0, 1.0)
+        np.fill_diagonal(matrix, 1.0)
+        matrix.setflags(write=False)
+        
+        return skill_names, skill_index, matrix
+    
+    def _skill_ids(self, skills: List[str]) -> np.ndarray:
+        return np.fromiter((self.skill_index.get(skill, -1) for skill in skills), dtype=np.intp, count=len(skills))
+    
+    def _similarity_submatrix(self, job_skills: List[str], job_ids: np.ndarray,
+                              candidate_skills: List[str], candidate_ids: np.ndarray) -> np.ndarray:
+        """
+        Similarités (compétences du poste x compétences du candidat)
+        """
+        if (job_ids >= 0).all() and (candidate_ids >= 0).all():
+            return self.similarity_matrix[np.ix_(job_ids, candidate_ids)]
         
-        Dans une implémentation réelle, nous utiliserions le modèle BERT pour générer
-        des embeddings contextuels.
+        # Compétence hors taxonomie: calcul paire par paire
+        return np.array([[self._calculate_skill_similarity(job_skill, candidate_skill)
+                          for candidate_skill in candidate_skills]
+                         for job_skill in job_skills]).reshape(len(job_skills), len(candidate_skills))
+    
+    def _get_skill_embedding(self, skill: str) -> np.ndarray:
         """
-        # Simulation d'un embedding (vecteur aléatoire de dimension 768, typique pour BERT)
-        # Dans une implémentation réelle, nous utiliserions:
-        # inputs = self.bert_tokenizer(skill, return_tensors="pt")
-        # outputs = self.bert_model(**inputs)
-        # embedding = outputs.last_hidden_state.mean(dim=1).detach().numpy()
+        Obtient l'embedding d'une compétence.
         
-        # Générer un vecteur aléatoire mais déterministe basé sur la chaîne
-        np.random.seed(hash(skill) % 2**32)
-        embedding = np.random.randn(768)
-        # Normaliser l'embedding
-        embedding = embedding / np.linalg.norm(embedding)
+        Les compétences de la taxonomie et leurs alias sont lus dans la matrice précalculée
+        (voir skill_embeddings.py); une compétence inconnue reçoit un vecteur simulé
+        déterministe, sans toucher à l'état aléatoire global de NumPy.
+        """
+        if self.skill_embeddings is not None:
+            embedding = self.skill_embeddings.vector(skill)
+            if embedding is not None:
+                return embedding
         
-        return embedding
+        return simulated_embedding(skill)
     
     def _calculate_skill_importance(self, skill: str, job_description: str) -> float:
         """
@@ -221,9 +330,58 @@ class SkillGapAnalyzer:
         # Si la compétence n'est pas mentionnée explicitement, utiliser une valeur par défaut
         return 0.3
     
+    def get_job_profile(self, job_description: Union[str, JobProfile]) -> JobProfile:
+        """
+        Retourne le profil d'un poste, en le calculant seulement à la première demande.
+        
+        Les profils sont mis en cache par empreinte SHA-256 de la description: comparer
+        500 candidats à une même offre ne coûte qu'une seule analyse du poste.
+        """
+        self._refresh_taxonomy()
+        
+        if isinstance(job_description, JobProfile):
+            if job_description.taxonomy_fingerprint == self.taxonomy.fingerprint:
+                return job_description
+            # Profil calculé avec une autre version de la taxonomie: le recalculer
+            job_description = job_description.job_description
+        
+        job_hash = JobProfile.hash_description(job_description)
+        with self._job_profiles_lock:
+            profile = self._job_profiles.get(job_hash)
+            if profile is not None:
+                self._job_profiles.move_to_end(job_hash)
+                return profile
+        
+        # Extraire les compétences du poste et calculer leur importance
+        job_skills = self._extract_skills_from_text(job_description)
+        job_skills_importance = {skill: self._calculate_skill_importance(skill, job_description) 
+                                for skill in job_skills}
+        
+        # Identifier les compétences critiques (haute importance)
+        critical_skills = [skill for skill, importance in job_skills_importance.items() 
+                          if importance >= self.critical_skill_threshold]
+        
+        profile = JobProfile(
+            job_hash=job_hash,
+            job_description=job_description,
+            skills=job_skills,
+            importances=job_skills_importance,
+            critical_skills=critical_skills,
+            skill_ids=self._skill_ids(job_skills),
+            taxonomy_fingerprint=self.taxonomy.fingerprint
+        )
+        
+        with self._job_profiles_lock:
+            self._job_profiles[job_hash] = profile
+            self._job_profiles.move_to_end(job_hash)
+            while len(self._job_profiles) > JOB_PROFILE_CACHE_SIZE:
+                self._job_profiles.popitem(last=False)
+        
+        return profile
+    
     def analyze_skill_gap(self, 
                           candidate_resume: str, 
-                          job_description: str, 
+                          job_description: Union[str, JobProfile], 
                           candidate_id: Optional[str] = None,
                           job_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -231,7 +389,7 @@ class SkillGapAnalyzer:
         
         Args:
             candidate_resume: Le CV du candidat sous forme de texte
-            job_description: La description du poste sous forme de texte
+            job_description: La description du poste sous forme de texte, ou son profil (`get_job_profile`)
             candidate_id: Identifiant optionnel du candidat
             job_id: Identifiant optionnel du poste
             
@@ -240,43 +398,42 @@ class SkillGapAnalyzer:
         """
         logger.info(f"Analyse des écarts de compétences pour candidat {candidate_id} et poste {job_id}")
         
-        # Extraire les compétences du CV et de la description du poste
+        # Compétences du poste issues de son profil (qui adopte au besoin la nouvelle taxonomie), puis celles du CV
+        job_profile = self.get_job_profile(job_description)
         candidate_skills = self._extract_skills_from_text(candidate_resume)
-        job_skills = self._extract_skills_from_text(job_description)
+        job_skills = job_profile.skills
+        job_skills_importance = job_profile.importances
+        critical_skills = job_profile.critical_skills
         
         logger.info(f"Compétences du candidat: {candidate_skills}")
         logger.info(f"Compétences requises pour le poste: {job_skills}")
         
-        # Calculer l'importance de chaque compétence pour le poste
-        job_skills_importance = {skill: self._calculate_skill_importance(skill, job_description) 
-                                for skill in job_skills}
-        
-        # Identifier les compétences critiques (haute importance)
-        critical_skills = [skill for skill, importance in job_skills_importance.items() 
-                          if importance >= self.critical_skill_threshold]
-        
         # Analyser les correspondances et les écarts
         matched_skills = []
         missing_skills = []
         additional_skills = []
         
+        # Similarités de toutes les paires (compétence du poste, compétence du candidat)
+        similarities = self._similarity_submatrix(job_skills, job_profile.skill_ids,
+                                                  candidate_skills, self._skill_ids(candidate_skills))
+        
+        # Meilleure compétence du candidat pour chaque compétence du poste (argmax par ligne)
+        if candidate_skills:
+            best_candidate = similarities.argmax(axis=1)
+            best_candidate_similarity = similarities[np.arange(len(job_skills)), best_candidate]
+        else:
+            best_candidate = np.zeros(len(job_skills), dtype=np.intp)
+            best_candidate_similarity = np.zeros(len(job_skills))
+        is_matched = best_candidate_similarity >= self.similarity_threshold
+        
         # Vérifier les compétences du poste par rapport aux compétences du candidat
-        for job_skill in job_skills:
-            best_match = None
-            best_similarity = 0
-            
-            for candidate_skill in candidate_skills:
-                similarity = self._calculate_skill_similarity(job_skill, candidate_skill)
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_match = candidate_skill
-            
+        for i, job_skill in enumerate(job_skills):
             # Si une correspondance suffisamment forte est trouvée
-            if best_similarity >= self.similarity_threshold:
+            if is_matched[i]:
                 matched_skills.append({
                     "job_skill": job_skill,
-                    "candidate_skill": best_match,
-                    "similarity": best_similarity,
+                    "candidate_skill": candidate_skills[best_candidate[i]],
+                    "similarity": float(best_candidate_similarity[i]),
                     "importance": job_skills_importance[job_skill]
                 })
             else:
@@ -287,26 +444,27 @@ class SkillGapAnalyzer:
                     "is_critical": job_skill in critical_skills
                 })
         
+        # Compétences du candidat déjà associées à une compétence du poste
+        is_used = np.zeros(len(candidate_skills), dtype=bool)
+        is_used[best_candidate[is_matched]] = True
+        
+        # Meilleure compétence du poste pour chaque compétence du candidat (argmax par colonne)
+        if job_skills:
+            best_job = similarities.argmax(axis=0)
+            best_job_similarity = similarities[best_job, np.arange(len(candidate_skills))]
+        
         # Identifier les compétences supplémentaires du candidat
-        for candidate_skill in candidate_skills:
-            # Vérifier si cette compétence a déjà été associée à une compétence du poste
-            if not any(match["candidate_skill"] == candidate_skill for match in matched_skills):
-                # Trouver la meilleure correspondance potentielle parmi les compétences du poste
-                best_match = None
-                best_similarity = 0
-                
-                for job_skill in job_skills:
-                    similarity = self._calculate_skill_similarity(candidate_skill, job_skill)
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = job_skill
-                
-                additional_skills.append({
-                    "skill": candidate_skill,
-                    "best_related_job_skill": best_match,
-                    "similarity": best_similarity,
-                    "relevance": best_similarity * (job_skills_importance.get(best_match, 0.3) if best_match else 0.3)
-                })
+        for j in np.flatnonzero(~is_used):
+            candidate_skill = candidate_skills[j]
+            best_match = job_skills[best_job[j]] if job_skills else None
+            best_similarity = float(best_job_similarity[j]) if job_skills else 0
+            
+            additional_skills.append({
+                "skill": candidate_skill,
+                "best_related_job_skill": best_match,
+                "similarity": best_similarity,
+                "relevance": best_similarity * (job_skills_importance.get(best_match, 0.3) if best_match else 0.3)
+            })
         
         # Calculer le score global de correspondance des compétences
         if len(job_skills) > 0:
@@ -345,7 +503,7 @@ class SkillGapAnalyzer:
             "matched_skills": sorted(matched_skills, key=lambda x: x["importance"], reverse=True),
             "missing_skills": sorted(missing_skills, key=lambda x: x["importance"], reverse=True),
             "additional_skills": sorted(additional_skills, key=lambda x: x["relevance"], reverse=True),
-            "critical_skills": critical_skills,
+            "critical_skills": list(critical_skills),
             "training_recommendations": training_recommendations,
             "skill_gap_by_domain": self._calculate_skill_gap_by_domain(matched_skills, missing_skills, job_skills)
         }
@@ -372,20 +530,17 @@ class SkillGapAnalyzer:
                 "gap_score": 0.0
             }
         
-        # Compter les compétences requises par domaine
+        # Compter les compétences requises par domaine (index inversé compétence -> domaine)
         for skill in job_skills:
-            for domain, skills in self.skills_taxonomy.items():
-                if skill in skills:
-                    domains[domain]["required"] += 1
-                    break
+            domain = self.taxonomy.domain_of(skill)
+            if domain in domains:
+                domains[domain]["required"] += 1
         
         # Compter les compétences correspondantes par domaine
         for match in matched_skills:
-            job_skill = match["job_skill"]
-            for domain, skills in self.skills_taxonomy.items():
-                if job_skill in skills:
-                    domains[domain]["matched"] += 1
-                    break
+            domain = self.taxonomy.domain_of(match["job_skill"])
+            if domain in domains:
+                domains[domain]["matched"] += 1
         
         # Calculer les scores par domaine
         for domain, counts in domains.items():
@@ -404,65 +559,14 @@ class SkillGapAnalyzer:
         """
         recommendations = []
         
-        # Simuler des recommandations de formation pour les compétences manquantes
-        training_resources = {
-            "Python": {
-                "courses": ["Python for Data Science and Machine Learning Bootcamp", "Complete Python Bootcamp"],
-                "platforms": ["Coursera", "Udemy", "DataCamp"],
-                "estimated_time": "4-8 weeks"
-            },
-            "JavaScript": {
-                "courses": ["Modern JavaScript From The Beginning", "JavaScript: Understanding the Weird Parts"],
-                "platforms": ["Udemy", "Frontend Masters", "freeCodeCamp"],
-                "estimated_time": "6-10 weeks"
-            },
-            "Machine Learning": {
-                "courses": ["Machine Learning by Andrew Ng", "Machine Learning A-Z"],
-                "platforms": ["Coursera", "Udemy", "edX"],
-                "estimated_time": "10-16 weeks"
-            },
-            "AWS": {
-                "courses": ["AWS Certified Solutions Architect", "AWS Certified Developer"],
-                "platforms": ["A Cloud Guru", "AWS Training", "Pluralsight"],
-                "estimated_time": "8-12 weeks"
-            },
-            "Leadership": {
-                "courses": ["Leadership Development Program", "People Management Skills"],
-                "platforms": ["LinkedIn Learning", "Coursera", "edX"],
-                "estimated_time": "4-8 weeks"
-            },
-            "Data Analysis": {
-                "courses": ["Data Analysis with Python", "SQL for Data Analysis"],
-                "platforms": ["Coursera", "DataCamp", "Udacity"],
-                "estimated_time": "6-10 weeks"
-            }
-        }
-        
-        # Générer des recommandations pour chaque compétence manquante
+        # Ressources précalculées par le catalogue: une simple lecture par compétence manquante
         for skill_info in missing_skills:
-            skill = skill_info["skill"]
-            
-            # Vérifier si nous avons des recommandations spécifiques pour cette compétence
-            if skill in training_resources:
-                recommendation = {
-                    "skill": skill,
-                    "importance": skill_info["importance"],
-                    "is_critical": skill_info["is_critical"],
-                    "resources": training_resources[skill]
-                }
-            else:
-                # Recommandation générique
-                recommendation = {
-                    "skill": skill,
-                    "importance": skill_info["importance"],
-                    "is_critical": skill_info["is_critical"],
-                    "resources": {
-                        "suggestion": f"Rechercher des cours sur {skill} sur des plateformes comme Coursera, Udemy, ou LinkedIn Learning",
-                        "estimated_time": "4-12 weeks"
-                    }
-                }
-            
-            recommendations.append(recommendation)
+            recommendations.append({
+                "skill": skill_info["skill"],
+                "importance": skill_info["importance"],
+                "is_critical": skill_info["is_critical"],
+                "resources": self.training_catalog.recommendation_resources(skill_info["skill"])
+            })
         
         # Trier les recommandations par importance et criticité
         return sorted(recommendations, 
@@ -471,60 +575,39 @@ class SkillGapAnalyzer:
     
     def compare_candidates_for_job(self, 
                                   candidate_resumes: Dict[str, str], 
-                                  job_description: str) -> Dict[str, Any]:
+                                  job_description: Union[str, JobProfile],
+                                  workers: int = 1) -> Dict[str, Any]:
         """
         Compare plusieurs candidats pour un poste donné en fonction de leurs écarts de compétences.
         
         Args:
             candidate_resumes: Dictionnaire avec les IDs des candidats comme clés et leurs CV comme valeurs
-            job_description: La description du poste
+            job_description: La description du poste, ou son profil
+            workers: Nombre de processus d'analyse (1: analyse dans le processus courant)
             
         Returns:
             Un dictionnaire contenant l'analyse comparative des candidats
         """
         logger.info(f"Comparaison de {len(candidate_resumes)} candidats pour un poste")
         
-        # Analyser chaque candidat
-        candidate_analyses = {}
-        for candidate_id, resume in candidate_resumes.items():
-            candidate_analyses[candidate_id] = self.analyze_skill_gap(
-                candidate_resume=resume,
-                job_description=job_description,
-                candidate_id=candidate_id
-            )
+        # Le poste n'est analysé qu'une fois pour tous les candidats
+        job_profile = self.get_job_profile(job_description)
+        
+        # Analyser chaque candidat, puis rétablir l'ordre d'entrée (les lots terminent dans le désordre)
+        analyses = dict(self.iter_candidate_analyses(candidate_resumes.items(), job_profile, workers=workers))
+        candidate_analyses = {candidate_id: analyses[candidate_id] for candidate_id in candidate_resumes}
         
         # Trier les candidats par score de correspondance
         ranked_candidates = sorted(
-            [
-                {
-                    "candidate_id": candidate_id,
-                    "match_score": analysis["overall_match_score"],
-                    "skill_gap_score": analysis["skill_gap_score"],
-                    "missing_critical_skills_count": analysis["missing_critical_skills_count"],
-                    "missing_skills_count": analysis["missing_skills_count"],
-                    "additional_skills_count": analysis["additional_skills_count"]
-                }
-                for candidate_id, analysis in candidate_analyses.items()
-            ],
-            key=lambda x: (x["match_score"], -x["missing_critical_skills_count"]),
+            [_ranking_entry(candidate_id, analysis) for candidate_id, analysis in candidate_analyses.items()],
+            key=_ranking_key,
             reverse=True
         )
         
-        # Extraire les compétences du poste
-        job_skills = self._extract_skills_from_text(job_description)
-        
-        # Calculer l'importance de chaque compétence pour le poste
-        job_skills_importance = {skill: self._calculate_skill_importance(skill, job_description) 
-                                for skill in job_skills}
-        
-        # Identifier les compétences critiques
-        critical_skills = [skill for skill, importance in job_skills_importance.items() 
-                          if importance >= self.critical_skill_threshold]
-        
         # Préparer le résultat
         result = {
-            "job_skills": job_skills,
-            "critical_skills": critical_skills,
+            "job_skills": list(job_profile.skills),
+            "critical_skills": list(job_profile.critical_skills),
             "candidate_count": len(candidate_resumes),
             "ranked_candidates": ranked_candidates,
             "detailed_analyses": candidate_analyses,
@@ -535,9 +618,116 @@ class SkillGapAnalyzer:
         
         return result
     
+    def iter_candidate_analyses(self,
+                                candidate_resumes: Iterable[Tuple[str, str]],
+                                job_description: Union[str, JobProfile],
+                                workers: int = 1,
+                                chunk_size: int = COMPARISON_CHUNK_SIZE) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Analyse un flux de candidats (identifiant, CV) et retourne les analyses au fil de l'eau.
+        
+        Avec `workers` > 1, les candidats sont répartis par lots de `chunk_size` dans un pool
+        de processus; les analyses sont alors produites dans l'ordre de fin de traitement.
+        Au plus `workers * COMPARISON_PENDING_PER_WORKER` lots sont en attente: le flux
+        d'entrée est consommé au rythme de l'analyse.
+        """
+        for _, candidate_id, analysis in self._iter_positioned_analyses(candidate_resumes, job_description,
+                                                                         workers, chunk_size):
+            yield candidate_id, analysis
+    
+    def _iter_positioned_analyses(self,
+                                  candidate_resumes: Iterable[Tuple[str, str]],
+                                  job_description: Union[str, JobProfile],
+                                  workers: int = 1,
+                                  chunk_size: int = COMPARISON_CHUNK_SIZE) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Comme `iter_candidate_analyses`, avec la position de chaque candidat dans le flux d'entrée
+        """
+        job_profile = self.get_job_profile(job_description)
+        
+        if workers <= 1:
+            for position, (candidate_id, resume) in enumerate(candidate_resumes):
+                yield position, candidate_id, self.analyze_skill_gap(resume, job_profile, candidate_id=candidate_id)
+            return
+        
+        max_pending = workers * COMPARISON_PENDING_PER_WORKER
+        # "spawn": ne pas dupliquer l'état (threads du serveur) du processus parent dans les workers
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            # Position du premier candidat de chaque lot en attente
+            pending = {}
+            
+            def completed():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start = pending.pop(future)
+                    for offset, (candidate_id, analysis) in enumerate(future.result()):
+                        yield start + offset, candidate_id, analysis
+            
+            for index, chunk in enumerate(_chunked(candidate_resumes, chunk_size)):
+                pending[executor.submit(_analyze_candidate_chunk, job_profile, chunk)] = index * chunk_size
+                if len(pending) >= max_pending:
+                    yield from completed()
+            
+            while pending:
+                yield from completed()
+    
+    def compare_candidates_stream(self,
+                                  candidate_resumes: Iterable[Tuple[str, str]],
+                                  job_description: Union[str, JobProfile],
+                                  top_n: int = DEFAULT_TOP_N,
+                                  workers: int = 1,
+                                  chunk_size: int = COMPARISON_CHUNK_SIZE,
+                                  sink: Optional[TextIO] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Compare un grand nombre de candidats en flux, avec une mémoire bornée.
+        
+        Seuls les `top_n` meilleurs candidats sont conservés (tas borné); l'analyse détaillée
+        de chaque candidat est écrite dans `sink` en NDJSON (une ligne par candidat) puis
+        libérée. Un événement "progress" portant le classement courant est produit tous les
+        `chunk_size` candidats, puis un événement "done" avec le classement final.
+        """
+        job_profile = self.get_job_profile(job_description)
+        
+        # Tas minimal: la racine est le moins bon des candidats retenus
+        top_heap: List[Tuple[Tuple[float, int], int, Dict[str, Any]]] = []
+        processed = 0
+        
+        for position, candidate_id, analysis in self._iter_positioned_analyses(candidate_resumes, job_profile,
+                                                                               workers, chunk_size):
+            entry = _ranking_entry(candidate_id, analysis)
+            # À score égal, le premier candidat reçu est classé devant, quel que soit l'ordre de fin des lots
+            heap_item = (_ranking_key(entry), -position, entry)
+            if len(top_heap) < top_n:
+                heapq.heappush(top_heap, heap_item)
+            elif top_n > 0:
+                heapq.heappushpop(top_heap, heap_item)
+            
+            if sink is not None:
+                sink.write(json.dumps(analysis, ensure_ascii=False) + "\n")
+            
+            processed += 1
+            if processed % chunk_size == 0:
+                yield {"event": "progress", "processed": processed, "ranked_candidates": _sorted_top(top_heap)}
+        
+        if sink is not None:
+            sink.flush()
+        
+        ranked_candidates = _sorted_top(top_heap)
+        logger.info(f"Comparaison en flux terminée: {processed} candidats. Meilleur candidat: {ranked_candidates[0]['candidate_id'] if ranked_candidates else 'Aucun'}")
+        
+        yield {
+            "event": "done",
+            "job_skills": list(job_profile.skills),
+            "critical_skills": list(job_profile.critical_skills),
+            "candidate_count": processed,
+            "ranked_candidates": ranked_candidates,
+            "timestamp": datetime.now().isoformat()
+        }
+    
     def generate_skill_development_plan(self, 
                                        candidate_resume: str, 
-                                       job_description: str,
+                                       job_description: Union[str, JobProfile],
                                        timeframe_weeks: int = 12) -> Dict[str, Any]:
         """
         Génère un plan de développement des compétences pour un candidat afin de combler
@@ -545,7 +735,7 @@ class SkillGapAnalyzer:
         
         Args:
             candidate_resume: Le CV du candidat
-            job_description: La description du poste
+            job_description: La description du poste, ou son profil
             timeframe_weeks: Le nombre de semaines disponibles pour le développement
             
         Returns:
@@ -559,82 +749,6 @@ class SkillGapAnalyzer:
         # Extraire les compétences manquantes
         missing_skills = gap_analysis["missing_skills"]
         
-        # Estimer le temps nécessaire pour acquérir chaque compétence (en semaines)
-        skill_learning_times = {
-            # Programmation
-            "Python": 6,
-            "JavaScript": 8,
-            "Java": 10,
-            "C++": 12,
-            "C#": 8,
-            "Ruby": 6,
-            "PHP": 6,
-            "Swift": 8,
-            "Kotlin": 8,
-            "TypeScript": 4,
-            "Go": 6,
-            "Rust": 10,
-            "Scala": 8,
-            "R": 6,
-            "SQL": 4,
-            "NoSQL": 4,
-            "HTML": 2,
-            "CSS": 4,
-            
-            # Data Science
-            "Machine Learning": 12,
-            "Deep Learning": 10,
-            "NLP": 8,
-            "Computer Vision": 10,
-            "Data Mining": 8,
-            "Statistical Analysis": 6,
-            "Data Visualization": 4,
-            "Big Data": 8,
-            "TensorFlow": 6,
-            "PyTorch": 6,
-            "Keras": 4,
-            "scikit-learn": 4,
-            "pandas": 3,
-            "NumPy": 3,
-            
-            # Cloud
-            "AWS": 8,
-            "Azure": 8,
-            "Google Cloud": 8,
-            "Docker": 4,
-            "Kubernetes": 6,
-            "Serverless": 4,
-            "Microservices": 6,
-            "DevOps": 10,
-            "CI/CD": 6,
-            
-            # Soft Skills
-            "Communication": 6,
-            "Leadership": 10,
-            "Teamwork": 4,
-            "Problem Solving": 8,
-            "Critical Thinking": 8,
-            "Time Management": 4,
-            "Adaptability": 6,
-            "Creativity": 8,
-            "Emotional Intelligence": 10,
-            
-            # Business
-            "Marketing": 8,
-            "Sales": 8,
-            "Finance": 10,
-            "Accounting": 12,
-            "HR": 8,
-            "Operations": 10,
-            "Strategy": 12,
-            "Business Development": 10,
-            "Product Management": 10,
-            "UX/UI Design": 8
-        }
-        
-        # Valeur par défaut pour les compétences non listées
-        default_learning_time = 6
-        
         # Calculer le temps total nécessaire et prioriser les compétences
         total_learning_time = 0
         prioritized_skills = []
@@ -645,7 +759,7 @@ class SkillGapAnalyzer:
             is_critical = skill_info["is_critical"]
             
             # Estimer le temps d'apprentissage
-            learning_time = skill_learning_times.get(skill, default_learning_time)
+            learning_time = self.training_catalog.learning_time_weeks(skill)
             
             # Ajuster en fonction de l'importance
             adjusted_learning_time = learning_time * (0.8 + (importance * 0.4))
@@ -719,53 +833,183 @@ class SkillGapAnalyzer:
         
         return result
     
-    def _get_training_resources_for_skill(self, skill: str) -> Dict[str, Any]:
+    def generate_team_development_plan(self,
+                                      employee_resumes: Dict[str, str],
+                                      job_description: Union[str, JobProfile],
+                                      timeframe_weeks: int = 12,
+                                      hours_per_week: float = TRAINING_HOURS_PER_WEEK) -> Dict[str, Any]:
         """
-        Retourne des ressources de formation pour une compétence donnée.
+        Génère les plans de développement de toute une équipe pour un poste cible.
+        
+        Le poste n'est analysé qu'une fois; les écarts de tous les employés sont calculés
+        ensemble sur la matrice de similarité (employés x compétences du poste), et le choix
+        des formations de chaque employé dans son budget d'heures est résolu par un sac à
+        dos calculé pour toute l'équipe à la fois. Les besoins communs sont regroupés: une
+        même formation peut couvrir plusieurs employés.
+        
+        Args:
+            employee_resumes: Dictionnaire avec les IDs des employés comme clés et leurs CV comme valeurs
+            job_description: La description du poste cible, ou son profil
+            timeframe_weeks: Le nombre de semaines disponibles pour le développement
+            hours_per_week: Les heures de formation disponibles par semaine et par employé
+            
+        Returns:
+            Les plans individuels et les formations partagées de l'équipe
         """
-        # Dictionnaire simulé de ressources de formation
-        training_resources = {
-            "Python": {
-                "courses": ["Python for Data Science and Machine Learning Bootcamp", "Complete Python Bootcamp"],
-                "platforms": ["Coursera", "Udemy", "DataCamp"],
-                "books": ["Python Crash Course", "Automate the Boring Stuff with Python"],
-                "projects": ["Build a personal portfolio website", "Create a data analysis tool"]
-            },
-            "JavaScript": {
-                "courses": ["Modern JavaScript From The Beginning", "JavaScript: Understanding the Weird Parts"],
-                "platforms": ["Udemy", "Frontend Masters", "freeCodeCamp"],
-                "books": ["Eloquent JavaScript", "You Don't Know JS"],
-                "projects": ["Build an interactive web application", "Create a browser game"]
-            },
-            "Machine Learning": {
-                "courses": ["Machine Learning by Andrew Ng", "Machine Learning A-Z"],
-                "platforms": ["Coursera", "Udemy", "edX"],
-                "books": ["Hands-On Machine Learning with Scikit-Learn and TensorFlow", "Pattern Recognition and Machine Learning"],
-                "projects": ["Build a recommendation system", "Create a predictive model for a real dataset"]
-            },
-            "AWS": {
-                "courses": ["AWS Certified Solutions Architect", "AWS Certified Developer"],
-                "platforms": ["A Cloud Guru", "AWS Training", "Pluralsight"],
-                "books": ["AWS Certified Solutions Architect Study Guide", "Amazon Web Services in Action"],
-                "projects": ["Deploy a scalable web application", "Build a serverless API"]
-            },
-            "Leadership": {
-                "courses": ["Leadership Development Program", "People Management Skills"],
-                "platforms": ["LinkedIn Learning", "Coursera", "edX"],
-                "books": ["Leaders Eat Last", "The 7 Habits of Highly Effective People"],
-                "projects": ["Lead a team project", "Mentor junior colleagues"]
-            }
-        }
+        validate_training_budget(timeframe_weeks, hours_per_week)
+        
+        logger.info(f"Génération des plans de développement de {len(employee_resumes)} employés sur {timeframe_weeks} semaines")
         
-        # Retourner les ressources spécifiques ou des ressources génériques
-        if skill in training_resources:
-            return training_resources[skill]
+        job_profile = self.get_job_profile(job_description)
+        job_skills = job_profile.skills
+        employee_ids = list(employee_resumes)
+        
+        importances = np.array([job_profile.importances[skill] for skill in job_skills], dtype=np.float64)
+        is_critical = np.array([skill in job_profile.critical_skills for skill in job_skills], dtype=bool)
+        
+        # Meilleure similarité de chaque employé pour chaque compétence du poste (employés x compétences)
+        similarities = self._team_similarities([employee_resumes[employee_id] for employee_id in employee_ids],
+                                               job_profile)
+        missing = similarities < self.similarity_threshold
+        
+        # Score d'écart avant formation, pondéré par l'importance (comme analyze_skill_gap)
+        total_importance = importances.sum()
+        if len(job_skills) > 0 and total_importance > 0:
+            match_scores = np.where(missing, 0.0, similarities) @ importances / total_importance
         else:
-            return {
-                "suggestion": f"Rechercher des cours sur {skill} sur des plateformes comme Coursera, Udemy, ou LinkedIn Learning",
-                "general_platforms": ["Coursera", "Udemy", "LinkedIn Learning", "edX", "Pluralsight"],
-                "approach": "Commencer par des cours d'introduction, puis passer à des projets pratiques pour consolider les connaissances"
-            }
+            match_scores = np.zeros(len(employee_ids))
+        gap_before = np.round((1.0 - match_scores) * 100, 2)
+        
+        # Durée (semaines, puis heures) et priorité de chaque formation: elles ne dépendent que du poste
+        learning_weeks = np.array([self.training_catalog.learning_time_weeks(skill) for skill in job_skills],
+                                  dtype=np.float64) * (0.8 + importances * 0.4)
+        learning_hours = np.ceil(learning_weeks * hours_per_week - 1e-9).astype(np.int64)
+        priorities = importances * np.where(is_critical, 1.5, 1.0)
+        capacity = int(timeframe_weeks * hours_per_week)
+        
+        # Sélection optimale des formations de chaque employé dans son budget, compté en
+        # demi-journées: la table du sac à dos reste petite quel que soit le budget
+        learning_units = -(-learning_hours // TRAINING_HOURS_UNIT)
+        selected = _batched_knapsack(learning_units, priorities, missing, capacity // TRAINING_HOURS_UNIT)
+        remaining_hours = capacity - selected.astype(np.int64) @ learning_hours
+        
+        # Ordre de planification: priorité décroissante (comme le plan individuel)
+        order = np.argsort(-priorities, kind="stable")
+        
+        employee_plans = []
+        developed = selected.copy()
+        for n, employee_id in enumerate(employee_ids):
+            development_plan = []
+            current_week = 1
+            for j in order:
+                if selected[n, j]:
+                    duration = float(learning_weeks[j])
+                    is_partial = False
+                elif missing[n, j] and is_critical[j] and remaining_hours[n] > 0:
+                    # Pour les compétences critiques, inclure même une formation partielle
+                    duration = remaining_hours[n] / hours_per_week
+                    remaining_hours[n] = 0
+                    developed[n, j] = True
+                    is_partial = True
+                else:
+                    continue
+                development_plan.append({
+                    "skill": job_skills[j],
+                    "start_week": current_week,
+                    "end_week": current_week + duration - 1,
+                    "duration_weeks": duration,
+                    "is_critical": bool(is_critical[j]),
+                    "is_partial_training": is_partial
+                })
+                current_week += duration
+            
+            employee_plans.append({
+                "employee_id": employee_id,
+                "missing_skills": [job_skills[j] for j in np.flatnonzero(missing[n])],
+                "skills_covered": len(development_plan),
+                "skills_not_covered": int(missing[n].sum()) - len(development_plan),
+                "critical_skills_not_covered": int((missing[n] & is_critical & ~developed[n]).sum()),
+                "development_plan": development_plan
+            })
+        
+        # Score d'écart estimé après formation (réduction proportionnelle à l'importance développée)
+        missing_importance = missing.astype(np.float64) @ importances
+        developed_importance = developed.astype(np.float64) @ importances
+        reduction = np.divide(developed_importance, missing_importance,
+                              out=np.zeros_like(missing_importance), where=missing_importance > 0)
+        gap_after = np.where(developed_importance >= missing_importance, 0.0, np.round(gap_before * (1 - reduction), 2))
+        gap_after = np.where(missing_importance > 0, gap_after, gap_before)
+        for n, plan in enumerate(employee_plans):
+            plan["skill_gap_score_before"] = float(gap_before[n])
+            plan["estimated_skill_gap_score_after"] = float(gap_after[n])
+        
+        # Besoins de formation communs: une formation par compétence pour tous les employés concernés
+        shared_trainings = []
+        for j in order:
+            if not missing[:, j].any():
+                continue
+            skill = job_skills[j]
+            shared_trainings.append({
+                "skill": skill,
+                "is_critical": bool(is_critical[j]),
+                "importance": float(importances[j]),
+                "learning_time_weeks": float(learning_weeks[j]),
+                "employees_missing_count": int(missing[:, j].sum()),
+                "employees_planned": [employee_ids[n] for n in np.flatnonzero(developed[:, j])],
+                "resources": self._get_training_resources_for_skill(skill)
+            })
+        shared_trainings.sort(key=lambda training: (len(training["employees_planned"]), training["importance"]), reverse=True)
+        
+        result = {
+            "job_skills": list(job_skills),
+            "critical_skills": list(job_profile.critical_skills),
+            "employee_count": len(employee_ids),
+            "timeframe_available": timeframe_weeks,
+            "hours_budget_per_employee": capacity,
+            "average_skill_gap_score_before": round(float(gap_before.mean()), 2) if employee_ids else 0.0,
+            "average_estimated_skill_gap_score_after": round(float(gap_after.mean()), 2) if employee_ids else 0.0,
+            "shared_trainings": shared_trainings,
+            "employee_plans": employee_plans,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        logger.info(f"Plans de développement générés pour {len(employee_ids)} employés ({len(shared_trainings)} formations communes)")
+        
+        return result
+    
+    def _team_similarities(self, resumes: List[str], job_profile: JobProfile) -> np.ndarray:
+        """
+        Meilleure similarité de chaque CV avec chaque compétence du poste (CV x compétences du poste)
+        """
+        job_ids = job_profile.skill_ids
+        similarities = np.zeros((len(resumes), len(job_ids)))
+        # Matrice binaire des compétences de chaque employé (employés x taxonomie)
+        has_skill = np.zeros((len(resumes), len(self.skill_names)), dtype=bool)
+        in_taxonomy = np.full(len(resumes), (job_ids >= 0).all())
+        
+        for n, resume in enumerate(resumes):
+            skills = self._extract_skills_from_text(resume)
+            skill_ids = self._skill_ids(skills)
+            if in_taxonomy[n] and (skill_ids >= 0).all():
+                has_skill[n, skill_ids] = True
+            else:
+                # Compétence hors taxonomie: calcul paire par paire pour cet employé
+                in_taxonomy[n] = False
+                similarities[n] = self._similarity_submatrix(job_profile.skills, job_ids,
+                                                             skills, skill_ids).max(axis=1, initial=0.0)
+        
+        if in_taxonomy.any():
+            # Similarités (poste x taxonomie), masquées par les compétences de chaque employé
+            job_similarities = self.similarity_matrix[job_ids]
+            similarities[in_taxonomy] = np.where(has_skill[in_taxonomy, None, :],
+                                                 job_similarities[None, :, :], 0.0).max(axis=2, initial=0.0)
+        return similarities
+    
+    def _get_training_resources_for_skill(self, skill: str) -> Dict[str, Any]:
+        """
+        Retourne des ressources de formation pour une compétence donnée.
+        """
+        return self.training_catalog.development_resources(skill)
     
     def _estimate_skill_gap_after_training(self, 
                                           gap_analysis: Dict[str, Any], 
@@ -801,3 +1045,98 @@ class SkillGapAnalyzer:
             reduction_factor = developed_importance / total_importance
             new_gap_score = current_gap_score * (1 - reduction_factor)
             return round(new_gap_score, 2)
+
+
+def _ranking_entry(candidate_id: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ligne du classement d'un candidat, extraite de son analyse détaillée
+    """
+    return {
+        "candidate_id": candidate_id,
+        "match_score": analysis["overall_match_score"],
+        "skill_gap_score": analysis["skill_gap_score"],
+        "missing_critical_skills_count": analysis["missing_critical_skills_count"],
+        "missing_skills_count": analysis["missing_skills_count"],
+        "additional_skills_count": analysis["additional_skills_count"]
+    }
+
+
+def _ranking_key(entry: Dict[str, Any]) -> Tuple[float, int]:
+    return entry["match_score"], -entry["missing_critical_skills_count"]
+
+
+def _sorted_top(top_heap: List[Tuple[Tuple[float, int], int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return [entry for _, _, entry in sorted(top_heap, reverse=True)]
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Analyseur propre à chaque processus du pool de comparaison
+_worker_analyzer = None
+
+def _analyze_candidate_chunk(job_profile: JobProfile, chunk: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Analyse un lot de candidats pour un poste (exécuté dans un processus du pool)
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SkillGapAnalyzer()
+    return [
+        (candidate_id, _worker_analyzer.analyze_skill_gap(resume, job_profile, candidate_id=candidate_id))
+        for candidate_id, resume in chunk
+    ]
+
+
+def validate_training_budget(timeframe_weeks: Any, hours_per_week: Any) -> None:
+    """
+    Vérifie la durée et les heures hebdomadaires d'un plan d'équipe; ValueError si elles sont invalides
+    """
+    for name, value, maximum in (("timeframe_weeks", timeframe_weeks, MAX_TRAINING_TIMEFRAME_WEEKS),
+                                 ("hours_per_week", hours_per_week, MAX_TRAINING_HOURS_PER_WEEK)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"'{name}' doit être un nombre: {value!r}")
+        if not 0 < value <= maximum:
+            raise ValueError(f"'{name}' doit être strictement positif et au plus égal à {maximum}: {value}")
+
+
+def _batched_knapsack(weights: np.ndarray, values: np.ndarray, eligible: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    Résout un sac à dos 0/1 par ligne de `eligible` (un employé par ligne), pour toutes les lignes à la fois.
+    
+    Les objets (formations) ont les mêmes poids et valeurs pour toutes les lignes; seule leur
+    éligibilité change. La programmation dynamique est vectorisée sur les employés et les
+    capacités: O(objets) opérations NumPy sur des tableaux (employés x capacité).
+    Retourne la sélection optimale (employés x objets).
+    """
+    if capacity < 0:
+        raise ValueError(f"Capacité négative: {capacity}")
+    n_rows, n_items = eligible.shape
+    best = np.zeros((n_rows, capacity + 1))
+    taken = np.zeros((n_items, n_rows, capacity + 1), dtype=bool)
+    
+    for j in range(n_items):
+        weight = int(weights[j])
+        if weight > capacity:
+            continue
+        candidate = np.full_like(best, -np.inf)
+        candidate[:, weight:] = best[:, :capacity + 1 - weight] + values[j]
+        improved = (candidate > best) & eligible[:, j:j + 1]
+        taken[j] = improved
+        best = np.where(improved, candidate, best)
+    
+    # Reconstruction de la sélection, de la dernière formation à la première
+    selected = np.zeros((n_rows, n_items), dtype=bool)
+    rows = np.arange(n_rows)
+    remaining = np.full(n_rows, capacity)
+    for j in range(n_items - 1, -1, -1):
+        chosen = taken[j, rows, remaining]
+        selected[:, j] = chosen
+        remaining = remaining - np.where(chosen, int(weights[j]), 0)
+    return selected
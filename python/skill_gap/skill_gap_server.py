@@ -1,8 +1,13 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, send_file
+import os
+import re
+import uuid
 import logging
 import json
+import time
 import traceback
-from skill_gap_analyzer import SkillGapAnalyzer
+from skill_gap_analyzer import (SkillGapAnalyzer, COMPARISON_WORKERS, DEFAULT_TOP_N, TRAINING_HOURS_PER_WEEK,
+                                validate_training_budget)
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -14,6 +19,51 @@ app = Flask(__name__)
 # Initialisation de l'analyseur d'écarts de compétences
 skill_gap_analyzer = SkillGapAnalyzer()
 
+# Répertoire des analyses détaillées (NDJSON) produites par les comparaisons en flux
+COMPARISON_ANALYSES_DIR = os.environ.get("SKILL_GAP_ANALYSES_DIR", "data/skill_gap_analyses")
+
+# Durée de conservation (secondes) des analyses détaillées, comptée depuis leur dernière écriture
+COMPARISON_ANALYSES_TTL = int(os.environ.get("SKILL_GAP_ANALYSES_TTL", 24 * 3600))
+
+def positive_int_arg(name, default):
+    """
+    Paramètre entier strictement positif de la requête; ValueError si la valeur est invalide
+    """
+    value = request.args.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Le paramètre '{name}' doit être un entier: {value!r}")
+    if value < 1:
+        raise ValueError(f"Le paramètre '{name}' doit être strictement positif: {value}")
+    return value
+
+def request_workers():
+    """
+    Nombre de processus demandé pour une comparaison, borné par SKILL_GAP_WORKERS
+    """
+    return min(positive_int_arg('workers', COMPARISON_WORKERS), COMPARISON_WORKERS)
+
+def prune_comparison_analyses(now=None):
+    """
+    Supprime les analyses détaillées non modifiées depuis plus de COMPARISON_ANALYSES_TTL secondes
+    """
+    if not os.path.isdir(COMPARISON_ANALYSES_DIR):
+        return 0
+    now = time.time() if now is None else now
+    removed = 0
+    for entry in os.scandir(COMPARISON_ANALYSES_DIR):
+        if not (entry.is_file() and entry.name.endswith(".ndjson")):
+            continue
+        try:
+            if now - entry.stat().st_mtime > COMPARISON_ANALYSES_TTL:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            # Déjà supprimée par un autre processus
+            continue
+    return removed
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
@@ -76,11 +126,20 @@ def compare_candidates():
         # Extraire les données
         candidate_resumes = data['candidate_resumes']
         job_description = data['job_description']
+        if not isinstance(candidate_resumes, dict):
+            return jsonify({
+                "error": "'candidate_resumes' doit être un dictionnaire {identifiant: CV}."
+            }), 400
+        try:
+            workers = request_workers() if 'workers' in request.args else 1
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        # Comparer les candidats
+        # Comparer les candidats (en parallèle si la requête le demande)
         result = skill_gap_analyzer.compare_candidates_for_job(
             candidate_resumes=candidate_resumes,
-            job_description=job_description
+            job_description=job_description,
+            workers=workers
         )
         
         return jsonify(result)
@@ -93,6 +152,95 @@ def compare_candidates():
             "traceback": traceback.format_exc()
         }), 500
 
+@app.route('/compare/stream', methods=['POST'])
+def compare_candidates_stream():
+    """
+    Point de terminaison pour comparer un grand nombre de candidats en flux.
+    Accepte:
+    - un flux JSONL (Content-Type: application/x-ndjson), une ligne {"candidate_id", "candidate_resume"}
+      par candidat, la description du poste étant passée dans le paramètre job_description
+    - ou un JSON avec 'candidate_resumes' et 'job_description', comme /compare
+    Le classement (top_n meilleurs candidats) est retourné en NDJSON au fil de l'analyse; les
+    analyses détaillées sont consultables ensuite sur /compare/<comparison_id>/analyses, pendant
+    SKILL_GAP_ANALYSES_TTL secondes.
+    """
+    if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        job_description = request.args.get('job_description')
+        candidates = iter_candidate_jsonl(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or 'candidate_resumes' not in data:
+            return jsonify({
+                "error": "Les données requises sont manquantes. Veuillez fournir 'candidate_resumes' et 'job_description'."
+            }), 400
+        job_description = data.get('job_description')
+        if not isinstance(data['candidate_resumes'], dict):
+            return jsonify({
+                "error": "'candidate_resumes' doit être un dictionnaire {identifiant: CV}."
+            }), 400
+        candidates = data['candidate_resumes'].items()
+    
+    if not job_description:
+        return jsonify({"error": "La description du poste ('job_description') est requise."}), 400
+    
+    try:
+        top_n = positive_int_arg('top_n', DEFAULT_TOP_N)
+        workers = request_workers()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # Les analyses détaillées des comparaisons expirées ne sont plus servies
+    prune_comparison_analyses()
+    comparison_id = str(uuid.uuid4())
+    os.makedirs(COMPARISON_ANALYSES_DIR, exist_ok=True)
+    sink_path = os.path.join(COMPARISON_ANALYSES_DIR, f"{comparison_id}.ndjson")
+    
+    def generate():
+        with open(sink_path, 'w', encoding='utf-8') as sink:
+            try:
+                for event in skill_gap_analyzer.compare_candidates_stream(
+                        candidates, job_description, top_n=top_n, workers=workers, sink=sink):
+                    event["comparison_id"] = comparison_id
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+            except Exception as e:
+                logger.error(f"Erreur lors de la comparaison en flux: {str(e)}")
+                logger.error(traceback.format_exc())
+                yield json.dumps({"event": "error", "comparison_id": comparison_id, "error": str(e)}, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route('/compare/<comparison_id>/analyses', methods=['GET'])
+def get_comparison_analyses(comparison_id):
+    """
+    Point de terminaison pour récupérer les analyses détaillées (NDJSON) d'une comparaison en flux.
+    """
+    if not re.fullmatch(r'[0-9a-f-]{36}', comparison_id):
+        return jsonify({"error": "Comparaison non trouvée"}), 404
+    
+    sink_path = os.path.join(COMPARISON_ANALYSES_DIR, f"{comparison_id}.ndjson")
+    try:
+        expired = time.time() - os.path.getmtime(sink_path) > COMPARISON_ANALYSES_TTL
+    except FileNotFoundError:
+        expired = True
+    if expired:
+        return jsonify({"error": "Comparaison non trouvée"}), 404
+    
+    return send_file(os.path.abspath(sink_path), mimetype="application/x-ndjson")
+
+def iter_candidate_jsonl(stream):
+    """
+    Lit un flux JSONL de candidats et retourne les couples (identifiant, CV)
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            candidate = json.loads(line)
+            yield str(candidate.get('candidate_id') or line_number), candidate['candidate_resume']
+        except (ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Ligne {line_number} ignorée: {str(e)}")
+
 @app.route('/development-plan', methods=['POST'])
 def generate_development_plan():
     """
@@ -129,6 +277,54 @@ def generate_development_plan():
             "traceback": traceback.format_exc()
         }), 500
 
+@app.route('/team-development-plan', methods=['POST'])
+def generate_team_development_plan():
+    """
+    Point de terminaison pour générer les plans de développement de toute une équipe.
+    Attend un JSON avec 'employee_resumes' ({id: CV}), 'job_description' et, optionnellement,
+    'timeframe_weeks' (au plus MAX_TRAINING_TIMEFRAME_WEEKS) et 'hours_per_week' (au plus
+    MAX_TRAINING_HOURS_PER_WEEK).
+    """
+    try:
+        data = request.json
+        
+        # Vérifier les données requises
+        if not data or 'employee_resumes' not in data or 'job_description' not in data:
+            return jsonify({
+                "error": "Les données requises sont manquantes. Veuillez fournir 'employee_resumes' et 'job_description'."
+            }), 400
+        
+        employee_resumes = data['employee_resumes']
+        if not isinstance(employee_resumes, dict):
+            return jsonify({
+                "error": "'employee_resumes' doit être un dictionnaire {identifiant: CV}."
+            }), 400
+        
+        timeframe_weeks = data.get('timeframe_weeks', 12)
+        hours_per_week = data.get('hours_per_week', TRAINING_HOURS_PER_WEEK)
+        try:
+            validate_training_budget(timeframe_weeks, hours_per_week)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # Générer les plans de l'équipe
+        result = skill_gap_analyzer.generate_team_development_plan(
+            employee_resumes=employee_resumes,
+            job_description=data['job_description'],
+            timeframe_weeks=timeframe_weeks,
+            hours_per_week=hours_per_week
+        )
+        
+        return jsonify(result)
+    
+    except Exception as e:
+        logger.error(f"Erreur lors de la génération des plans de l'équipe: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({
+            "error": f"Une erreur s'est produite lors de la génération des plans: {str(e)}",
+            "traceback": traceback.format_exc()
+        }), 500
+
 if __name__ == '__main__':
     logger.info("Démarrage du serveur d'analyse des écarts de compétences...")
     app.run(host='0.0.0.0', port=5006, debug=False)
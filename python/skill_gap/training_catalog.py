@@ -0,0 +1,237 @@
+from types import MappingProxyType
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping
+
+# Temps estimé (en semaines) pour acquérir chaque compétence
+SKILL_LEARNING_TIMES = {
+    # Programmation
+    "Python": 6,
+    "JavaScript": 8,
+    "Java": 10,
+    "C++": 12,
+    "C#": 8,
+    "Ruby": 6,
+    "PHP": 6,
+    "Swift": 8,
+    "Kotlin": 8,
+    "TypeScript": 4,
+    "Go": 6,
+    "Rust": 10,
+    "Scala": 8,
+    "R": 6,
+    "SQL": 4,
+    "NoSQL": 4,
+    "HTML": 2,
+    "CSS": 4,
+    
+    # Data Science
+    "Machine Learning": 12,
+    "Deep Learning": 10,
+    "NLP": 8,
+    "Computer Vision": 10,
+    "Data Mining": 8,
+    "Statistical Analysis": 6,
+    "Data Visualization": 4,
+    "Big Data": 8,
+    "TensorFlow": 6,
+    "PyTorch": 6,
+    "Keras": 4,
+    "scikit-learn": 4,
+    "pandas": 3,
+    "NumPy": 3,
+    
+    # Cloud
+    "AWS": 8,
+    "Azure": 8,
+    "Google Cloud": 8,
+    "Docker": 4,
+    "Kubernetes": 6,
+    "Serverless": 4,
+    "Microservices": 6,
+    "DevOps": 10,
+    "CI/CD": 6,
+    
+    # Soft Skills
+    "Communication": 6,
+    "Leadership": 10,
+    "Teamwork": 4,
+    "Problem Solving": 8,
+    "Critical Thinking": 8,
+    "Time Management": 4,
+    "Adaptability": 6,
+    "Creativity": 8,
+    "Emotional Intelligence": 10,
+    
+    # Business
+    "Marketing": 8,
+    "Sales": 8,
+    "Finance": 10,
+    "Accounting": 12,
+    "HR": 8,
+    "Operations": 10,
+    "Strategy": 12,
+    "Business Development": 10,
+    "Product Management": 10,
+    "UX/UI Design": 8
+}
+
+# Valeur par défaut pour les compétences non listées
+DEFAULT_LEARNING_TIME_WEEKS = 6
+
+# Ressources recommandées dans l'analyse des écarts (avec la durée indicative de formation)
+RECOMMENDATION_RESOURCES = {
+    "Python": {
+        "courses": ["Python for Data Science and Machine Learning Bootcamp", "Complete Python Bootcamp"],
+        "platforms": ["Coursera", "Udemy", "DataCamp"],
+        "estimated_time": "4-8 weeks"
+    },
+    "JavaScript": {
+        "courses": ["Modern JavaScript From The Beginning", "JavaScript: Understanding the Weird Parts"],
+        "platforms": ["Udemy", "Frontend Masters", "freeCodeCamp"],
+        "estimated_time": "6-10 weeks"
+    },
+    "Machine Learning": {
+        "courses": ["Machine Learning by Andrew Ng", "Machine Learning A-Z"],
+        "platforms": ["Coursera", "Udemy", "edX"],
+        "estimated_time": "10-16 weeks"
+    },
+    "AWS": {
+        "courses": ["AWS Certified Solutions Architect", "AWS Certified Developer"],
+        "platforms": ["A Cloud Guru", "AWS Training", "Pluralsight"],
+        "estimated_time": "8-12 weeks"
+    },
+    "Leadership": {
+        "courses": ["Leadership Development Program", "People Management Skills"],
+        "platforms": ["LinkedIn Learning", "Coursera", "edX"],
+        "estimated_time": "4-8 weeks"
+    },
+    "Data Analysis": {
+        "courses": ["Data Analysis with Python", "SQL for Data Analysis"],
+        "platforms": ["Coursera", "DataCamp", "Udacity"],
+        "estimated_time": "6-10 weeks"
+    }
+}
+
+# Ressources détaillées des plans de développement (cours, plateformes, livres, projets)
+DEVELOPMENT_RESOURCES = {
+    "Python": {
+        "courses": ["Python for Data Science and Machine Learning Bootcamp", "Complete Python Bootcamp"],
+        "platforms": ["Coursera", "Udemy", "DataCamp"],
+        "books": ["Python Crash Course", "Automate the Boring Stuff with Python"],
+        "projects": ["Build a personal portfolio website", "Create a data analysis tool"]
+    },
+    "JavaScript": {
+        "courses": ["Modern JavaScript From The Beginning", "JavaScript: Understanding the Weird Parts"],
+        "platforms": ["Udemy", "Frontend Masters", "freeCodeCamp"],
+        "books": ["Eloquent JavaScript", "You Don't Know JS"],
+        "projects": ["Build an interactive web application", "Create a browser game"]
+    },
+    "Machine Learning": {
+        "courses": ["Machine Learning by Andrew Ng", "Machine Learning A-Z"],
+        "platforms": ["Coursera", "Udemy", "edX"],
+        "books": ["Hands-On Machine Learning with Scikit-Learn and TensorFlow", "Pattern Recognition and Machine Learning"],
+        "projects": ["Build a recommendation system", "Create a predictive model for a real dataset"]
+    },
+    "AWS": {
+        "courses": ["AWS Certified Solutions Architect", "AWS Certified Developer"],
+        "platforms": ["A Cloud Guru", "AWS Training", "Pluralsight"],
+        "books": ["AWS Certified Solutions Architect Study Guide", "Amazon Web Services in Action"],
+        "projects": ["Deploy a scalable web application", "Build a serverless API"]
+    },
+    "Leadership": {
+        "courses": ["Leadership Development Program", "People Management Skills"],
+        "platforms": ["LinkedIn Learning", "Coursera", "edX"],
+        "books": ["Leaders Eat Last", "The 7 Habits of Highly Effective People"],
+        "projects": ["Lead a team project", "Mentor junior colleagues"]
+    }
+}
+
+
+# Plateformes proposées quand aucune ressource spécifique n'est connue
+GENERAL_PLATFORMS = ("Coursera", "Udemy", "LinkedIn Learning", "edX", "Pluralsight")
+
+
+def _frozen_bundle(resources: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Vue en lecture seule d'une copie d'un ensemble de ressources, dont les listes sont remplacées par des tuples
+    """
+    return MappingProxyType({key: tuple(value) if isinstance(value, list) else value
+                             for key, value in resources.items()})
+
+
+def _generic_recommendation(skill: str) -> Dict[str, Any]:
+    return {
+        "suggestion": f"Rechercher des cours sur {skill} sur des plateformes comme Coursera, Udemy, ou LinkedIn Learning",
+        "estimated_time": "4-12 weeks"
+    }
+
+
+def _generic_development(skill: str) -> Dict[str, Any]:
+    return {
+        "suggestion": f"Rechercher des cours sur {skill} sur des plateformes comme Coursera, Udemy, ou LinkedIn Learning",
+        "general_platforms": GENERAL_PLATFORMS,
+        "approach": "Commencer par des cours d'introduction, puis passer à des projets pratiques pour consolider les connaissances"
+    }
+
+
+@dataclass(frozen=True)
+class SkillTraining:
+    """
+    Ressources et temps d'apprentissage précalculés d'une compétence
+    """
+    recommendation_resources: Mapping[str, Any]
+    development_resources: Mapping[str, Any]
+    learning_time_weeks: float
+
+
+class TrainingCatalog:
+    """
+    Catalogue des formations, indexé par compétence et construit une seule fois.
+
+    Les ressources de chaque compétence (catalogue ou ressources génériques) sont
+    assemblées à la construction: une recommandation ne coûte plus qu'une lecture de
+    dictionnaire au lieu de la reconstruction des tables à chaque appel. L'index et les
+    ressources de chaque compétence sont en lecture seule (`MappingProxyType`, listes
+    remplacées par des tuples). `recommendation_resources` et `development_resources`
+    retournent une copie superficielle de ces ressources: un dictionnaire propre à chaque
+    réponse, sérialisable en JSON et transmissible aux processus de comparaison, dont la
+    modification n'affecte pas le catalogue.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        entries = {}
+        for skill in dict.fromkeys([*skills, *RECOMMENDATION_RESOURCES, *DEVELOPMENT_RESOURCES, *SKILL_LEARNING_TIMES]):
+            entries[skill] = self._build_entry(skill)
+        self._entries: Mapping[str, SkillTraining] = MappingProxyType(entries)
+
+    @staticmethod
+    def _build_entry(skill: str) -> SkillTraining:
+        recommendation = RECOMMENDATION_RESOURCES.get(skill)
+        development = DEVELOPMENT_RESOURCES.get(skill)
+        return SkillTraining(
+            _frozen_bundle(recommendation or _generic_recommendation(skill)),
+            _frozen_bundle(development or _generic_development(skill)),
+            SKILL_LEARNING_TIMES.get(skill, DEFAULT_LEARNING_TIME_WEEKS)
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self._entries
+
+    def entry(self, skill: str) -> SkillTraining:
+        """
+        Ressources d'une compétence; une compétence hors catalogue est assemblée à la volée
+        """
+        entry = self._entries.get(skill)
+        return entry if entry is not None else self._build_entry(skill)
+
+    def recommendation_resources(self, skill: str) -> Dict[str, Any]:
+        return dict(self.entry(skill).recommendation_resources)
+
+    def development_resources(self, skill: str) -> Dict[str, Any]:
+        return dict(self.entry(skill).development_resources)
+
+    def learning_time_weeks(self, skill: str) -> float:
+        return self.entry(skill).learning_time_weeks
@@ -0,0 +1,99 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+class SkillMatch(NamedTuple):
+    skill_id: int
+    skill: str
+    start: int
+    end: int
+
+
+class SkillMatcher:
+    """
+    Extracteur de compétences compilé une seule fois pour tout un vocabulaire.
+
+    Toutes les formes de surface (noms canoniques et alias) sont fusionnées dans une
+    unique expression régulière factorisée en trie: un seul parcours du texte suffit,
+    quel que soit le nombre de compétences. Les limites de mots sont gérées par des
+    assertions (?<!\\w) / (?!\\w) afin que des compétences comme "c++", "c#" ou
+    "node.js" soient reconnues, et le motif est placé dans une assertion avant pour
+    que des compétences qui se chevauchent ("big data" et "data science") soient
+    toutes retrouvées. Pour la simple extraction, le texte est mis en minuscules une
+    seule fois et parcouru par une variante du motif sensible à la casse, plus rapide.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, Iterable[str]]] = None):
+        # L'identifiant d'une compétence est sa position dans le vocabulaire
+        self.skills: List[str] = list(dict.fromkeys(skills))
+        self._skill_ids = {skill: skill_id for skill_id, skill in enumerate(self.skills)}
+
+        # Forme de surface en minuscules -> identifiant canonique
+        self._surface_ids: Dict[str, int] = {}
+        for skill_id, skill in enumerate(self.skills):
+            self._surface_ids.setdefault(skill.lower(), skill_id)
+        for skill, skill_aliases in (aliases or {}).items():
+            skill_id = self._skill_ids[skill]
+            for alias in skill_aliases:
+                self._surface_ids.setdefault(alias.lower(), skill_id)
+
+        trie = _trie_pattern(self._surface_ids)
+        self._pattern = re.compile(r'(?<!\w)(?=(' + trie + r')(?!\w))', re.IGNORECASE)
+        # Variante pour un texte déjà en minuscules (les formes de surface le sont aussi)
+        self._lowered_pattern = re.compile(r'(?<!\w)(?=(' + trie + r')(?!\w))')
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """
+        Retourne toutes les occurrences de compétences avec leur position dans le texte
+        """
+        matches = []
+        for match in self._pattern.finditer(text):
+            skill_id = self._surface_ids[match.group(1).lower()]
+            matches.append(SkillMatch(skill_id, self.skills[skill_id], match.start(1), match.end(1)))
+        return matches
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Retourne les compétences canoniques présentes dans le texte, dans l'ordre du vocabulaire
+        """
+        return self.extract_lowered(text.lower())
+
+    def extract_lowered(self, lowered_text: str) -> List[str]:
+        """
+        Comme extract, pour un texte déjà mis en minuscules par l'appelant
+        """
+        found_ids = {self._surface_ids[match.group(1)] for match in self._lowered_pattern.finditer(lowered_text)}
+        return [self.skills[skill_id] for skill_id in sorted(found_ids)]
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Construit une expression régulière factorisée en trie pour une liste de mots
+
+    Les branches optionnelles étant gourmandes, la forme la plus longue est essayée en
+    premier, avec retour arrière vers les formes plus courtes si la limite de mot échoue.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _node_pattern(trie) or r'(?!)'
+
+
+def _node_pattern(node: dict) -> str:
+    is_terminal = '' in node
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+
+    if not branches:
+        return ''
+
+    if len(branches) == 1 and not is_terminal:
+        return branches[0]
+
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if is_terminal else pattern
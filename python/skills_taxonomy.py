@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+# Taxonomie livrée avec le code; SKILLS_TAXONOMY_PATH permet d'en charger une autre (ex. dérivée d'ESCO)
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+TAXONOMY_FORMAT_VERSION = 1
+
+# Intervalle minimal (secondes) entre deux vérifications de la date de modification du fichier
+DEFAULT_RELOAD_INTERVAL = 30.0
+
+
+class TaxonomyFormatError(ValueError):
+    """
+    Fichier de taxonomie invalide ou de version de format non prise en charge
+    """
+
+
+class SkillsTaxonomy:
+    """
+    Taxonomie hiérarchique des compétences: domaines (éventuellement rattachés à un
+    domaine parent), compétences canoniques, alias et compétence parente.
+
+    Une instance est immuable: les index inversés (forme de surface -> compétence,
+    compétence -> domaine, compétence -> parent) sont construits au chargement et
+    chaque recherche est une simple lecture de dictionnaire, en O(1) quelle que soit
+    la taille de la taxonomie. Un rechargement produit une nouvelle instance.
+
+    Les compétences marquées `ambiguous` (mots courants comme "LESS") ne sont pas
+    recherchées par les extracteurs par domaine; les vocabulaires (listes explicites de
+    compétences propres à un service) peuvent les inclure.
+
+    Format du fichier (JSON, `format_version` 1):
+        {"format_version": 1, "version": "...", "domains": [
+            {"id": "data_science", "label": "...", "parent": null, "skills": [
+                "Big Data",
+                {"name": "Deep Learning", "aliases": ["apprentissage profond"], "parent": "Machine Learning"},
+                {"name": "LESS", "ambiguous": true}
+            ]}
+        ], "vocabularies": {"interview_key_skills": ["Python", "Deep Learning", "LESS"]}}
+    """
+
+    def __init__(self, document: Dict[str, Any], source: Optional[str] = None):
+        if document.get("format_version") != TAXONOMY_FORMAT_VERSION:
+            raise TaxonomyFormatError(f"Version de format de taxonomie non prise en charge: {document.get('format_version')}")
+
+        self.version = str(document.get("version", ""))
+        self.source = source
+        # Empreinte du contenu: deux processus partagent les mêmes identifiants de compétences s'ils ont la même
+        self.fingerprint = hashlib.sha256(json.dumps(document, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+        # Domaine -> compétences canoniques, dans l'ordre du fichier
+        self.domains: Dict[str, List[str]] = {}
+        self.domain_labels: Dict[str, str] = {}
+        self.domain_parents: Dict[str, Optional[str]] = {}
+        # Compétence canonique -> domaine, compétence parente, alias
+        self._skill_domain: Dict[str, str] = {}
+        self._skill_parent: Dict[str, Optional[str]] = {}
+        self.aliases: Dict[str, List[str]] = {}
+        self._ambiguous: Set[str] = set()
+        # Forme de surface en minuscules (nom canonique ou alias) -> compétence canonique
+        self._surface_forms: Dict[str, str] = {}
+
+        for domain in document.get("domains", []):
+            domain_id = domain["id"]
+            if domain_id in self.domains:
+                raise TaxonomyFormatError(f"Domaine en double: {domain_id}")
+            self.domains[domain_id] = []
+            self.domain_labels[domain_id] = domain.get("label", domain_id)
+            self.domain_parents[domain_id] = domain.get("parent")
+
+            for entry in domain.get("skills", []):
+                if isinstance(entry, str):
+                    entry = {"name": entry}
+                skill = entry["name"]
+                if skill.lower() in self._surface_forms:
+                    raise TaxonomyFormatError(f"Compétence en double: {skill}")
+                self.domains[domain_id].append(skill)
+                self._skill_domain[skill] = domain_id
+                self._skill_parent[skill] = entry.get("parent")
+                self._surface_forms[skill.lower()] = skill
+                if entry.get("aliases"):
+                    self.aliases[skill] = list(entry["aliases"])
+                if entry.get("ambiguous"):
+                    self._ambiguous.add(skill)
+
+        # Les alias sont indexés après les noms canoniques: un nom canonique n'est jamais masqué
+        for skill, skill_aliases in self.aliases.items():
+            for alias in skill_aliases:
+                self._surface_forms.setdefault(alias.lower(), skill)
+
+        for domain_id, parent in self.domain_parents.items():
+            if parent is not None and parent not in self.domains:
+                raise TaxonomyFormatError(f"Domaine parent inconnu pour {domain_id}: {parent}")
+        for skill, parent in self._skill_parent.items():
+            if parent is not None and parent not in self._skill_domain:
+                raise TaxonomyFormatError(f"Compétence parente inconnue pour {skill}: {parent}")
+
+        # Vocabulaire -> compétences canoniques, dans l'ordre du fichier (les alias y sont admis)
+        self.vocabularies: Dict[str, List[str]] = {}
+        for name, entries in document.get("vocabularies", {}).items():
+            skills = []
+            for entry in entries:
+                skill = self.normalize(entry)
+                if skill is None:
+                    raise TaxonomyFormatError(f"Compétence inconnue dans le vocabulaire {name}: {entry}")
+                skills.append(skill)
+            self.vocabularies[name] = list(dict.fromkeys(skills))
+
+        self._matchers: Dict[Tuple[Optional[Tuple[str, ...]], Optional[str]], SkillMatcher] = {}
+        self._matchers_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TAXONOMY_PATH) -> "SkillsTaxonomy":
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                document = json.load(f)
+            except ValueError as e:
+                raise TaxonomyFormatError(f"Taxonomie illisible ({path}): {e}")
+        return cls(document, source=path)
+
+    def __len__(self) -> int:
+        return len(self._skill_domain)
+
+    def __contains__(self, skill: str) -> bool:
+        return self.normalize(skill) is not None
+
+    @property
+    def skills(self) -> List[str]:
+        """
+        Toutes les compétences canoniques, domaine par domaine
+        """
+        return list(self._skill_domain)
+
+    def normalize(self, name: str) -> Optional[str]:
+        """
+        Nom canonique d'une compétence ou d'un de ses alias (insensible à la casse), ou None
+        """
+        return self._surface_forms.get(name.strip().lower())
+
+    def domain_of(self, skill: str) -> Optional[str]:
+        """
+        Domaine d'une compétence (nom canonique ou alias), ou None si elle est inconnue
+        """
+        domain = self._skill_domain.get(skill)
+        if domain is None:
+            canonical = self.normalize(skill)
+            domain = self._skill_domain.get(canonical) if canonical else None
+        return domain
+
+    def parent_of(self, skill: str) -> Optional[str]:
+        canonical = skill if skill in self._skill_parent else self.normalize(skill)
+        return self._skill_parent.get(canonical) if canonical else None
+
+    def ancestors(self, skill: str) -> List[str]:
+        """
+        Compétences parentes, de la plus proche à la plus générale
+        """
+        chain = []
+        parent = self.parent_of(skill)
+        while parent is not None and parent not in chain:
+            chain.append(parent)
+            parent = self._skill_parent.get(parent)
+        return chain
+
+    def domain_path(self, domain: str) -> List[str]:
+        """
+        Domaine et ses domaines parents, du plus spécifique au plus général
+        """
+        path = []
+        while domain is not None and domain not in path:
+            path.append(domain)
+            domain = self.domain_parents.get(domain)
+        return path
+
+    def skills_in(self, domains: Iterable[str]) -> List[str]:
+        return [skill for domain in domains for skill in self.domains.get(domain, [])]
+
+    def is_ambiguous(self, skill: str) -> bool:
+        canonical = skill if skill in self._skill_domain else self.normalize(skill)
+        return canonical in self._ambiguous
+
+    def as_domain_dict(self) -> Dict[str, List[str]]:
+        """
+        Copie de la taxonomie sous la forme {domaine: [compétences]}
+        """
+        return {domain: list(skills) for domain, skills in self.domains.items()}
+
+    def matcher(self, domains: Optional[Iterable[str]] = None, vocabulary: Optional[str] = None) -> SkillMatcher:
+        """
+        Extracteur compilé (une seule fois par instance) des compétences de certains domaines, ou de tous
+
+        Si `vocabulary` est fourni et présent dans la taxonomie, seules ses compétences sont
+        recherchées, dans l'ordre du vocabulaire; une taxonomie sans ce vocabulaire (ex. un
+        export ESCO) retombe sur les domaines, hors compétences ambiguës.
+        """
+        if vocabulary not in self.vocabularies:
+            vocabulary = None
+        key = (tuple(domains) if domains is not None and vocabulary is None else None, vocabulary)
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            with self._matchers_lock:
+                matcher = self._matchers.get(key)
+                if matcher is None:
+                    if vocabulary is not None:
+                        skills = self.vocabularies[vocabulary]
+                    else:
+                        skills = [skill for skill in (self.skills if key[0] is None else self.skills_in(key[0]))
+                                  if skill not in self._ambiguous]
+                    skill_set = set(skills)
+                    matcher = self._matchers[key] = SkillMatcher(
+                        skills, {skill: aliases for skill, aliases in self.aliases.items() if skill in skill_set}
+                    )
+        return matcher
+
+
+class TaxonomyLoader:
+    """
+    Fournit la taxonomie courante et la recharge à chaud lorsque son fichier change.
+
+    La date de modification du fichier est vérifiée au plus une fois toutes les
+    `reload_interval` secondes; une taxonomie invalide est ignorée (la version
+    précédente reste en service).
+    """
+
+    def __init__(self, path: str = DEFAULT_TAXONOMY_PATH, reload_interval: float = DEFAULT_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._taxonomy = SkillsTaxonomy.load(path)
+        self._mtime = os.path.getmtime(path)
+        self._checked_at = time.monotonic()
+
+    def get(self) -> SkillsTaxonomy:
+        if self.reload_interval >= 0 and time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload()
+        return self._taxonomy
+
+    def reload(self, force: bool = False) -> SkillsTaxonomy:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+                if force or mtime != self._mtime:
+                    self._taxonomy = SkillsTaxonomy.load(self.path)
+                    self._mtime = mtime
+                    logger.info(f"Taxonomie des compétences rechargée: version {self._taxonomy.version}, "
+                                f"{len(self._taxonomy)} compétences")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Rechargement de la taxonomie ignoré ({self.path}): {e}")
+            return self._taxonomy
+
+
+# Chargeur partagé par les services du processus
+_taxonomy_loader = None
+_taxonomy_loader_lock = threading.Lock()
+
+def get_taxonomy_loader() -> TaxonomyLoader:
+    global _taxonomy_loader
+    with _taxonomy_loader_lock:
+        if _taxonomy_loader is None:
+            _taxonomy_loader = TaxonomyLoader(
+                os.environ.get("SKILLS_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH),
+                float(os.environ.get("SKILLS_TAXONOMY_RELOAD_INTERVAL", DEFAULT_RELOAD_INTERVAL))
+            )
+    return _taxonomy_loader
+
+def get_skills_taxonomy() -> SkillsTaxonomy:
+    """
+    Taxonomie courante (rechargée si son fichier a changé)
+    """
+    return get_taxonomy_loader().get()
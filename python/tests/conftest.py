@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Rendre importables les modules du répertoire python/ et de l'analyse des écarts
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PYTHON_DIR)
+sys.path.insert(0, os.path.join(PYTHON_DIR, "skill_gap"))
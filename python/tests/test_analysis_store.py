@@ -0,0 +1,117 @@
+import json
+
+import numpy as np
+import pytest
+
+from analysis_store import (JsonFileAnalysisStore, SQLiteAnalysisStore, create_analysis_store,
+                            migrate_json_directory)
+
+
+def _analysis(name, embedding=None):
+    analysis = {"personal_info": {"name": name}, "skills": ["Python", "SQL"], "match_score": 72.5}
+    if embedding is not None:
+        analysis["embedding"] = embedding
+    return analysis
+
+
+@pytest.fixture(params=["sqlite", "json"])
+def store(request, tmp_path):
+    path = tmp_path / ("cv_analysis.sqlite3" if request.param == "sqlite" else "cv_analysis")
+    return create_analysis_store(request.param, str(path))
+
+
+def test_round_trip(store):
+    store.put("cv-1", _analysis("Alice", np.array([[0.25, -0.5, 1.0]], dtype=np.float32)))
+    store.put("cv-2", _analysis("Bob"))
+
+    analysis = store.get("cv-1")
+    assert analysis["personal_info"] == {"name": "Alice"}
+    assert analysis["skills"] == ["Python", "SQL"]
+    # L'embedding est relu en float16, forme (1, dim)
+    assert analysis["embedding"].shape == (1, 3)
+    assert np.allclose(analysis["embedding"], [[0.25, -0.5, 1.0]])
+    assert np.allclose(store.get_embedding("cv-1"), [[0.25, -0.5, 1.0]])
+
+    assert "embedding" not in store.get("cv-2")
+    assert store.get_embedding("cv-2") is None
+    assert store.get("cv-3") is None
+    assert "cv-1" in store and "cv-3" not in store
+    assert len(store) == 2
+    assert sorted(store.iter_ids()) == ["cv-1", "cv-2"]
+
+
+def test_put_replaces_and_delete_removes(store):
+    store.put("cv-1", _analysis("Alice", np.ones((1, 3))))
+    store.put("cv-1", _analysis("Alicia"))
+
+    assert store.get("cv-1")["personal_info"]["name"] == "Alicia"
+    assert store.get_embedding("cv-1") is None
+
+    assert store.delete("cv-1") is True
+    assert store.delete("cv-1") is False
+    assert store.get("cv-1") is None
+    assert len(store) == 0
+
+
+def test_caller_analysis_is_not_modified(store):
+    analysis = _analysis("Alice", np.ones((1, 3)))
+    store.put("cv-1", analysis)
+    assert "embedding" in analysis
+
+
+def test_sqlite_store_adds_embedding_column_to_old_databases(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE analyses (cv_id TEXT PRIMARY KEY, data BLOB NOT NULL,"
+                       " updated_at REAL NOT NULL) WITHOUT ROWID")
+    connection.commit()
+    connection.close()
+
+    store = SQLiteAnalysisStore(path)
+    store.put("cv-1", _analysis("Alice", np.ones((1, 2))))
+    assert np.allclose(store.get_embedding("cv-1"), 1)
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_analysis_store("redis", str(tmp_path))
+
+
+def test_migrate_json_directory(tmp_path):
+    source = JsonFileAnalysisStore(str(tmp_path / "cv_analysis"))
+    for i in range(5):
+        source.put(f"cv-{i}", _analysis(f"Candidat {i}", [[float(i), 0.5]]))
+    (tmp_path / "cv_analysis" / "broken.json").write_text("{pas du json", encoding="utf-8")
+
+    target = SQLiteAnalysisStore(str(tmp_path / "cv_analysis.sqlite3"))
+    summary = migrate_json_directory(target, source.directory, batch_size=2)
+
+    assert summary == {"migrated": 5, "failed": 1}
+    assert sorted(target.iter_ids()) == [f"cv-{i}" for i in range(5)]
+    assert target.get("cv-3")["personal_info"]["name"] == "Candidat 3"
+    assert np.allclose(target.get_embedding("cv-3"), [[3.0, 0.5]])
+
+    # Relancer la migration remplace les analyses sans les dupliquer
+    assert migrate_json_directory(target, source.directory)["migrated"] == 5
+    assert len(target) == 5
+
+
+def test_migrate_json_directory_with_remove(tmp_path):
+    source_dir = tmp_path / "cv_analysis"
+    source_dir.mkdir()
+    for i in range(3):
+        (source_dir / f"cv-{i}.json").write_text(json.dumps(_analysis(f"Candidat {i}")), encoding="utf-8")
+
+    target = SQLiteAnalysisStore(str(tmp_path / "cv_analysis.sqlite3"))
+    summary = migrate_json_directory(target, str(source_dir), remove=True)
+
+    assert summary == {"migrated": 3, "failed": 0}
+    assert list(source_dir.iterdir()) == []
+    assert len(target) == 3
+
+
+def test_migrate_missing_directory(tmp_path):
+    target = SQLiteAnalysisStore(str(tmp_path / "cv_analysis.sqlite3"))
+    assert migrate_json_directory(target, str(tmp_path / "absent")) == {"migrated": 0, "failed": 0}
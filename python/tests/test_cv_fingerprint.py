@@ -0,0 +1,158 @@
+import pytest
+
+import analysis_store
+from analysis_store import JsonFileAnalysisStore, SQLiteAnalysisStore
+from cv_fingerprint import (NEAR_DUPLICATE_DISTANCE, SIMHASH_BANDS, CVDeduplicator, fingerprint,
+                            hamming_distance, simhash, simhash_bands)
+
+CV_TEXT = """Alice Martin
+alice.martin@example.com
+Développeuse Python depuis 2015 chez Acme, puis lead data engineer chez Globex.
+Compétences: Python, SQL, Docker, Kubernetes, AWS, Machine Learning, Django, Flask.
+Formation: Master en informatique, Université de Lyon, 2014.
+Langues: français, anglais courant, espagnol lu.
+Projets: plateforme de recommandation, pipeline de données temps réel, API de scoring.
+"""
+CV_TEXT += "\n".join(f"Mission {i}: conception et maintenance du module {i} pour le client {i * 7}."
+                    for i in range(40))
+
+
+def _near_copy(text):
+    # Même CV avec une coordonnée modifiée
+    return text.replace("alice.martin@example.com", "a.martin@example.org")
+
+
+def test_fingerprint_ignores_case_and_whitespace():
+    assert fingerprint(CV_TEXT) == fingerprint("  " + CV_TEXT.upper().replace("\n", "   "))
+    assert fingerprint(CV_TEXT) != fingerprint(_near_copy(CV_TEXT))
+
+
+def test_simhash_of_near_copy_is_close():
+    assert simhash(CV_TEXT) == simhash(CV_TEXT.upper())
+    assert hamming_distance(simhash(CV_TEXT), simhash(_near_copy(CV_TEXT))) <= NEAR_DUPLICATE_DISTANCE
+    assert hamming_distance(simhash(CV_TEXT), simhash("Bob Durand, comptable, Excel, SAP, 20 ans d'expérience")) > \
+        NEAR_DUPLICATE_DISTANCE
+    assert simhash("") == 0
+
+
+def test_close_simhashes_share_a_band():
+    value = simhash(CV_TEXT)
+    assert len(simhash_bands(value)) == SIMHASH_BANDS
+    # Au plus NEAR_DUPLICATE_DISTANCE bits modifiés: au moins une bande intacte
+    for bits in ((0, 17, 33), (1, 2, 3), (15, 31, 63)):
+        other = value
+        for bit in bits:
+            other ^= 1 << bit
+        assert set(simhash_bands(value)) & set(simhash_bands(other))
+
+
+def _analysis(text, name):
+    return {"structured_info": {"name": name}, "fingerprint": fingerprint(text), "simhash": format(simhash(text), "016x")}
+
+
+@pytest.fixture(params=["sqlite", "lmdb", "json"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteAnalysisStore(str(tmp_path / "cv_analysis.sqlite3"))
+    if request.param == "lmdb":
+        pytest.importorskip("lmdb")
+        return analysis_store.LMDBAnalysisStore(str(tmp_path / "cv_analysis.lmdb"), map_size=64 * 1024 ** 2)
+    return JsonFileAnalysisStore(str(tmp_path / "cv_analysis"))
+
+
+def test_store_indexes_fingerprints(store):
+    store.put("cv-1", _analysis(CV_TEXT, "Alice"))
+    deduplicator = CVDeduplicator(store)
+
+    assert deduplicator.lookup_exact(fingerprint(CV_TEXT)) == "cv-1"
+    assert deduplicator.lookup_exact(fingerprint(_near_copy(CV_TEXT))) is None
+    assert deduplicator.lookup_near(simhash(_near_copy(CV_TEXT))) == ("cv-1", fingerprint(CV_TEXT))
+    assert deduplicator.lookup_near(simhash(CV_TEXT), exclude_fingerprint=fingerprint(CV_TEXT)) is None
+    assert deduplicator.lookup_near(simhash("Bob Durand, comptable, Excel, SAP")) is None
+
+
+def test_replaced_and_deleted_analyses_leave_the_index(store):
+    store.put("cv-1", _analysis(CV_TEXT, "Alice"))
+    store.put("cv-1", {"structured_info": {"name": "Alice"}})
+    deduplicator = CVDeduplicator(store)
+    assert deduplicator.lookup_exact(fingerprint(CV_TEXT)) is None
+    assert deduplicator.lookup_near(simhash(CV_TEXT)) is None
+
+    store.put("cv-2", _analysis(CV_TEXT, "Alice"))
+    assert store.delete("cv-2")
+    assert deduplicator.lookup_exact(fingerprint(CV_TEXT)) is None
+    assert deduplicator.lookup_near(simhash(CV_TEXT)) is None
+
+
+def test_index_is_shared_through_the_database(tmp_path):
+    path = str(tmp_path / "cv_analysis.sqlite3")
+    SQLiteAnalysisStore(path).put("cv-1", _analysis(CV_TEXT, "Alice"))
+
+    # Autre processus ou redémarrage: nouvelle connexion sur la même base
+    assert CVDeduplicator(SQLiteAnalysisStore(path)).lookup_exact(fingerprint(CV_TEXT)) == "cv-1"
+
+
+def test_existing_analyses_are_indexed_on_upgrade(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "cv_analysis.sqlite3")
+    SQLiteAnalysisStore(path).put("cv-1", _analysis(CV_TEXT, "Alice"))
+    connection = sqlite3.connect(path)
+    connection.execute("DROP TABLE fingerprints")
+    connection.execute("DROP TABLE simhash_bands")
+    connection.commit()
+    connection.close()
+
+    assert SQLiteAnalysisStore(path).find_fingerprint(fingerprint(CV_TEXT)) == "cv-1"
+
+
+def test_scores_are_kept_per_fingerprint_and_job(store):
+    deduplicator = CVDeduplicator(store, capacity=2)
+    deduplicator.put_score("a", "offre Python", 0.9)
+    deduplicator.put_score("b", "offre Python", 0.4)
+
+    assert deduplicator.get_score("a", "offre  python") == 0.9
+    assert deduplicator.get_score("a", "offre Java") is None
+
+    deduplicator.put_score("c", "offre Python", 0.7)
+    assert deduplicator.get_score("b", "offre Python") is None
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    import cv_parser_service
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(analysis_store, "_analysis_store",
+                        SQLiteAnalysisStore(str(tmp_path / "cv_analysis.sqlite3")))
+    service = cv_parser_service.CVParserService()
+    if service.parser is not None:
+        pytest.skip("le test utilise l'analyse simulée")
+    return service
+
+
+def test_exact_duplicate_reuses_the_stored_analysis(service):
+    first = service.parse_and_save("cv-1", CV_TEXT, "Poste Python et SQL")
+    assert "duplicate_of" not in first
+
+    second = service.parse_and_save("cv-2", CV_TEXT.upper(), "Poste Python et SQL")
+    assert second["duplicate_of"] == "cv-1"
+    assert second["duplicate"] == "exact"
+    assert second["match_score"] == first["match_score"]
+    assert service.get_analysis("cv-2")["duplicate_of"] == "cv-1"
+
+
+def test_near_duplicate_is_flagged_and_parsed_again(service):
+    service.parse_and_save("cv-1", CV_TEXT, "Poste Python")
+    near_text = _near_copy(CV_TEXT)
+
+    result = service.parse_and_save("cv-2", near_text, "Poste Python")
+
+    assert result["near_duplicate_of"] == "cv-1"
+    assert "duplicate_of" not in result
+    assert result["structured_info"]["email"] == "a.martin@example.org"
+    assert result["fingerprint"] == fingerprint(near_text)
+    # Chaque CV garde sa propre analyse, sous son propre identifiant
+    assert service.get_analysis("cv-2")["structured_info"]["email"] == "a.martin@example.org"
+    assert service.get_analysis("cv-1")["structured_info"]["email"] == "alice.martin@example.com"
+    assert service.deduplicator.lookup_exact(fingerprint(near_text)) == "cv-2"
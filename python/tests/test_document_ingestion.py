@@ -0,0 +1,52 @@
+import io
+import zipfile
+
+import pytest
+
+import document_ingestion
+from document_ingestion import UnsupportedDocumentError, extract_text
+
+DOCUMENT_XML = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                '<w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>')
+
+
+def _docx(document_xml):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+    return buffer.getvalue()
+
+
+def test_docx_text_is_extracted():
+    text, info = extract_text(io.BytesIO(_docx(DOCUMENT_XML.format(text="Développeur Python"))), "cv.docx")
+    assert text == "Développeur Python"
+    assert info["format"] == "docx" and info["pages"] == 1
+
+
+@pytest.mark.parametrize("content", [
+    _docx(DOCUMENT_XML.format(text="Développeur Python")[:-30]),
+    _docx("<w:document><w:body>"),
+    b"PK\x03\x04 archive tronquee",
+])
+def test_corrupt_docx_is_rejected(content):
+    with pytest.raises(UnsupportedDocumentError):
+        extract_text(io.BytesIO(content), "cv.docx")
+
+
+def test_corrupt_pdf_is_rejected():
+    if not (document_ingestion.PYPDF_INSTALLED or document_ingestion.PDFMINER_INSTALLED):
+        pytest.skip("aucun extracteur PDF installé")
+    with pytest.raises(UnsupportedDocumentError):
+        extract_text(io.BytesIO(b"%PDF-1.4\n1 0 obj << /Type /Catalog corrompu"), "cv.pdf")
+
+
+def test_corrupt_file_does_not_abort_the_batch(tmp_path):
+    cv_parser_service = pytest.importorskip("cv_parser_service")
+    (tmp_path / "a.docx").write_bytes(_docx("<w:document><w:body>"))
+    (tmp_path / "b.txt").write_text("Développeur Python", encoding="utf-8")
+
+    items = list(cv_parser_service.iter_cv_directory(str(tmp_path)))
+
+    assert [item["cv_id"] for item in items] == ["a", "b"]
+    assert "illisible" in items[0]["error"]
+    assert items[1]["cv_text"] == "Développeur Python"
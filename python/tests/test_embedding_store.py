@@ -0,0 +1,108 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from embedding_store import DEFAULT_TOKEN_BUDGET, EmbeddingStore, embedding_model_key, parser_embedding_key
+
+
+def _vector(value, dim=4):
+    return np.full(dim, value, dtype=np.float32)
+
+
+def test_put_get_round_trip(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dim=4, capacity=10)
+    store.put("Développeur  Python", "model", _vector(0.5))
+
+    # Le texte est normalisé avant hachage (espaces compactés)
+    assert np.allclose(store.get("Développeur Python", "model"), 0.5)
+    assert store.get("Développeur Python", "autre-modèle") is None
+    assert store.get("Data scientist", "model") is None
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dim=4)
+    with pytest.raises(ValueError):
+        store.put("texte", "model", np.zeros(3))
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dim=4, capacity=2, touch_interval=0)
+    store.put("a", "model", _vector(1))
+    store.put("b", "model", _vector(2))
+    # Lire "a" le rend plus récent que "b"
+    assert store.get("a", "model") is not None
+
+    store.put("c", "model", _vector(3))
+
+    assert len(store) == 2
+    assert store.get("b", "model") is None
+    assert np.allclose(store.get("a", "model"), 1)
+    assert np.allclose(store.get("c", "model"), 3)
+
+
+def test_get_or_compute_only_computes_missing_texts(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dim=4)
+    store.put("a", "model", _vector(1))
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return np.stack([_vector(10 + i) for i in range(len(texts))])
+
+    embeddings = store.get_or_compute(["a", "b", "c"], "model", compute)
+
+    assert calls == [["b", "c"]]
+    assert np.allclose(embeddings[:, 0], [1, 10, 11])
+    assert np.allclose(store.get("c", "model"), 11)
+
+
+def test_reopened_store_keeps_entries_and_dimension(tmp_path):
+    EmbeddingStore(str(tmp_path), dim=4).put("a", "model", _vector(1))
+
+    reopened = EmbeddingStore(str(tmp_path), dim=768)
+
+    assert reopened.dim == 4
+    assert np.allclose(reopened.get("a", "model"), 1)
+
+
+def _write_entries(directory, prefix, count):
+    store = EmbeddingStore(directory, dim=4, capacity=1000)
+    for i in range(count):
+        store.put(f"{prefix}-{i}", "model", _vector(i if prefix == "p" else -i))
+
+
+def test_concurrent_processes_never_mix_vectors(tmp_path):
+    EmbeddingStore(str(tmp_path), dim=4, capacity=1000)
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_write_entries, args=(str(tmp_path), prefix, 50)) for prefix in ("p", "n")]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    store = EmbeddingStore(str(tmp_path), dim=4, capacity=1000)
+    assert len(store) == 100
+    for i in range(50):
+        assert np.allclose(store.get(f"p-{i}", "model"), i)
+        assert np.allclose(store.get(f"n-{i}", "model"), -i)
+
+
+def test_model_key_defaults_follow_process_configuration(monkeypatch):
+    monkeypatch.delenv("SEMANTIC_MATCHER_ENCODER", raising=False)
+    monkeypatch.delenv("SEMANTIC_MATCHER_POOLING", raising=False)
+    assert embedding_model_key("camembert-base") == "camembert-base+torch:chunked-mean"
+    assert embedding_model_key("camembert-base", token_budget=DEFAULT_TOKEN_BUDGET) == "camembert-base+torch:chunked-mean"
+    assert embedding_model_key("camembert-base", "int8", "attention", 256) == "camembert-base+int8:chunked-attention@256"
+
+    # Les valeurs omises suivent la configuration du matcher
+    monkeypatch.setenv("SEMANTIC_MATCHER_ENCODER", "onnx")
+    assert embedding_model_key("camembert-base") == embedding_model_key("camembert-base", "onnx", "mean")
+
+
+def test_parser_vectors_never_share_the_matcher_key():
+    # Les vecteurs du parser de CV ne sont jamais servis comme embeddings du matcher
+    for backend in ("torch", "int8", "onnx"):
+        for pooling in ("mean", "attention"):
+            assert parser_embedding_key("camembert-base") != embedding_model_key("camembert-base", backend, pooling)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from experience_parser import (EXPERIENCE_CACHE_KEY, cached_experience_years, experience_arrays,
+                               experience_years, parse_period, score_experience)
+
+
+def test_parse_period():
+    assert parse_period("2015 - 2019") == (2015, 2019)
+    assert parse_period("2018 - présent", current_year=2026) == (2018, 2026)
+    assert parse_period("2020") == (2020, 2021)
+    assert parse_period("2019 - 2015") == (2019, 2019)
+    assert parse_period("stage d'été") is None
+
+
+def test_experience_years_does_not_modify_the_record():
+    record = {"experience": [{"period": "2015 - 2019"}, {"period": "2020 à aujourd'hui"}]}
+    snapshot = {"experience": [dict(exp) for exp in record["experience"]]}
+
+    assert experience_years(record, current_year=2026) == 10
+    assert record == snapshot
+
+
+def test_cached_years_follow_experience_changes_and_year():
+    metadata = {"experience": [{"period": "2018 - présent"}]}
+
+    assert cached_experience_years(metadata, current_year=2025) == 7
+    assert EXPERIENCE_CACHE_KEY in metadata
+    # Nouvelle année: la fin "présent" avance
+    assert cached_experience_years(metadata, current_year=2026) == 8
+    # Expériences modifiées: le cache est recalculé
+    metadata["experience"].append({"period": "2010 - 2012"})
+    assert cached_experience_years(metadata, current_year=2026) == 10
+
+
+def test_experience_arrays_only_caches_when_asked():
+    records = [{"experience": [{"period": "2015 - 2020"}]}, {"experience": []}]
+
+    years, has_experience = experience_arrays(records, current_year=2026)
+    assert years.tolist() == [5, 0] and has_experience.tolist() == [True, False]
+    assert all(EXPERIENCE_CACHE_KEY not in record for record in records)
+
+    experience_arrays(records, current_year=2026, cache=True)
+    assert all(EXPERIENCE_CACHE_KEY in record for record in records)
+
+
+def test_score_experience():
+    scores = score_experience(np.array([1, 3, 4, 10, 2]), np.array([True, True, True, True, False]), 3, 5)
+    assert np.allclose(scores, [1 / 3 * 0.7, 0.8, 0.9, 0.9, 0.3])
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from parse_jobs import DONE, FAILED, ParseJobManager, ParseJobQueueFull
+
+
+class _Service:
+    """
+    Service d'analyse minimal: bloque jusqu'à `release`, échoue sur un CV vide
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.saved = {}
+
+    def quick_extract(self, cv_text):
+        return {"skills": []}
+
+    def parse_and_save(self, cv_id, cv_text, job_description=None):
+        self.release.wait(5)
+        if not cv_text:
+            raise ValueError("CV vide")
+        self.saved[cv_id] = cv_text
+
+
+def test_failed_job_reports_its_error():
+    service = _Service()
+    service.release.set()
+    manager = ParseJobManager(service, workers=1)
+
+    cv_id = manager.submit("")
+    manager.get(cv_id).future.result(5)
+
+    job = manager.get(cv_id).to_dict()
+    assert job["status"] == FAILED
+    assert job["error"] == "CV vide"
+    manager.shutdown()
+
+
+def test_submissions_beyond_max_pending_are_rejected():
+    service = _Service()
+    manager = ParseJobManager(service, workers=1, max_pending=2)
+
+    first = manager.submit("CV 1")
+    manager.submit("CV 2")
+    with pytest.raises(ParseJobQueueFull):
+        manager.submit("CV 3")
+
+    # Les places se libèrent quand les tâches se terminent
+    service.release.set()
+    manager.shutdown()
+    assert manager.get(first).status == DONE
+    manager.submit("CV 4")
+    manager.shutdown()
+    assert len(service.saved) == 3
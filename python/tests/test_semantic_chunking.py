@@ -0,0 +1,48 @@
+import pytest
+
+# Le matcher sémantique importe torch et scikit-learn au chargement
+pytest.importorskip("torch")
+pytest.importorskip("sklearn")
+
+from semantic_matcher import SemanticMatcher
+
+
+class WhitespaceTokenizer:
+    """
+    Tokenizer minimal: un token par mot
+    """
+    model_max_length = 512
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [text.split() for text in texts]}
+
+
+def _matcher():
+    return SemanticMatcher.__new__(SemanticMatcher)
+
+
+def test_budget_smaller_than_one_window_is_applied():
+    text = ". ".join(f"phrase {i} avec cinq mots" for i in range(100)) + "."
+
+    chunks = _matcher()._chunk_text(text, WhitespaceTokenizer(), token_budget=20)
+
+    assert sum(n_tokens for _, n_tokens in chunks) <= 20
+    assert chunks[0][0].startswith("phrase 0")
+
+
+def test_long_sentence_is_split_to_fit_the_budget():
+    text = " ".join(f"mot{i}" for i in range(1000))
+
+    chunks = _matcher()._chunk_text(text, WhitespaceTokenizer(), token_budget=50)
+
+    assert chunks and all(n_tokens <= 50 for _, n_tokens in chunks)
+    assert sum(n_tokens for _, n_tokens in chunks) <= 50
+
+
+def test_windows_overlap_within_the_budget():
+    text = ". ".join(f"phrase {i} avec cinq mots" for i in range(300)) + "."
+
+    chunks = _matcher()._chunk_text(text, WhitespaceTokenizer(), token_budget=1200)
+
+    assert len(chunks) >= 2
+    assert all(n_tokens <= 510 for _, n_tokens in chunks)
@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("flask")
+
+import semantic_matcher_server
+from semantic_matcher_server import parse_bool
+
+
+@pytest.mark.parametrize("value, expected", [(True, True), (False, False), ("true", True), ("False", False),
+                                             ("1", True), ("0", False), (1, True), (0, False)])
+def test_parse_bool_accepts_strict_values(value, expected):
+    assert parse_bool(value) is expected
+
+
+@pytest.mark.parametrize("value", ["yes", "", "no", None, 2, [], "vrai"])
+def test_parse_bool_rejects_anything_else(value):
+    with pytest.raises(ValueError):
+        parse_bool(value)
+
+
+@pytest.mark.parametrize("approximate", ["peut-être", 3, None])
+def test_top_k_rejects_invalid_approximate(approximate):
+    client = semantic_matcher_server.app.test_client()
+    response = client.post("/match/top-k", json={"job_description": "Développeur Python", "approximate": approximate})
+    assert response.status_code == 400
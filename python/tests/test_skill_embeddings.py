@@ -0,0 +1,71 @@
+import logging
+
+import numpy as np
+import pytest
+
+from skill_embeddings import SIMULATED_MODEL, SkillEmbeddingIndex, build_skill_embeddings
+
+
+def _encode(texts):
+    # Encodeur déterministe: "Python" et "Django" proches, les autres orthogonales
+    vectors = np.zeros((len(texts), 4), dtype=np.float32)
+    for i, text in enumerate(texts):
+        vectors[i, 0 if text in ("Python", "Django") else 1 + i % 3] = 1.0
+        if text == "Django":
+            vectors[i, 1] = 0.2
+    return vectors
+
+
+def test_build_and_load_round_trip(tmp_path):
+    built = build_skill_embeddings(["Python", "SQL", "Python"], str(tmp_path), _encode, "test-model", "abc123")
+    loaded = SkillEmbeddingIndex.load(str(tmp_path))
+
+    assert len(loaded) == 2
+    assert loaded.model == "test-model" and loaded.is_semantic
+    assert loaded.taxonomy_fingerprint == "abc123"
+    assert "python" in loaded and "Rust" not in loaded
+    assert np.isclose(np.linalg.norm(loaded.vector("Python")), 1.0)
+    assert loaded.similarity("Python", "Rust") is None
+    assert built.rows == loaded.rows
+
+
+def test_simulated_build_records_no_semantics(tmp_path):
+    index = build_skill_embeddings(["Python", "SQL"], str(tmp_path))
+    assert index.model == SIMULATED_MODEL and not index.is_semantic
+    assert index.taxonomy_fingerprint is None
+    assert SkillEmbeddingIndex.load(str(tmp_path / "absent")) is None
+
+
+@pytest.fixture
+def analyzer_class(monkeypatch):
+    pytest.importorskip("pandas")
+    import skill_gap_analyzer
+
+    def build(embeddings):
+        monkeypatch.setattr(skill_gap_analyzer, "get_skill_embedding_index", lambda: embeddings)
+        return skill_gap_analyzer.SkillGapAnalyzer()
+    return build
+
+
+def test_missing_skills_only_fall_back_for_their_rows(tmp_path, analyzer_class, caplog):
+    import skill_gap_analyzer
+    from skills_taxonomy import get_skills_taxonomy
+
+    taxonomy = get_skills_taxonomy()
+    # Embeddings construits avant l'ajout de "SQL" à la taxonomie
+    skills = [skill for skill in taxonomy.skills if skill != "SQL"]
+    embeddings = build_skill_embeddings(skills, str(tmp_path), _encode, "test-model", "old-taxonomy")
+
+    with caplog.at_level(logging.WARNING, logger=skill_gap_analyzer.logger.name):
+        analyzer = analyzer_class(embeddings)
+    assert "autre taxonomie" in caplog.text
+    assert "1 compétences sans embedding" in caplog.text
+
+    python_id, django_id = analyzer.skill_index["Python"], analyzer.skill_index["Django"]
+    expected = float(np.dot(embeddings.vector("Python"), embeddings.vector("Django")))
+    # Les compétences connues gardent leur similarité cosinus
+    assert np.isclose(analyzer.similarity_matrix[python_id, django_id], expected)
+
+    sql_id = analyzer.skill_index["SQL"]
+    assert analyzer.similarity_matrix[sql_id, sql_id] == 1.0
+    assert analyzer.similarity_matrix[sql_id, python_id] == skill_gap_analyzer.DEFAULT_SKILL_SIMILARITY
@@ -0,0 +1,140 @@
+import dataclasses
+import io
+import json
+
+import numpy as np
+
+import pytest
+
+pytest.importorskip("pandas")
+
+import skill_gap_analyzer
+
+JOB = "Poste de développeur Python avec SQL et Docker, Kubernetes requis"
+RESUMES = {"c1": "Développeur Python, SQL, Docker", "c2": "Comptable, Excel", "c3": "Administrateur Kubernetes"}
+
+
+@pytest.fixture
+def analyzer():
+    return skill_gap_analyzer.SkillGapAnalyzer()
+
+
+def test_job_profile_is_reused_for_the_same_description(analyzer):
+    profile = analyzer.get_job_profile(JOB)
+
+    assert analyzer.get_job_profile(JOB) is profile
+    assert analyzer.get_job_profile(profile) is profile
+    assert analyzer.get_job_profile(JOB + " ") is not profile
+
+
+def test_job_profile_cache_evicts_the_least_recently_used(analyzer, monkeypatch):
+    monkeypatch.setattr(skill_gap_analyzer, "JOB_PROFILE_CACHE_SIZE", 2)
+    first = analyzer.get_job_profile("Poste Python")
+    second = analyzer.get_job_profile("Poste SQL")
+
+    # Relire le premier profil le rend plus récent que le second
+    assert analyzer.get_job_profile("Poste Python") is first
+    analyzer.get_job_profile("Poste Docker")
+
+    assert len(analyzer._job_profiles) == 2
+    assert analyzer.get_job_profile("Poste Python") is first
+    assert analyzer.get_job_profile("Poste SQL") is not second
+
+
+def test_profile_from_another_taxonomy_is_recomputed(analyzer):
+    profile = analyzer.get_job_profile(JOB)
+    stale = dataclasses.replace(profile, skills=["Compétence retirée"], taxonomy_fingerprint="ancienne-taxonomie")
+
+    refreshed = analyzer.get_job_profile(stale)
+
+    assert refreshed is profile
+    assert refreshed.taxonomy_fingerprint == analyzer.taxonomy.fingerprint
+    analysis = analyzer.analyze_skill_gap(RESUMES["c1"], stale)
+    assert analysis["job_skills_count"] == len(profile.skills)
+    assert all(skill["skill"] != "Compétence retirée" for skill in analysis["missing_skills"])
+
+
+def test_comparison_analyzes_the_job_once(analyzer, monkeypatch):
+    calls = []
+    extract = analyzer._extract_skills_from_text
+    monkeypatch.setattr(analyzer, "_extract_skills_from_text", lambda text: calls.append(text) or extract(text))
+
+    result = analyzer.compare_candidates_for_job(RESUMES, JOB)
+
+    assert calls.count(JOB) == 1
+    assert len(calls) == 1 + len(RESUMES)
+    assert result["candidate_count"] == len(RESUMES)
+
+
+def _pairwise_similarities(analyzer, job_skills, job_ids, candidate_skills, candidate_ids):
+    # Chemin de référence: une similarité calculée par paire, sans la matrice précalculée
+    return np.array([[analyzer._calculate_skill_similarity(job_skill, candidate_skill)
+                      for candidate_skill in candidate_skills]
+                     for job_skill in job_skills]).reshape(len(job_skills), len(candidate_skills))
+
+
+def test_similarity_matrix_matches_pairwise_similarities(analyzer):
+    names = analyzer.skill_names
+    for i, skill1 in enumerate(names):
+        for j, skill2 in enumerate(names):
+            assert analyzer.similarity_matrix[i, j] == pytest.approx(analyzer._calculate_skill_similarity(skill1, skill2))
+
+
+@pytest.mark.parametrize("job_skills, candidate_skills", [
+    (["Python", "SQL", "Docker"], ["Python", "Django", "Excel"]),
+    (["Python", "Cobol maison"], ["Django", "Cobol maison"]),
+    (["Python", "SQL"], ["Langage interne"]),
+    (["Python", "SQL"], []),
+    ([], ["Python", "Excel"]),
+    ([], []),
+])
+def test_skill_gap_matches_the_pairwise_path(analyzer, monkeypatch, job_skills, candidate_skills):
+    profile = analyzer.get_job_profile(JOB)
+    profile = dataclasses.replace(profile, skills=job_skills, skill_ids=analyzer._skill_ids(job_skills),
+                                  importances={skill: 0.5 + 0.1 * i for i, skill in enumerate(job_skills)},
+                                  critical_skills=job_skills[:1])
+    monkeypatch.setattr(analyzer, "_extract_skills_from_text", lambda text: list(candidate_skills))
+
+    result = analyzer.analyze_skill_gap(RESUMES["c1"], profile)
+    monkeypatch.setattr(analyzer, "_similarity_submatrix",
+                        lambda *args: _pairwise_similarities(analyzer, *args))
+    expected = analyzer.analyze_skill_gap(RESUMES["c1"], profile)
+
+    result.pop("timestamp"), expected.pop("timestamp")
+    assert result == expected
+
+
+def _many_resumes():
+    profiles = ["Développeur Python, SQL, Docker", "Comptable, Excel", "Administrateur Kubernetes, Docker",
+                "Data scientist Python, Machine Learning", "Développeur Java"]
+    return {f"c{i}": profiles[i % len(profiles)] + f" (profil {i})" for i in range(12)}
+
+
+def test_parallel_comparison_ranks_like_the_serial_path(analyzer):
+    resumes = _many_resumes()
+
+    serial = analyzer.compare_candidates_for_job(resumes, JOB)
+    parallel = analyzer.compare_candidates_for_job(resumes, JOB, workers=2)
+
+    assert parallel["ranked_candidates"] == serial["ranked_candidates"]
+    assert list(parallel["detailed_analyses"]) == list(resumes)
+    assert set(dict(analyzer.iter_candidate_analyses(resumes.items(), JOB, workers=2, chunk_size=3))) == set(resumes)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stream_keeps_the_top_n_and_writes_every_analysis(analyzer, workers):
+    resumes = _many_resumes()
+    sink = io.StringIO()
+
+    events = list(analyzer.compare_candidates_stream(resumes.items(), JOB, top_n=3, workers=workers,
+                                                     chunk_size=5, sink=sink))
+
+    expected = analyzer.compare_candidates_for_job(resumes, JOB)["ranked_candidates"][:3]
+    assert [event["event"] for event in events] == ["progress", "progress", "done"]
+    assert [event["processed"] for event in events[:-1]] == [5, 10]
+    assert all(len(event["ranked_candidates"]) <= 3 for event in events)
+    assert events[-1]["candidate_count"] == len(resumes)
+    assert events[-1]["ranked_candidates"] == expected
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert sorted(line["candidate_id"] for line in lines) == sorted(resumes)
@@ -0,0 +1,71 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("flask")
+
+import skill_gap_server
+
+JOB = "Poste de développeur Python avec SQL et Docker"
+RESUMES = {"c1": "Développeur Python, SQL, Docker", "c2": "Comptable, Excel"}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_gap_server, "COMPARISON_ANALYSES_DIR", str(tmp_path))
+    return skill_gap_server.app.test_client()
+
+
+@pytest.mark.parametrize("query", ["top_n=abc", "top_n=0", "top_n=-3", "workers=deux", "workers=0"])
+def test_stream_rejects_invalid_parameters(client, query):
+    response = client.post(f"/compare/stream?{query}", json={"candidate_resumes": RESUMES, "job_description": JOB})
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_compare_rejects_invalid_workers(client):
+    response = client.post("/compare?workers=beaucoup", json={"candidate_resumes": RESUMES, "job_description": JOB})
+    assert response.status_code == 400
+
+
+def test_stream_prunes_expired_analyses(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_gap_server, "COMPARISON_ANALYSES_TTL", 60)
+    expired = tmp_path / "00000000-0000-0000-0000-000000000000.ndjson"
+    expired.write_text("{}\n", encoding="utf-8")
+    os.utime(expired, (time.time() - 120, time.time() - 120))
+
+    response = client.post("/compare/stream?top_n=1&workers=1",
+                           json={"candidate_resumes": RESUMES, "job_description": JOB})
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert response.status_code == 200 and lines
+    assert not expired.exists()
+    comparison_id = skill_gap_server.json.loads(lines[-1])["comparison_id"]
+    assert client.get(f"/compare/{comparison_id}/analyses").status_code == 200
+
+    # Une comparaison expirée n'est plus servie, même avant d'être supprimée
+    monkeypatch.setattr(skill_gap_server, "COMPARISON_ANALYSES_TTL", -1)
+    assert client.get(f"/compare/{comparison_id}/analyses").status_code == 404
+
+
+@pytest.mark.parametrize("budget", [{"timeframe_weeks": -1}, {"hours_per_week": 0}, {"timeframe_weeks": 10 ** 9},
+                                    {"hours_per_week": "dix"}])
+def test_team_plan_rejects_invalid_budget(client, budget):
+    response = client.post("/team-development-plan",
+                           json={"employee_resumes": RESUMES, "job_description": JOB, **budget})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("route", ["/compare", "/compare/stream"])
+@pytest.mark.parametrize("payload", [{"candidate_resumes": ["Développeur Python"], "job_description": JOB},
+                                     {"candidate_resumes": "Développeur Python", "job_description": JOB}])
+def test_compare_rejects_candidates_that_are_not_a_dict(client, route, payload):
+    response = client.post(route, json=payload)
+    assert response.status_code == 400
+    assert "candidate_resumes" in response.get_json()["error"]
+
+
+def test_stream_rejects_a_json_array(client):
+    assert client.post("/compare/stream", json=[RESUMES]).status_code == 400
@@ -0,0 +1,137 @@
+import json
+import os
+
+import pytest
+
+from skills_taxonomy import SkillsTaxonomy, TaxonomyFormatError, TaxonomyLoader
+
+DOCUMENT = {
+    "format_version": 1,
+    "version": "1",
+    "domains": [
+        {"id": "programming", "label": "Programmation", "parent": None, "skills": [
+            "Python",
+            {"name": "Django", "parent": "Python"},
+            {"name": "JavaScript", "aliases": ["JS", "ECMAScript"]}
+        ]},
+        {"id": "data_science", "parent": "programming", "skills": [
+            {"name": "Machine Learning", "aliases": ["ML", "apprentissage automatique"]},
+            {"name": "Deep Learning", "aliases": ["apprentissage profond"], "parent": "Machine Learning"}
+        ]}
+    ]
+}
+
+
+def _write(path, document):
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+
+def test_normalize_resolves_canonical_names_and_aliases():
+    taxonomy = SkillsTaxonomy(DOCUMENT)
+
+    assert taxonomy.normalize("python") == "Python"
+    assert taxonomy.normalize("  JS ") == "JavaScript"
+    assert taxonomy.normalize("Apprentissage Profond") == "Deep Learning"
+    assert taxonomy.normalize("Rust") is None
+    assert "ml" in taxonomy and "Rust" not in taxonomy
+    assert len(taxonomy) == 5
+
+
+def test_hierarchy_lookups():
+    taxonomy = SkillsTaxonomy(DOCUMENT)
+
+    assert taxonomy.domain_of("ecmascript") == "programming"
+    assert taxonomy.parent_of("Django") == "Python"
+    assert taxonomy.ancestors("apprentissage profond") == ["Machine Learning"]
+    assert taxonomy.domain_path("data_science") == ["data_science", "programming"]
+    assert taxonomy.skills_in(["data_science"]) == ["Machine Learning", "Deep Learning"]
+    assert taxonomy.matcher(["data_science"]).extract("Expert ML et apprentissage profond") \
+        == ["Machine Learning", "Deep Learning"]
+
+
+@pytest.mark.parametrize("document", [
+    {**DOCUMENT, "format_version": 2},
+    {**DOCUMENT, "domains": DOCUMENT["domains"] + [{"id": "programming", "skills": []}]},
+    {**DOCUMENT, "domains": [{"id": "x", "skills": ["Python", "python"]}]},
+    {**DOCUMENT, "domains": [{"id": "x", "skills": [{"name": "Django", "parent": "Python"}]}]},
+    {**DOCUMENT, "domains": [{"id": "x", "parent": "absent", "skills": []}]},
+    {**DOCUMENT, "vocabularies": {"cv": ["Python", "Rust"]}},
+])
+def test_invalid_documents_are_rejected(document):
+    with pytest.raises(TaxonomyFormatError):
+        SkillsTaxonomy(document)
+
+
+def test_vocabularies_restrict_extraction_to_their_skills():
+    document = json.loads(json.dumps(DOCUMENT))
+    document["domains"][0]["skills"] += ["Go", {"name": "LESS", "ambiguous": True}]
+    document["vocabularies"] = {"cv": ["ML", "Python", "LESS", "Python"]}
+    taxonomy = SkillsTaxonomy(document)
+    text = "Python et ML, en moins de temps (less is more), go!"
+
+    # Ordre et alias du vocabulaire, compétences ambiguës comprises
+    assert taxonomy.vocabularies["cv"] == ["Machine Learning", "Python", "LESS"]
+    assert taxonomy.matcher(vocabulary="cv").extract(text) == ["Machine Learning", "Python", "LESS"]
+    # Extracteurs par domaine: sans les compétences ambiguës
+    assert taxonomy.is_ambiguous("less") and not taxonomy.is_ambiguous("Go")
+    assert taxonomy.matcher(["programming"]).extract(text) == ["Python", "Go"]
+    # Vocabulaire absent: repli sur les domaines
+    assert taxonomy.matcher(["programming"], vocabulary="absent") is taxonomy.matcher(["programming"])
+
+
+def test_shipped_vocabularies_skip_ambiguous_names():
+    taxonomy = SkillsTaxonomy.load()
+    job = "Poste en R&D, 16 Go de RAM. Chef de projet Swift, base Oracle, esprit d'initiative, data analysis"
+
+    assert taxonomy.matcher(vocabulary="semantic_matcher_job").extract(job) == ["Data Analysis"]
+    assert taxonomy.matcher(vocabulary="interview_key_skills").extract("IA, LESS et Sass") == ["AI", "SASS", "LESS"]
+    assert "LESS" not in taxonomy.matcher().extract("less than 5 years")
+
+
+def test_loader_reloads_a_modified_file(tmp_path):
+    path = tmp_path / "skills_taxonomy.json"
+    _write(path, DOCUMENT)
+    loader = TaxonomyLoader(str(path), reload_interval=0)
+    first = loader.get()
+
+    # Fichier inchangé: même instance
+    assert loader.get() is first
+
+    updated = json.loads(json.dumps(DOCUMENT))
+    updated["version"] = "2"
+    updated["domains"][0]["skills"].append("Rust")
+    _write(path, updated)
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+
+    second = loader.get()
+    assert second is not first
+    assert second.version == "2" and second.normalize("rust") == "Rust"
+    assert second.fingerprint != first.fingerprint
+    # L'ancienne instance n'est pas modifiée
+    assert first.normalize("rust") is None
+
+
+def test_loader_keeps_previous_taxonomy_when_file_is_invalid(tmp_path):
+    path = tmp_path / "skills_taxonomy.json"
+    _write(path, DOCUMENT)
+    loader = TaxonomyLoader(str(path), reload_interval=0)
+    first = loader.get()
+
+    path.write_text("{invalide", encoding="utf-8")
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+    assert loader.get() is first
+
+    assert loader.reload(force=True) is first
+
+
+def test_loader_checks_the_file_at_most_once_per_interval(tmp_path):
+    path = tmp_path / "skills_taxonomy.json"
+    _write(path, DOCUMENT)
+    loader = TaxonomyLoader(str(path), reload_interval=3600)
+    first = loader.get()
+
+    _write(path, {**DOCUMENT, "version": "2"})
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+
+    assert loader.get() is first
+    assert loader.reload().version == "2"
@@ -0,0 +1,72 @@
+import itertools
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+
+import skill_gap_analyzer
+from skill_gap_analyzer import (MAX_TRAINING_HOURS_PER_WEEK, MAX_TRAINING_TIMEFRAME_WEEKS, _batched_knapsack,
+                                validate_training_budget)
+
+
+def _brute_force(weights, values, eligible, capacity):
+    """
+    Meilleure valeur totale d'un sac à dos 0/1, par énumération de tous les sous-ensembles
+    """
+    items = [j for j in range(len(weights)) if eligible[j]]
+    best = 0.0
+    for size in range(len(items) + 1):
+        for subset in itertools.combinations(items, size):
+            if sum(weights[j] for j in subset) <= capacity:
+                best = max(best, sum(values[j] for j in subset))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batched_knapsack_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n_rows, n_items = 6, int(rng.integers(1, 9))
+    weights = rng.integers(0, 12, n_items)
+    values = rng.random(n_items) * 3
+    eligible = rng.random((n_rows, n_items)) < 0.7
+    capacity = int(rng.integers(0, 30))
+
+    selected = _batched_knapsack(weights, values, eligible, capacity)
+
+    for n in range(n_rows):
+        # Sélection admissible: formations éligibles, dans le budget
+        assert not (selected[n] & ~eligible[n]).any()
+        assert weights[selected[n]].sum() <= capacity
+        assert np.isclose(values[selected[n]].sum(), _brute_force(weights, values, eligible[n], capacity))
+
+
+def test_batched_knapsack_rejects_negative_capacity():
+    with pytest.raises(ValueError):
+        _batched_knapsack(np.array([1]), np.array([1.0]), np.ones((1, 1), dtype=bool), -1)
+
+
+@pytest.mark.parametrize("timeframe_weeks, hours_per_week", [
+    (0, 10), (-4, 10), (12, 0), (12, -1), (MAX_TRAINING_TIMEFRAME_WEEKS + 1, 10),
+    (12, MAX_TRAINING_HOURS_PER_WEEK + 1), (10 ** 12, 10), ("12", 10), (True, 10), (float("nan"), 10)
+])
+def test_invalid_training_budget_is_rejected(timeframe_weeks, hours_per_week):
+    with pytest.raises(ValueError):
+        validate_training_budget(timeframe_weeks, hours_per_week)
+
+
+def test_team_plan_stays_within_budget():
+    analyzer = skill_gap_analyzer.SkillGapAnalyzer()
+    job = "Développeur Python senior: Machine Learning, Docker, Kubernetes, AWS et SQL indispensables"
+    resumes = {"e1": "Développeur Java", "e2": "Data scientist Python, SQL", "e3": "Administrateur AWS, Docker"}
+
+    result = analyzer.generate_team_development_plan(resumes, job, timeframe_weeks=6, hours_per_week=5)
+
+    assert result["hours_budget_per_employee"] == 30
+    for plan in result["employee_plans"]:
+        full_trainings = sum(step["duration_weeks"] for step in plan["development_plan"]
+                             if not step["is_partial_training"])
+        assert full_trainings * 5 <= 30 + 1e-9
+
+    with pytest.raises(ValueError):
+        analyzer.generate_team_development_plan(resumes, job, timeframe_weeks=10 ** 9)
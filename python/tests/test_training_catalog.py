@@ -0,0 +1,45 @@
+import json
+import pickle
+
+import pytest
+
+from training_catalog import DEFAULT_LEARNING_TIME_WEEKS, DEVELOPMENT_RESOURCES, TrainingCatalog
+
+
+def test_returned_resources_can_be_modified_without_touching_the_catalog():
+    catalog = TrainingCatalog(["Python"])
+    resources = catalog.development_resources("Python")
+    expected = dict(resources)
+
+    resources["suggestion"] = "modifié"
+    resources.clear()
+
+    assert catalog.development_resources("Python") == expected
+    assert catalog.development_resources("Python") is not catalog.development_resources("Python")
+
+
+def test_stored_bundles_are_read_only():
+    catalog = TrainingCatalog(["Python"])
+    entry = catalog.entry("Python")
+
+    with pytest.raises(TypeError):
+        entry.development_resources["suggestion"] = "modifié"
+    with pytest.raises(TypeError):
+        entry.recommendation_resources["estimated_time"] = "1 week"
+    assert all(not isinstance(value, list) for value in entry.development_resources.values())
+
+
+def test_resources_are_serializable():
+    catalog = TrainingCatalog(["Python", "Compétence inconnue"])
+    for skill in ("Python", "Compétence inconnue", "Hors catalogue"):
+        for resources in (catalog.recommendation_resources(skill), catalog.development_resources(skill)):
+            assert json.loads(json.dumps(resources))
+            assert pickle.loads(pickle.dumps(resources)) == resources
+
+
+def test_unknown_skills_get_generic_resources():
+    catalog = TrainingCatalog()
+    assert "Hors catalogue" not in catalog
+    assert "Hors catalogue" in catalog.development_resources("Hors catalogue")["suggestion"]
+    assert catalog.learning_time_weeks("Hors catalogue") == DEFAULT_LEARNING_TIME_WEEKS
+    assert all(skill in catalog for skill in DEVELOPMENT_RESOURCES)
@@ -0,0 +1,170 @@
+import os
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Bornes des histogrammes de durée (secondes), proches des valeurs par défaut de Prometheus
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# En-tête de réponse détaillant la durée de chaque étape d'une requête
+TIMING_HEADER = "X-Timing"
+
+# Durées (ns) des étapes de la requête en cours; None hors d'une requête instrumentée
+_request_timings: contextvars.ContextVar = contextvars.ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """
+    Histogramme cumulatif de durées, au format des histogrammes Prometheus
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative.append((repr(bound), running))
+        cumulative.append(("+Inf", running + self.counts[-1]))
+        return cumulative
+
+
+class Tracer:
+    """
+    Mesure la durée des étapes d'un service avec des spans (gestionnaires de contexte).
+
+    Chaque span alimente l'histogramme de son étape, exporté au format texte de
+    Prometheus par `render_prometheus()`. Pendant une requête instrumentée
+    (`start_request`), les durées sont aussi cumulées par étape pour l'en-tête `X-Timing`.
+    Le coût d'un span se limite à deux appels à perf_counter_ns et une mise à jour d'histogramme.
+    """
+
+    def __init__(self, namespace: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Histogram] = {}
+        self._requests: Dict[str, Histogram] = {}
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter_ns() - start)
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        """
+        Enregistre la durée d'une étape mesurée par ailleurs
+        """
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(duration_ns / 1e9)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0) + duration_ns
+
+    # Requêtes -------------------------------------------------------------
+
+    def start_request(self) -> contextvars.Token:
+        return _request_timings.set({})
+
+    def finish_request(self, token: contextvars.Token, endpoint: str, duration_ns: int) -> Dict[str, int]:
+        """
+        Termine une requête: enregistre sa durée totale et retourne les durées de ses étapes
+        """
+        timings = _request_timings.get() or {}
+        _request_timings.reset(token)
+        with self._lock:
+            histogram = self._requests.get(endpoint)
+            if histogram is None:
+                histogram = self._requests[endpoint] = Histogram(self.buckets)
+            histogram.observe(duration_ns / 1e9)
+        return timings
+
+    # Export ---------------------------------------------------------------
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            self._render_histograms(lines, f"{self.namespace}_stage_duration_seconds",
+                                    "Durée des étapes du service", "stage", self._stages)
+            self._render_histograms(lines, f"{self.namespace}_request_duration_seconds",
+                                    "Durée des requêtes HTTP par endpoint", "endpoint", self._requests)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histograms(lines: List[str], name: str, description: str, label: str,
+                           histograms: Dict[str, Histogram]) -> None:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} histogram")
+        for value, histogram in sorted(histograms.items()):
+            value = value.replace("\\", "\\\\").replace('"', '\\"')
+            for bound, count in histogram.cumulative_counts():
+                lines.append(f'{name}_bucket{{{label}="{value}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{{label}="{value}"}} {histogram.total}')
+            lines.append(f'{name}_count{{{label}="{value}"}} {histogram.count}')
+
+
+def format_timing_header(timings: Dict[str, int], total_ns: Optional[int] = None) -> str:
+    """
+    Formate les durées des étapes pour l'en-tête X-Timing ("parse;dur=12.3, save;dur=0.8")
+
+    Les durées sont en millisecondes, comme dans l'en-tête standard Server-Timing.
+    """
+    parts = [f"{stage};dur={duration_ns / 1e6:.2f}" for stage, duration_ns in timings.items()]
+    if total_ns is not None:
+        parts.append(f"total;dur={total_ns / 1e6:.2f}")
+    return ", ".join(parts)
+
+
+def install_flask_tracing(app, tracer: Tracer, metrics_path: str = "/metrics",
+                          timing_header: Optional[bool] = None) -> None:
+    """
+    Instrumente une application Flask: durée de chaque requête, route /metrics et en-tête X-Timing
+
+    L'en-tête X-Timing est ajouté à toutes les réponses si TRACE_TIMING_HEADER=1, sinon
+    uniquement aux requêtes qui envoient elles-mêmes un en-tête X-Timing.
+    """
+    from flask import Response, g, request
+
+    if timing_header is None:
+        timing_header = os.environ.get("TRACE_TIMING_HEADER", "0") == "1"
+
+    @app.before_request
+    def _start_trace():
+        g.trace_token = tracer.start_request()
+        g.trace_start = time.perf_counter_ns()
+
+    @app.after_request
+    def _finish_trace(response):
+        token = g.pop("trace_token", None)
+        if token is None:
+            return response
+        total_ns = time.perf_counter_ns() - g.pop("trace_start")
+        timings = tracer.finish_request(token, request.url_rule.rule if request.url_rule else "unmatched", total_ns)
+        if timing_header or TIMING_HEADER in request.headers:
+            response.headers[TIMING_HEADER] = format_timing_header(timings, total_ns)
+        return response
+
+    def metrics():
+        return Response(tracer.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+    app.add_url_rule(metrics_path, "metrics", metrics, methods=["GET"])